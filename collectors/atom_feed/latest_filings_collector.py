@@ -0,0 +1,189 @@
+# collectors/atom_feed/latest_filings_collector.py
+
+'''
+# Role: Intraday source of new accessions from the EDGAR "latest filings" Atom feed
+- crawler.idx is only published at end of day; the current-filings feed lists submissions within seconds.
+- The feed itself comes from a pluggable AtomFeedSource (live SEC endpoint, local fixture server, or a file).
+- Entries are normalized to the same FilingMetadata dataclass Pipeline 1 writes.
+'''
+
+import os
+import re
+import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from collectors.base_collector import BaseCollector
+from downloaders.sec_downloader import SECDownloader
+from downloaders.rate_limiter import get_host_rate_limiter
+from downloaders.validator_store import ValidatorStore
+from models.dataclasses.filing_metadata import FilingMetadata
+from utils.report_logger import log_info, log_warn
+
+DEFAULT_FEED_URL = "https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&owner=include&count=100&output=atom"
+
+ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
+
+_ACCESSION_RE = re.compile(r"(\d{10}-\d{2}-\d{6})")
+# Titles look like "4 - Smith John (0001234567) (Reporting)"
+_TITLE_CIK_RE = re.compile(r"\((\d{10})\)\s*\(([^)]+)\)")
+_FILED_RE = re.compile(r"Filed:\s*(?:</b>)?\s*(\d{4}-\d{2}-\d{2})")
+
+
+class AtomFeedSource(ABC):
+    """Supplies the raw Atom XML. Swap implementations to poll the SEC, a fixture server, or a file."""
+
+    @abstractmethod
+    def fetch(self) -> Optional[str]:
+        """Returns the feed XML, or None if it has not changed since the last committed fetch."""
+        pass
+
+    def commit(self):
+        """
+        Marks the last fetched feed as processed, so the next fetch reports it unchanged.
+        Until then the same feed is returned again, and a failed poll is retried in full.
+        """
+        pass
+
+
+class HttpAtomFeedSource(AtomFeedSource):
+    """
+    Polls a feed URL with conditional requests; 304 responses cost no parsing at all.
+    Validators are recorded on `commit`, once the entries have been processed.
+    """
+
+    def __init__(self, user_agent: str, url: str = DEFAULT_FEED_URL, downloader: SECDownloader = None):
+        self.url = url
+        self.downloader = downloader or SECDownloader(
+            user_agent=user_agent,
+            rate_limiter=get_host_rate_limiter(),
+            validator_store=ValidatorStore()
+        )
+
+    def fetch(self) -> Optional[str]:
+        response = self.downloader.download_if_modified(self.url)
+        if response is None:
+            return None
+        return response.text
+
+    def commit(self):
+        self.downloader.commit_validators(self.url)
+
+
+class FileAtomFeedSource(AtomFeedSource):
+    """Reads the feed from a local file; an unchanged modification time (once committed) counts as not modified."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._last_mtime = None
+        self._pending_mtime = None
+
+    def fetch(self) -> Optional[str]:
+        mtime = os.path.getmtime(self.path)
+        if mtime == self._last_mtime:
+            return None
+        self._pending_mtime = mtime
+        with open(self.path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    def commit(self):
+        if self._pending_mtime is not None:
+            self._last_mtime = self._pending_mtime
+        self._pending_mtime = None
+
+
+class LatestFilingsCollector(BaseCollector):
+    def __init__(self, source: AtomFeedSource):
+        self.source = source
+
+    def collect(self, include_forms: List[str] = None) -> Optional[List[FilingMetadata]]:
+        """
+        Fetches the feed and returns one FilingMetadata per accession, newest first.
+        Returns None when the source reports the feed unchanged. Call `commit()` once the
+        returned records have been written.
+        """
+        xml_text = self.source.fetch()
+        if xml_text is None:
+            return None
+
+        records = self.parse_feed(xml_text)
+        if include_forms:
+            records = [r for r in records if r.form_type in include_forms]
+        return records
+
+    def commit(self):
+        """Records the last collected feed as processed (see AtomFeedSource.commit)."""
+        self.source.commit()
+
+    @staticmethod
+    def parse_feed(xml_text: str) -> List[FilingMetadata]:
+        """
+        Parses current-filings Atom XML.
+
+        Ownership filings appear once per party ("(Issuer)", "(Reporting)"); the issuer
+        entry wins so the record carries the same CIK FilingMetadataCollector would choose.
+        """
+        try:
+            root = ET.fromstring(xml_text)
+        except ET.ParseError as e:
+            log_warn(f"[ATOM] Could not parse feed: {e}")
+            return []
+
+        by_accession: Dict[str, FilingMetadata] = {}
+        issuer_found = set()
+        for entry in root.findall("atom:entry", ATOM_NS):
+            parsed = LatestFilingsCollector._parse_entry(entry)
+            if parsed is None:
+                continue
+            record, role = parsed
+            accession = record.accession_number
+            if accession not in by_accession or (role == "issuer" and accession not in issuer_found):
+                by_accession[accession] = record
+            if role == "issuer":
+                issuer_found.add(accession)
+
+        log_info(f"[ATOM] Parsed {len(by_accession)} accessions from feed")
+        return list(by_accession.values())
+
+    @staticmethod
+    def _parse_entry(entry: ET.Element):
+        entry_id = entry.findtext("atom:id", default="", namespaces=ATOM_NS)
+        link = entry.find("atom:link", ATOM_NS)
+        href = link.get("href", "") if link is not None else ""
+        accession_match = _ACCESSION_RE.search(entry_id) or _ACCESSION_RE.search(href)
+        category = entry.find("atom:category", ATOM_NS)
+        title = entry.findtext("atom:title", default="", namespaces=ATOM_NS)
+        if not accession_match or category is None:
+            log_warn(f"[ATOM] Skipping entry without accession or form type: {title}")
+            return None
+
+        title_match = _TITLE_CIK_RE.search(title)
+        if title_match:
+            cik, role = title_match.group(1), title_match.group(2).strip().lower()
+        else:
+            cik_match = re.search(r"/edgar/data/(\d+)/", href)
+            if not cik_match:
+                log_warn(f"[ATOM] Skipping entry without CIK: {title}")
+                return None
+            cik, role = cik_match.group(1), "filer"
+
+        summary = entry.findtext("atom:summary", default="", namespaces=ATOM_NS)
+        filed_match = _FILED_RE.search(summary)
+        filed = filed_match.group(1) if filed_match else entry.findtext("atom:updated", default="", namespaces=ATOM_NS)[:10]
+        try:
+            filing_date = datetime.strptime(filed, "%Y-%m-%d").date()
+        except ValueError:
+            log_warn(f"[ATOM] Skipping entry without filing date: {title}")
+            return None
+
+        cik = str(int(cik))
+        accession_number = accession_match.group(1)
+        record = FilingMetadata(
+            accession_number=accession_number,
+            cik=cik,
+            form_type=category.get("term", "").strip(),
+            filing_date=filing_date,
+            filing_url=f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession_number}-index.htm"
+        )
+        return record, role
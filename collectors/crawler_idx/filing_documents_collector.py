@@ -12,16 +12,33 @@ from models.adapters.dataclass_to_orm import convert_parsed_doc_to_filing_doc
 
 from parsers.sgml.indexers.sgml_document_indexer import SgmlDocumentIndexer
 from downloaders.sgml_downloader import SgmlDownloader
+from downloaders.rate_limiter import get_host_rate_limiter
+from utils.path_manager import build_raw_filepath_by_type
+from utils.artifact_locator import find_stored_sgml
 from utils.report_logger import log_info, log_error, log_warn
 from utils.sgml_utils import extract_issuer_cik_from_sgml
 
+# Forms whose record CIK may be a reporting owner rather than the issuer
+OWNERSHIP_FORMS = ["3", "4", "5", "13D", "13G", "13F-HR", "144"]
+
 class FilingDocumentsCollector:
     """Collects filing document records from SGML files"""
-    def __init__(self, db_session: Session, user_agent: str, use_cache: bool = True, write_cache: bool = True, downloader: SgmlDownloader = None):
+    def __init__(self, db_session: Session, user_agent: str, use_cache: bool = True, write_cache: bool = True, downloader: SgmlDownloader = None,
+                 stream_to_disk: bool = False):
+        """
+        stream_to_disk: If True, non-ownership submissions are streamed straight to their raw SGML
+            path and indexed from disk, so large filings (S-1, 10-K) are never held in memory.
+            Pipeline 3 then finds the file already written.
+        """
         self.db_session = db_session
         self.use_cache = use_cache
         self.write_cache = write_cache
-        self.downloader = downloader or SgmlDownloader(user_agent=user_agent, use_cache=use_cache)
+        self.stream_to_disk = stream_to_disk
+        self.downloader = downloader or SgmlDownloader(
+            user_agent=user_agent,
+            use_cache=use_cache,
+            rate_limiter=get_host_rate_limiter()
+        )
 
     def collect(
         self, 
@@ -68,8 +85,23 @@ class FilingDocumentsCollector:
         else:
             log_info(f"[DOCS] Processing {len(records)} records")
 
+        # Read the next few in-memory submissions ahead of the per-record loop, so each is
+        # served from the downloader's memory cache without holding the whole batch there
+        prefetch_targets = {
+            r.accession_number: (r.cik, r.accession_number, str(r.filing_date.year))
+            for r in records if not self._should_stream(r)
+        }
+
         all_docs = []
-        for record in records:
+        for record in self.downloader.read_ahead(records, lambda r: prefetch_targets.get(r.accession_number),
+                                                 write_cache=self.write_cache):
+            if self._should_stream(record):
+                try:
+                    all_docs.extend(self._collect_streamed(record))
+                except Exception as e:
+                    log_error(f"Failed to process {record.accession_number}: {e}")
+                continue
+
             try:
                 # First attempt download using the record CIK
                 year = str(record.filing_date.year)
@@ -85,12 +117,12 @@ class FilingDocumentsCollector:
                     )
                     
                     # For forms that may have issuer/reporting relationship
-                    if record.form_type in ["3", "4", "5", "13D", "13G", "13F-HR", "144"]:
+                    if record.form_type in OWNERSHIP_FORMS:
                         # Check if the CIK in the record is actually the issuer
-                        issuer_cik = extract_issuer_cik_from_sgml(sgml_doc.content)
+                        issuer_cik = extract_issuer_cik_from_sgml(sgml_doc.data)
                         if issuer_cik and issuer_cik != record.cik:
-                            log_info(f"Record CIK {record.cik} is not the issuer ({issuer_cik}) for {record.accession_number}. Retrying download with issuer CIK.")
-                            # Retry download with issuer CIK
+                            log_info(f"Record CIK {record.cik} is not the issuer ({issuer_cik}) for {record.accession_number}. Re-resolving under issuer CIK (served from the accession-keyed memory cache).")
+                            # Re-resolve under issuer CIK; the downloader serves this from memory
                             sgml_doc = self.downloader.download_sgml(
                                 issuer_cik,
                                 record.accession_number,
@@ -113,7 +145,7 @@ class FilingDocumentsCollector:
                     
                 # Continue with parsing
                 parser = SgmlDocumentIndexer(record.cik, record.accession_number, record.form_type)
-                parsed_metadata = parser.index_documents(sgml_doc.content)
+                parsed_metadata = parser.index_documents(sgml_doc.data)
                 
                 # Add issuer_cik to the parsed metadata if not already set
                 for doc in parsed_metadata:
@@ -125,4 +157,33 @@ class FilingDocumentsCollector:
             except Exception as e:
                 log_error(f"Failed to process {record.accession_number}: {e}")
 
-        return all_docs
\ No newline at end of file
+        return all_docs
+
+    def _should_stream(self, record) -> bool:
+        # Ownership forms are small and need issuer resolution from content, so they stay in memory
+        return self.stream_to_disk and record.form_type not in OWNERSHIP_FORMS
+
+    def _collect_streamed(self, record) -> List[FilingDocumentRecord]:
+        """Streams the submission to its raw SGML path (unless already stored) and indexes it from disk."""
+        year = str(record.filing_date.year)
+        path = build_raw_filepath_by_type(
+            file_type="sgml",
+            year=year,
+            cik=record.cik,
+            form_type=record.form_type,
+            accession_or_subtype=record.accession_number,
+            filename=f"{record.accession_number}.txt",
+        )
+        # Already stored (under this or another CIK): index that file instead of downloading
+        sgml_path = find_stored_sgml(record.accession_number, path)
+        if not sgml_path:
+            sgml_path = self.downloader.download_sgml_to_file(record.cik, record.accession_number, path).path
+
+        parser = SgmlDocumentIndexer(record.cik, record.accession_number, record.form_type)
+        parsed_metadata = parser.index_documents_from_file(sgml_path)
+
+        for doc in parsed_metadata:
+            if doc.issuer_cik is None:
+                doc.issuer_cik = record.cik
+
+        return [convert_parsed_doc_to_filing_doc(doc) for doc in parsed_metadata]
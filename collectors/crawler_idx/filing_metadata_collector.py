@@ -1,27 +1,45 @@
 # collectors/crawler_idx/filing_metadata_collector.py
 
-# NOTE: This inline download is kept simple for now.
-# Future: Extract to CrawlerIdxDownloader if retry logic or parallel fetches are needed.
+# NOTE: crawler.idx is fetched through an SECDownloader, so it shares the host-wide rate
+# limit, retry policy and circuit breaker with every other SEC request.
 
 from datetime import date as dt_date, datetime
-from typing import List, Union
-import requests
+from typing import List, Optional, Union
 
 from collections import defaultdict
 from collectors.base_collector import BaseCollector
+from downloaders.http_transport import HttpTransport
+from downloaders.rate_limiter import get_host_rate_limiter
+from downloaders.sec_downloader import SECDownloader
+from downloaders.validator_store import ValidatorStore, validator_key
 from models.dataclasses.filing_metadata import FilingMetadata
 from utils.report_logger import log_warn, log_info
-from utils.sgml_utils import download_sgml_for_accession, extract_issuer_cik_from_sgml
+from utils.sgml_utils import download_sgml_header_for_accession, extract_issuer_cik_from_sgml
 from parsers.idx.idx_parser import CrawlerIdxParser
 
 class FilingMetadataCollector(BaseCollector):
-    def __init__(self, user_agent: str):
+    def __init__(self, user_agent: str, transport: HttpTransport = None, validator_store: ValidatorStore = None):
         self.user_agent = user_agent
+        self.transport = transport or HttpTransport(user_agent=user_agent)
+        self.downloader = SECDownloader(
+            user_agent=user_agent,
+            transport=self.transport,
+            rate_limiter=get_host_rate_limiter(),
+            validator_store=validator_store
+        )
+        self.validator_store = validator_store
+        self._pending_key = None  # validator key of the last collect that parsed cleanly
 
-    def collect(self, date: Union[str, dt_date], include_forms: list[str] = None, limit: int = None) -> List[FilingMetadata]:
+    def collect(self, date: Union[str, dt_date], include_forms: list[str] = None, limit: int = None) -> Optional[List[FilingMetadata]]:
         """
         Download and parse the SEC daily index (crawler.idx) for a given date.
         Returns a list of FilingMetadata dataclass instances.
+
+        With a validator store, the request is conditional and None is returned
+        when crawler.idx has not changed since the last collect with the same
+        include_forms. Limited runs are never conditional, so a partial run can't
+        cause a later full run to be skipped. Call `commit_validators()` once the
+        returned records have been written.
         
         Args:
             date: Date string (YYYY-MM-DD) or datetime.date object
@@ -43,15 +61,25 @@ class FilingMetadataCollector(BaseCollector):
         year = date.strftime("%Y")
 
         url = f"https://www.sec.gov/Archives/edgar/daily-index/{year}/{quarter}/crawler.{date_compact}.idx"
-        headers = {"User-Agent": self.user_agent}
+
+        # Validators are per filter set: the same crawler.idx yields different records per include_forms
+        conditional = self.validator_store is not None and not limit
+        key = validator_key(url, include_forms)
+        self._pending_key = None
         
         log_info(f"[DEBUG] Downloading crawler.idx for {date_compact} from URL: {url}")
-        # Set a timeout to avoid hanging indefinitely
-        response = requests.get(url, headers=headers, timeout=30)
-        log_info(f"[DEBUG] Download completed. Status code: {response.status_code}, Size: {len(response.text)//1024} KB")
-        response.raise_for_status()
+        # Throttled, retried and paused by the circuit breaker like every SECDownloader request
+        if conditional:
+            response = self.downloader.download_if_modified(url, key=key)
+            if response is None:
+                log_info(f"[DEBUG] crawler.idx for {date_compact} not modified since last collect; skipping parse")
+                return None
+            text = response.text
+        else:
+            text = self.downloader.download_html(url)
+        log_info(f"[DEBUG] Download completed. Size: {len(text)//1024} KB")
 
-        lines = response.text.splitlines()
+        lines = text.splitlines()
         log_info(f"[DEBUG] Parsing {len(lines)} lines from crawler.idx")
         try:
             all_records = CrawlerIdxParser.parse_lines(lines)
@@ -81,14 +109,15 @@ class FilingMetadataCollector(BaseCollector):
                 # Check if it's a form type that typically has issuer/reporting relationship
                 if any(r.form_type in ["4", "3", "5", "13D", "13G", "13F-HR"] for r in records):
                     try:
-                        # Download the SGML content using the first record
-                        log_info(f"[DEBUG] Downloading SGML for multi-CIK accession: {accession}")
-                        sgml_content = download_sgml_for_accession(
+                        # Fetch only the SEC-HEADER (which holds the <ISSUER> block) using the first record
+                        log_info(f"[DEBUG] Downloading SGML header for multi-CIK accession: {accession}")
+                        sgml_content = download_sgml_header_for_accession(
                             records[0].cik, 
                             accession, 
-                            self.user_agent
+                            self.user_agent,
+                            transport=self.transport
                         )
-                        log_info(f"[DEBUG] SGML download completed for {accession}")
+                        log_info(f"[DEBUG] SGML header download completed for {accession}")
                         
                         # Extract the issuer CIK
                         issuer_cik = extract_issuer_cik_from_sgml(sgml_content)
@@ -116,9 +145,18 @@ class FilingMetadataCollector(BaseCollector):
             
             log_info(f"Handled {len(all_records) - len(final_records)} duplicate CIK records")
             log_info(f"[DEBUG] Final record count after processing: {len(final_records)}")
+            if conditional:
+                self._pending_key = key
             return final_records
         except Exception as e:
             log_warn(f"[ERROR] Failed to parse crawler.idx: {e}")
             raise
-            
-        
\ No newline at end of file
+
+    def commit_validators(self):
+        """
+        Records the validators from the last successful collect, so the next
+        collect of the same crawler.idx can be answered with 304.
+        """
+        if self._pending_key is not None:
+            self.downloader.commit_validators(self._pending_key)
+        self._pending_key = None
@@ -0,0 +1,99 @@
+# collectors/crawler_idx/full_index_collector.py
+
+# Role: Quarterly full-index source for filing_metadata backfills
+# - One file per quarter (full-index/{year}/QTR{n}/master.gz or crawler.idx) instead of ~63 daily crawler.idx files
+# - Files are read from disk (downloaded once via SECDownloader.download_to_file) and decompressed as a stream
+
+import gzip
+import io
+import os
+from typing import Iterator, List
+
+from collectors.base_collector import BaseCollector
+from downloaders.sec_downloader import SECDownloader
+from downloaders.rate_limiter import get_host_rate_limiter
+from models.dataclasses.filing_metadata import FilingMetadata
+from parsers.idx.idx_parser import CrawlerIdxParser
+from utils.path_manager import build_full_index_path
+from utils.report_logger import log_info
+
+FULL_INDEX_URL = "https://www.sec.gov/Archives/edgar/full-index/{year}/QTR{quarter}/{filename}"
+
+# master.gz is pipe-delimited, so form types containing spaces (e.g. "SC 13G") parse reliably
+INDEX_FILES = {
+    "master": "master.gz",
+    "crawler": "crawler.idx",
+}
+
+
+class FullIndexCollector(BaseCollector):
+    def __init__(self, user_agent: str, downloader: SECDownloader = None):
+        self.downloader = downloader or SECDownloader(
+            user_agent=user_agent,
+            rate_limiter=get_host_rate_limiter()
+        )
+
+    def collect(self, year: int, quarter: int, include_forms: List[str] = None,
+                index_type: str = "master", local_path: str = None) -> List[FilingMetadata]:
+        """
+        Returns every FilingMetadata record for a quarter.
+        Prefer iter_records() for bulk loads; this materializes the whole quarter.
+        """
+        return list(self.iter_records(year, quarter, include_forms, index_type, local_path))
+
+    def iter_records(self, year: int, quarter: int, include_forms: List[str] = None,
+                     index_type: str = "master", local_path: str = None,
+                     refresh: bool = False) -> Iterator[FilingMetadata]:
+        """
+        Streams FilingMetadata records for one quarter.
+
+        Args:
+            year, quarter: Which full-index to read (quarter 1-4)
+            include_forms: Only yield these form types
+            index_type: "master" (master.gz) or "crawler" (crawler.idx)
+            local_path: Read this file instead of the cached/downloaded copy
+            refresh: Re-download even if a local copy exists (the current quarter keeps growing)
+
+        Multi-CIK accessions (Form 3/4/5, 13D/G) appear once per filer; only the first
+        record is kept. No SGML is fetched to resolve the issuer here - Pipeline 2
+        re-resolves the issuer CIK when it indexes the filing.
+        """
+        if index_type not in INDEX_FILES:
+            raise ValueError(f"[ERROR] Unsupported index_type: '{index_type}' — expected one of {list(INDEX_FILES)}")
+        if quarter not in (1, 2, 3, 4):
+            raise ValueError(f"[ERROR] Invalid quarter: {quarter}")
+
+        path = local_path or self._ensure_local_copy(year, quarter, INDEX_FILES[index_type], refresh)
+        parse = CrawlerIdxParser.iter_parse_master_lines if index_type == "master" else CrawlerIdxParser.iter_parse_lines
+        include = set(include_forms) if include_forms else None
+
+        seen = set()
+        yielded = 0
+        with self._open_lines(path) as lines:
+            for record in parse(lines):
+                if include and record.form_type not in include:
+                    continue
+                if record.accession_number in seen:
+                    continue
+                seen.add(record.accession_number)
+                yielded += 1
+                yield record
+
+        log_info(f"[FULL-INDEX] {year} QTR{quarter}: {yielded} records from {path}")
+
+    def _ensure_local_copy(self, year: int, quarter: int, filename: str, refresh: bool) -> str:
+        path = build_full_index_path(year, quarter, filename)
+        if refresh or not os.path.exists(path):
+            url = FULL_INDEX_URL.format(year=year, quarter=quarter, filename=filename)
+            log_info(f"[FULL-INDEX] Downloading {url}")
+            size, _ = self.downloader.download_to_file(url, path)
+            log_info(f"[FULL-INDEX] Saved {size // 1024} KB to {path}")
+        return path
+
+    @staticmethod
+    def _open_lines(path: str):
+        """Opens an index file as a text line stream, decompressing .gz on the fly."""
+        # SEC index files are Latin-1 in places (company names); never fail a quarter over one byte
+        if path.endswith(".gz"):
+            return io.TextIOWrapper(gzip.open(path, "rb"), encoding="latin-1")
+        return open(path, "r", encoding="latin-1")
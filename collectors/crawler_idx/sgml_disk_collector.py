@@ -10,15 +10,21 @@ from models.dataclasses.raw_document import RawDocument
 from models.orm_models.filing_document_orm import FilingDocumentORM
 from models.orm_models.filing_metadata import FilingMetadata
 from downloaders.sgml_downloader import SgmlDownloader
+from downloaders.rate_limiter import get_host_rate_limiter
 from writers.shared.raw_file_writer import RawFileWriter
 from utils.path_manager import build_raw_filepath_by_type
+from utils.artifact_locator import find_stored_sgml
 from utils.report_logger import log_info, log_warn
 from utils.sgml_utils import extract_issuer_cik_from_sgml
 
 class SgmlDiskCollector:
     def __init__(self, db_session: Session, user_agent: str, use_cache: bool = True, write_cache: bool = True, downloader: SgmlDownloader = None):
         self.db_session = db_session
-        self.downloader = downloader or SgmlDownloader(user_agent=user_agent, use_cache=use_cache)
+        self.downloader = downloader or SgmlDownloader(
+            user_agent=user_agent,
+            use_cache=use_cache,
+            rate_limiter=get_host_rate_limiter()
+        )
         self.writer = RawFileWriter(file_type="sgml")
         self.write_cache = write_cache
 
@@ -68,10 +74,30 @@ class SgmlDiskCollector:
         else:
             log_info(f"[SGML] Processing {len(results)} SGML files")
 
+        # Read SGML not yet on disk a few records ahead of the per-record loop, so each is
+        # served from the downloader's memory cache without holding the whole batch there
+        pending = {}
+        for record in results:
+            if record.accession_number in pending:
+                continue
+            year = str(record.filing.filing_date.year)
+            existing_path = build_raw_filepath_by_type(
+                file_type="sgml",
+                year=year,
+                cik=record.cik,
+                form_type=record.filing.form_type,
+                accession_or_subtype=record.accession_number,
+                filename=f"{record.accession_number}.txt",
+            )
+            # Stored under any CIK (e.g. the issuer's for ownership forms) counts as written
+            if not find_stored_sgml(record.accession_number, existing_path):
+                pending[record.accession_number] = (record.cik, record.accession_number, year)
+
         seen_keys = set()
         written_paths = []
 
-        for record in results:
+        for record in self.downloader.read_ahead(results, lambda r: pending.get(r.accession_number),
+                                                 write_cache=self.write_cache):
             try:
                 record_cik = record.cik
                 accession = record.accession_number
@@ -94,9 +120,10 @@ class SgmlDiskCollector:
                     filename=f"{record.accession_number}.txt",
                 )
 
-                if os.path.exists(full_path):
-                    log_info(f"Already written: {full_path}")
-                    written_paths.append(full_path)
+                stored_path = find_stored_sgml(accession, full_path)
+                if stored_path:
+                    log_info(f"Already written: {stored_path}")
+                    written_paths.append(stored_path)
                     continue
 
                 # Step 2: Fetch SGML (cache-aware)
@@ -115,10 +142,10 @@ class SgmlDiskCollector:
                     # For forms that may have issuer/reporting relationship
                     if form_type in ["3", "4", "5", "13D", "13G", "13F-HR", "144"]:
                         # Check if the CIK in the record is actually the issuer
-                        issuer_cik = extract_issuer_cik_from_sgml(sgml_doc.content)
+                        issuer_cik = extract_issuer_cik_from_sgml(sgml_doc.data)
                         if issuer_cik and issuer_cik != record_cik:
-                            log_info(f"Record CIK {record_cik} is not the issuer ({issuer_cik}) for {accession}. Retrying download with issuer CIK.")
-                            # Retry download with issuer CIK
+                            log_info(f"Record CIK {record_cik} is not the issuer ({issuer_cik}) for {accession}. Re-resolving under issuer CIK (served from the accession-keyed memory cache).")
+                            # Re-resolve under issuer CIK; the downloader serves this from memory
                             sgml_doc = self.downloader.download_sgml(
                                 issuer_cik,
                                 accession,
@@ -158,7 +185,7 @@ class SgmlDiskCollector:
                     filename=f"{record.accession_number}.txt",
                     source_url=record.source_url or "https://www.sec.gov",
                     source_type=record.source_type or "sgml",
-                    content=sgml_doc.content,
+                    content=sgml_doc.data,  # bytes from the downloader are written as-is
                     filing_date=record.filing.filing_date,
                     description=record.description,
                     is_primary=record.is_primary,
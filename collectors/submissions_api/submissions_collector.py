@@ -2,11 +2,20 @@
 
 from collectors.base_collector import BaseCollector
 from downloaders.sec_downloader import SECDownloader
+from downloaders.http_transport import HttpTransport
+from downloaders.rate_limiter import get_host_rate_limiter
+from downloaders.validator_store import ValidatorStore, validator_key
 from utils.url_builder import construct_submission_json_url, construct_primary_document_url
 
 class SubmissionsCollector(BaseCollector):
-    def __init__(self, user_agent: str):
-        self.downloader = SECDownloader(user_agent=user_agent)
+    def __init__(self, user_agent: str, transport: HttpTransport = None, validator_store: ValidatorStore = None):
+        self.downloader = SECDownloader(
+            user_agent=user_agent,
+            transport=transport,
+            rate_limiter=get_host_rate_limiter(),
+            validator_store=validator_store
+        )
+        self._validator_keys = {}  # normalized CIK → validator key of its last collect
 
     def collect(self, cik: str, forms_filter: list = None) -> list:
         """
@@ -14,12 +23,22 @@ class SubmissionsCollector(BaseCollector):
         Optionally filter by form types (e.g., ["8-K", "10-K"]).
 
         Returns:
-            List of dicts with filing metadata and download URLs.
+            List of dicts with filing metadata and download URLs, or None if the
+            collector has a validator store and the submissions JSON is unchanged (304).
+            Call `commit_validators(cik)` once the returned filings have been processed.
         """
         normalized_cik = cik.zfill(10)
         url = construct_submission_json_url(normalized_cik)
 
-        submissions_data = self.downloader.download_json(url)
+        if self.downloader.validator_store is not None:
+            # Validators are per filter set: a 304 for one forms_filter says nothing about another
+            key = validator_key(url, forms_filter)
+            self._validator_keys[normalized_cik] = key
+            submissions_data = self.downloader.download_json_if_modified(url, key=key)
+            if submissions_data is None:
+                return None
+        else:
+            submissions_data = self.downloader.download_json(url)
         filings = submissions_data.get("filings", {}).get("recent", {})
 
         accession_numbers = filings.get("accessionNumber", [])
@@ -47,3 +66,12 @@ class SubmissionsCollector(BaseCollector):
             })
 
         return results
+
+    def commit_validators(self, cik: str):
+        """
+        Records the validators of the last collect for `cik`, so the next collect of the
+        same submissions JSON with the same forms_filter can be answered with 304.
+        """
+        key = self._validator_keys.pop(cik.zfill(10), None)
+        if key is not None:
+            self.downloader.commit_validators(key)
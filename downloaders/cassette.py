@@ -0,0 +1,130 @@
+# downloaders/cassette.py
+
+'''
+# Role: Record/replay store for HTTP responses (deterministic, offline pipeline runs)
+- "record": every response fetched through HttpTransport is also written to the cassette directory.
+- "replay": responses are served from the cassette only; nothing reaches the network or the rate budget.
+- EDGAR_CASSETTE=record:<dir> or replay:<dir> turns it on for every HttpTransport in the process.
+'''
+
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from utils.report_logger import log_info
+
+CASSETTE_ENV_VAR = "EDGAR_CASSETTE"
+MODES = ("record", "replay")
+
+# Conditional requests are stripped while recording so the cassette always holds full bodies
+CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+# Bodies are stored decoded, so transfer-level headers would no longer describe them
+_DROPPED_RESPONSE_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive", "set-cookie"}
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode for a request that was never recorded (not retried by SECDownloader)."""
+    pass
+
+
+class HttpCassette:
+    """
+    Directory of recorded responses, one `<key>.json` (status, headers) plus `<key>.body` per request.
+
+    Requests are keyed by the URL as the caller built it (before any EDGAR_BASE_URL
+    rewrite) and the Range header, so a cassette recorded against the fake server
+    replays for real SEC URLs and vice versa.
+    """
+
+    def __init__(self, path: str, mode: str):
+        if mode not in MODES:
+            raise ValueError(f"[ERROR] Unsupported cassette mode: '{mode}' — expected one of {list(MODES)}")
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        if mode == "record":
+            os.makedirs(path, exist_ok=True)
+        elif not os.path.isdir(path):
+            raise FileNotFoundError(f"[ERROR] Cassette not found: {path}")
+        log_info(f"[CASSETTE] {mode.capitalize()}ing HTTP responses {'to' if mode == 'record' else 'from'} {path}")
+
+    @classmethod
+    def from_env(cls) -> Optional["HttpCassette"]:
+        """Builds the cassette named by EDGAR_CASSETTE ("record:<dir>" / "replay:<dir>"), if set."""
+        spec = os.environ.get(CASSETTE_ENV_VAR)
+        if not spec:
+            return None
+        mode, _, path = spec.partition(":")
+        return cls(path, mode)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @staticmethod
+    def request_key(url: str, headers: Optional[dict] = None) -> str:
+        byte_range = (headers or {}).get("Range", "")
+        return hashlib.sha256(f"{url}\n{byte_range}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def strip_conditional(headers: Optional[dict]) -> Optional[dict]:
+        if not headers:
+            return headers
+        return {k: v for k, v in headers.items() if k not in CONDITIONAL_HEADERS}
+
+    def record(self, url: str, headers: Optional[dict], response: requests.Response):
+        """Writes a response to the cassette. Reads the full body, even for streamed responses."""
+        key = self.request_key(url, headers)
+        meta = {
+            "url": url,
+            "range": (headers or {}).get("Range"),
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_RESPONSE_HEADERS},
+        }
+        body = response.content or b""
+        with self._lock:
+            self._write_atomic(os.path.join(self.path, f"{key}.body"), body)
+            self._write_atomic(os.path.join(self.path, f"{key}.json"), json.dumps(meta, indent=2).encode("utf-8"))
+
+    def replay(self, url: str, headers: Optional[dict] = None) -> requests.Response:
+        """Returns the recorded response for a request, or raises CassetteMissError."""
+        key = self.request_key(url, headers)
+        meta_path = os.path.join(self.path, f"{key}.json")
+        if not os.path.exists(meta_path):
+            raise CassetteMissError(f"[CASSETTE] No recorded response for {url}")
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(self.path, f"{key}.body"), "rb") as f:
+            body = f.read()
+
+        response = requests.Response()
+        response.status_code = meta["status_code"]
+        response.reason = meta.get("reason")
+        response.url = url
+        response.headers = CaseInsensitiveDict(meta.get("headers", {}))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response._content_consumed = True  # iter_content() then yields slices of the stored body
+        return response
+
+    def __len__(self) -> int:
+        return sum(1 for name in os.listdir(self.path) if name.endswith(".json"))
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
@@ -0,0 +1,196 @@
+# downloaders/hedging.py
+
+'''
+# Role: Hedged requests to cut tail latency (used by SECDownloader)
+- LatencyTracker keeps a sliding window of recent request latencies.
+- HedgePolicy sends one duplicate request when the first has not returned its headers within the
+  tracked percentile (p95 by default), returns whichever answers first with a successful status
+  and discards the other.
+- The duplicate is throttled like any other request, so it spends rate budget; only stragglers are hedged.
+'''
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+import requests
+
+from config.config_loader import ConfigLoader
+from utils.report_logger import log_info
+
+# Load config once at module import
+HEDGING_CONFIG = (ConfigLoader.load_config().get("sec_downloader", {}) or {}).get("hedging", {}) or {}
+
+# Requests run on these threads while the caller waits for the first answer
+HEDGE_WORKERS = 32
+
+
+class LatencyTracker:
+    """Thread-safe sliding window of request latencies (seconds)."""
+
+    def __init__(self, window: int = 500):
+        self._samples = deque(maxlen=max(1, window))
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Returns the given percentile (0-1) of the window, or None when empty."""
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+        return ordered[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class HedgePolicy:
+    """
+    Sends at most one hedge per request, after `percentile` of recent latencies
+    (clamped to [min_delay, max_delay]). No hedging until `min_samples` latencies are known.
+    """
+
+    def __init__(self, percentile: float = 0.95, min_samples: int = 20, min_delay: float = 0.05,
+                 max_delay: float = 5.0, window: int = 500, tracker: LatencyTracker = None):
+        self.percentile = percentile
+        self.min_samples = max(1, min_samples)
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.tracker = tracker or LatencyTracker(window)
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._counter_lock = threading.Lock()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: dict = None) -> "HedgePolicy":
+        config = HEDGING_CONFIG if config is None else config
+        return cls(
+            percentile=config.get("percentile", 0.95),
+            min_samples=config.get("min_samples", 20),
+            min_delay=config.get("min_delay_seconds", 0.05),
+            max_delay=config.get("max_delay_seconds", 5.0),
+            window=config.get("window", 500),
+        )
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there are too few samples."""
+        if len(self.tracker) < self.min_samples:
+            return None
+        observed = self.tracker.percentile(self.percentile)
+        return min(self.max_delay, max(self.min_delay, observed))
+
+    def execute(self, send: Callable[[], requests.Response], before_hedge: Callable[[], None] = None) -> requests.Response:
+        """
+        Runs `send()`, hedging it once if it is slower than `hedge_delay()`.
+
+        `send` should return as soon as the response headers arrive (SECDownloader sends
+        hedged requests with `stream=True`), so latencies and the hedge clock measure
+        time-to-headers; the clock starts when the primary request actually starts, not
+        while it is queued for a worker. `before_hedge` runs just before the duplicate is
+        sent (SECDownloader passes its throttle); if the primary finishes meanwhile, no
+        duplicate is sent. Only a successful response (status below 400) wins outright; the
+        loser is cancelled if it has not started, otherwise its response is closed when it
+        arrives. If neither succeeds, the first failed response is returned (so the caller's
+        retry policy sees its status), and an error is only raised if both requests raised.
+        """
+        delay = self.hedge_delay()
+        if delay is None:
+            return self._timed(send)
+
+        executor = self._get_executor()
+        primary_started = threading.Event()
+        primary = executor.submit(self._timed, send, primary_started)
+        primary_started.wait()
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        if before_hedge is not None:
+            before_hedge()
+        # The throttle may have waited long enough for the primary to answer
+        if primary.done():
+            return primary.result()
+        with self._counter_lock:
+            self.hedges_sent += 1
+        backup = executor.submit(self._timed, send)
+
+        pending = {primary, backup}
+        finished = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None and _is_success(future.result()):
+                    for loser in pending:
+                        if not loser.cancel():
+                            loser.add_done_callback(_close_response)
+                    for loser in finished:
+                        _close_response(loser)
+                    if future is backup:
+                        with self._counter_lock:
+                            self.hedges_won += 1
+                    return future.result()
+                finished.append(future)
+
+        answered = [future for future in finished if future.exception() is None]
+        if not answered:
+            raise finished[0].exception()
+        for loser in answered[1:]:
+            _close_response(loser)
+        return answered[0].result()
+
+    def _timed(self, send: Callable[[], requests.Response], started: threading.Event = None) -> requests.Response:
+        if started is not None:
+            started.set()
+        began = time.perf_counter()
+        response = send()
+        self.tracker.record(time.perf_counter() - began)
+        return response
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="sec-hedge")
+            return self._executor
+
+
+def _is_success(response) -> bool:
+    status = getattr(response, "status_code", None)
+    return not (isinstance(status, int) and status >= 400)
+
+
+def _close_response(future):
+    """Releases the connection held by a request that lost the race."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+# Module-level instance so every downloader shares one latency picture
+_shared_hedge_policy = None
+_shared_hedge_policy_lock = threading.Lock()
+
+
+def get_shared_hedge_policy() -> Optional[HedgePolicy]:
+    """
+    Get or create the process-wide HedgePolicy configured under `sec_downloader.hedging`
+    in app_config.yaml. Returns None when hedging is disabled.
+    """
+    global _shared_hedge_policy
+    if not HEDGING_CONFIG.get("enabled", False):
+        return None
+    with _shared_hedge_policy_lock:
+        if _shared_hedge_policy is None:
+            _shared_hedge_policy = HedgePolicy.from_config()
+            log_info(
+                f"[HEDGE] Hedging requests slower than p{_shared_hedge_policy.percentile * 100:g} "
+                f"(after {_shared_hedge_policy.min_samples} samples)"
+            )
+        return _shared_hedge_policy
@@ -0,0 +1,168 @@
+# downloaders/http_transport.py
+
+'''
+# Role: Shared HTTP transport for every SEC-facing component
+- Keeps TCP/TLS connections alive across requests via a pooled requests.Session.
+- Negotiates gzip/deflate so large .txt submissions and crawler.idx files travel compressed.
+- Tracks connection-level metrics so a run can report how many handshakes it actually paid for.
+- EDGAR_BASE_URL redirects every SEC request to another host (e.g. the fake EDGAR server in tests/fake_edgar).
+- EDGAR_CASSETTE records every response to, or replays them from, an on-disk cassette (downloaders/cassette.py).
+'''
+
+import os
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from downloaders.cassette import HttpCassette
+from utils.report_logger import log_info
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_ACCEPT_ENCODING = "gzip, deflate"
+
+# Hosts rewritten when a base URL override is set; URLs stored in the DB keep the real host
+SEC_HOSTS = ("https://www.sec.gov", "https://data.sec.gov")
+BASE_URL_ENV_VAR = "EDGAR_BASE_URL"
+
+
+class HttpTransport:
+    """
+    Pooled keep-alive HTTP transport.
+
+    One instance is meant to be shared by every downloader and collector in a
+    process (see DailyIngestionPipeline) so that consecutive requests to
+    www.sec.gov reuse the same connections instead of opening a new one per filing.
+    """
+
+    def __init__(self, user_agent: str, pool_size: int = DEFAULT_POOL_SIZE,
+                 accept_encoding: str = DEFAULT_ACCEPT_ENCODING, base_url: Optional[str] = None,
+                 cassette: Optional[HttpCassette] = None):
+        """
+        Parameters:
+            user_agent (str): Default User-Agent header sent with every request.
+            pool_size (int): Max connections kept alive per host.
+            accept_encoding (str): Value for the Accept-Encoding header.
+            base_url (str, optional): Send www.sec.gov / data.sec.gov requests here instead
+                (e.g. "http://127.0.0.1:8765"). Defaults to the EDGAR_BASE_URL environment variable.
+            cassette (HttpCassette, optional): Record responses to / replay them from disk.
+                Defaults to the EDGAR_CASSETTE environment variable.
+        """
+        if not user_agent:
+            raise ValueError("user_agent must be provided to HttpTransport.")
+
+        self.user_agent = user_agent
+        self.pool_size = pool_size
+        self.base_url = (base_url or os.environ.get(BASE_URL_ENV_VAR) or "").rstrip("/") or None
+        self.cassette = cassette if cassette is not None else HttpCassette.from_env()
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept-Encoding": accept_encoding,
+            "Connection": "keep-alive",
+        })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._metrics_lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+        self._bytes_received = 0
+        self._elapsed_seconds = 0.0
+        self._status_counts = Counter()
+
+    def get(self, url: str, headers: Optional[dict] = None, timeout: float = 10, **kwargs) -> requests.Response:
+        """
+        Issues a GET through the pooled session and records metrics.
+
+        Extra keyword arguments (e.g. `stream=True`) are passed to `requests.Session.get`.
+        Network errors are re-raised unchanged after being counted.
+        """
+        started = time.perf_counter()
+        if not self.is_live:
+            response = self.cassette.replay(url, headers)
+        else:
+            if self.cassette is not None:
+                headers = self.cassette.strip_conditional(headers)
+            try:
+                response = self.session.get(self.resolve_url(url), headers=headers, timeout=timeout, **kwargs)
+            except requests.RequestException:
+                with self._metrics_lock:
+                    self._requests += 1
+                    self._errors += 1
+                    self._elapsed_seconds += time.perf_counter() - started
+                raise
+            if self.cassette is not None:
+                self.cassette.record(url, headers, response)
+
+        # Streamed bodies are not read here, so only count bytes we already hold
+        received = 0 if kwargs.get("stream") and not response._content_consumed else len(response.content or b"")
+        with self._metrics_lock:
+            self._requests += 1
+            self._bytes_received += received
+            self._elapsed_seconds += time.perf_counter() - started
+            self._status_counts[response.status_code] += 1
+        return response
+
+    @property
+    def is_live(self) -> bool:
+        """False when responses are replayed from a cassette (no network, no rate budget needed)."""
+        return self.cassette is None or not self.cassette.replaying
+
+    def resolve_url(self, url: str) -> str:
+        """Applies the base URL override, if any, to an SEC URL."""
+        if self.base_url:
+            for host in SEC_HOSTS:
+                if url.startswith(host):
+                    return self.base_url + url[len(host):]
+        return url
+
+    def _connections_opened(self) -> int:
+        """Sums new connections opened across all live urllib3 pools."""
+        total = 0
+        # The same adapter is mounted for http:// and https://; count each once
+        for adapter in {id(a): a for a in self.session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    total += getattr(pool, "num_connections", 0)
+        return total
+
+    def metrics(self) -> dict:
+        """
+        Returns a snapshot of transport metrics.
+
+        `connections_opened` vs. `requests` shows how well keep-alive is working:
+        ideally a whole run opens roughly `pool_size` connections.
+        """
+        with self._metrics_lock:
+            return {
+                "requests": self._requests,
+                "errors": self._errors,
+                "connections_opened": self._connections_opened(),
+                "bytes_received": self._bytes_received,
+                "elapsed_seconds": round(self._elapsed_seconds, 3),
+                "status_counts": dict(self._status_counts),
+            }
+
+    def log_metrics(self, label: str = "HTTP"):
+        m = self.metrics()
+        log_info(
+            f"[{label}] {m['requests']} requests over {m['connections_opened']} connections, "
+            f"{m['bytes_received'] // 1024} KB received, {m['errors']} errors, statuses={m['status_counts']}"
+        )
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
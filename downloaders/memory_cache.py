@@ -0,0 +1,153 @@
+# downloaders/memory_cache.py
+
+'''
+# Role: Bounded in-memory cache of SGML submissions for SgmlDownloader
+- One LRU keyed by canonical accession, with URL aliases pointing at the same entry
+  (no second copy of the content per URL).
+- Size is bounded in bytes; least recently used submissions are evicted first. An entry is
+  re-charged when it is later decoded (or encoded), so held text counts against the budget too.
+- Counters (hits, misses, evictions, releases) show whether the budget fits the workload.
+'''
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+from models.dataclasses.sgml_text_document import SgmlTextDocument
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+class SgmlMemoryCache:
+    """
+    Thread-safe, byte-budgeted LRU of SgmlTextDocument.
+
+    An entry is charged for everything it holds (`SgmlTextDocument.footprint`): the raw bytes
+    when inserted, plus the decoded text once a stage reads `.content`. The newest (or just
+    re-charged) entry is always kept, even if it alone exceeds the budget, so a very large
+    filing is still shared between pipeline stages.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, SgmlTextDocument]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._aliases: Dict[str, str] = {}  # url → accession key
+        self._urls_by_key: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0   # dropped to stay within max_bytes
+        self.releases = 0    # dropped explicitly once every stage was done (discard)
+
+    def get(self, key: str, default=None) -> Optional[SgmlTextDocument]:
+        """Looks up an accession, counting a hit or miss and refreshing its LRU position."""
+        with self._lock:
+            doc = self._entries.get(key)
+            if doc is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return doc
+
+    def peek(self, key: str) -> Optional[SgmlTextDocument]:
+        """Looks up an accession without touching counters or LRU order."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def put(self, key: str, doc: SgmlTextDocument, url: str = None):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            size = doc.footprint()
+            self._entries[key] = doc
+            self._sizes[key] = size
+            self.total_bytes += size
+            doc.on_convert = lambda converted, key=key: self._recharge(key, converted)
+            if url:
+                self._add_alias(url, key)
+            self._evict(keep=key)
+
+    def alias(self, url: str, key: str):
+        """Registers `url` as another name for a cached accession."""
+        with self._lock:
+            if key in self._entries:
+                self._add_alias(url, key)
+
+    def get_by_url(self, url: str) -> Optional[SgmlTextDocument]:
+        with self._lock:
+            key = self._aliases.get(url)
+            return self._entries.get(key) if key is not None else None
+
+    def has_url(self, url: str) -> bool:
+        with self._lock:
+            return self._aliases.get(url) in self._entries
+
+    def discard(self, key: str) -> bool:
+        """Releases an accession (and its aliases) once the caller is done with it."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            self.releases += 1
+            return True
+
+    def clear(self):
+        with self._lock:
+            for doc in self._entries.values():
+                doc.on_convert = None
+            self._entries.clear()
+            self._sizes.clear()
+            self._aliases.clear()
+            self._urls_by_key.clear()
+            self.total_bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "releases": self.releases,
+            }
+
+    def _recharge(self, key: str, doc: SgmlTextDocument):
+        """Called by a cached document that now also holds its decoded (or encoded) form."""
+        with self._lock:
+            if self._entries.get(key) is not doc:
+                return
+            size = doc.footprint()
+            self.total_bytes += size - self._sizes[key]
+            self._sizes[key] = size
+            self._evict(keep=key)
+
+    def _evict(self, keep: str):
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest = next(key for key in self._entries if key != keep)
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _add_alias(self, url: str, key: str):
+        self._aliases[url] = key
+        self._urls_by_key.setdefault(key, set()).add(url)
+
+    def _remove(self, key: str):
+        doc = self._entries.pop(key, None)
+        if doc is not None:
+            doc.on_convert = None
+        self.total_bytes -= self._sizes.pop(key, 0)
+        for url in self._urls_by_key.pop(key, ()):
+            if self._aliases.get(url) == key:
+                del self._aliases[url]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,198 @@
+# downloaders/rate_limiter.py
+
+'''
+# Role: Host-wide token bucket for SEC requests
+- SECDownloader._throttle only spaces requests within a single instance.
+- Several downloaders per process, and several backfill workers per host, must share one budget.
+- Bucket state lives in a small lock file so every process on the host draws from the same tokens.
+- The same file carries the circuit breaker's open-until time (see retry_policy.CircuitBreaker).
+'''
+
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from config.config_loader import ConfigLoader
+from utils.report_logger import log_info
+
+try:
+    import fcntl
+
+    def _lock_fd(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+    def _unlock_fd(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+except ImportError:  # Windows
+    import msvcrt
+
+    def _lock_fd(fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+    def _unlock_fd(fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+# Two doubles: available tokens, last refill timestamp (epoch seconds)
+_STATE_FORMAT = "<dd"
+_STATE_SIZE = struct.calcsize(_STATE_FORMAT)
+
+# Other host-wide state is stored after the bucket, under the same lock
+SHARED_STATE_OFFSET = _STATE_SIZE
+
+DEFAULT_STATE_PATH = os.path.join(tempfile.gettempdir(), "edgar_sec_rate_limit.state")
+
+# Load config once at module import
+RATE_LIMIT_CONFIG = ConfigLoader.load_config().get("sec_downloader", {}).get("rate_limit", {}) or {}
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket limiting requests to `requests_per_second`.
+
+    With `state_path` set, the bucket is stored in that file and guarded by an
+    exclusive file lock, so all processes pointing at the same path share one
+    aggregate budget. Without it, the bucket is shared only within this process.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int = 1, state_path: Optional[str] = None):
+        """
+        Parameters:
+            requests_per_second (float): Aggregate request rate allowed across all users of the bucket.
+            burst (int): Bucket capacity. 1 spaces requests evenly at exactly the allowed rate.
+            state_path (str, optional): Lock/state file for cross-process sharing.
+        """
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+
+        self.rate = float(requests_per_second)
+        self.capacity = float(max(1, burst))
+        self.state_path = state_path
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.time()
+
+        if state_path:
+            os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Blocks until `tokens` are available and consumes them.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(tokens)
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def _try_acquire(self, tokens: float) -> float:
+        """Takes tokens if available; otherwise returns how long to wait before retrying."""
+        with self._lock:
+            if not self.state_path:
+                return self._take(tokens)
+
+            with locked_state_file(self.state_path) as fd:
+                self._read_state(fd)
+                wait = self._take(tokens)
+                self._write_state(fd)
+                return wait
+
+    def _take(self, tokens: float) -> float:
+        now = time.time()
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+    def _read_state(self, fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        raw = os.read(fd, _STATE_SIZE)
+        if len(raw) == _STATE_SIZE:
+            self._tokens, self._updated = struct.unpack(_STATE_FORMAT, raw)
+        else:
+            # Fresh state file: start with a full bucket
+            self._tokens, self._updated = self.capacity, time.time()
+
+    def _write_state(self, fd: int):
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, struct.pack(_STATE_FORMAT, self._tokens, self._updated))
+
+
+@contextmanager
+def locked_state_file(state_path: str) -> Iterator[int]:
+    """
+    Opens a state file and holds its exclusive lock for the block, yielding the descriptor.
+    """
+    # Opened per call: a descriptor inherited across fork() would share its lock
+    fd = os.open(state_path, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        _lock_fd(fd)
+        try:
+            yield fd
+        finally:
+            _unlock_fd(fd)
+    finally:
+        os.close(fd)
+
+
+def get_host_state_path() -> Optional[str]:
+    """
+    The state file of the host-wide limiter configured under `sec_downloader.rate_limit`,
+    or None when that limiter is disabled.
+    """
+    if not RATE_LIMIT_CONFIG.get("enabled", False):
+        return None
+    return RATE_LIMIT_CONFIG.get("state_path") or DEFAULT_STATE_PATH
+
+
+# Module-level registry so every downloader in a process shares one limiter per state file
+_shared_limiters = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def get_shared_rate_limiter(requests_per_second: float, burst: int = 1,
+                            state_path: Optional[str] = DEFAULT_STATE_PATH) -> TokenBucketRateLimiter:
+    """
+    Get or create the process-wide limiter for a given state file.
+    Logged once, when the limiter is first created.
+    """
+    key = (state_path, float(requests_per_second), int(burst))
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            limiter = TokenBucketRateLimiter(requests_per_second, burst=burst, state_path=state_path)
+            _shared_limiters[key] = limiter
+            log_info(f"[RATE] Using shared SEC rate limit of {limiter.rate:g} req/s ({limiter.state_path or 'in-process'})")
+        return limiter
+
+
+def get_host_rate_limiter() -> Optional[TokenBucketRateLimiter]:
+    """
+    Returns the host-wide limiter configured under `sec_downloader.rate_limit`
+    in app_config.yaml, or None when it is disabled.
+    """
+    state_path = get_host_state_path()
+    if state_path is None:
+        return None
+
+    return get_shared_rate_limiter(
+        requests_per_second=RATE_LIMIT_CONFIG.get("requests_per_second", 10),
+        burst=RATE_LIMIT_CONFIG.get("burst", 1),
+        state_path=state_path,
+    )
@@ -0,0 +1,222 @@
+# downloaders/retry_policy.py
+
+'''
+# Role: Retry/backoff policy and circuit breaker used by SECDownloader
+- RetryPolicy decides whether a failed request is retried and how long to wait (exponential backoff, full jitter, Retry-After).
+- CircuitBreaker pauses every downloader in the process once the SEC starts throttling us; with a
+  state file (the host rate limiter's, by default) it pauses every process on the host.
+'''
+
+import os
+import random
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+from config.config_loader import ConfigLoader
+from downloaders.cassette import CASSETTE_ENV_VAR
+from downloaders.http_transport import BASE_URL_ENV_VAR
+from downloaders.rate_limiter import SHARED_STATE_OFFSET, get_host_state_path, locked_state_file
+from utils.report_logger import log_warn, log_info
+
+# Statuses the SEC uses to tell us to slow down
+THROTTLE_STATUSES = (429, 503)
+
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Load config once at module import
+_DOWNLOADER_CONFIG = ConfigLoader.load_config().get("sec_downloader", {}) or {}
+RETRY_CONFIG = _DOWNLOADER_CONFIG.get("retry", {}) or {}
+CIRCUIT_BREAKER_CONFIG = _DOWNLOADER_CONFIG.get("circuit_breaker", {}) or {}
+
+# One double after the rate limiter's bucket: open-until timestamp (epoch seconds)
+_OPEN_UNTIL_FORMAT = "<d"
+_OPEN_UNTIL_SIZE = struct.calcsize(_OPEN_UNTIL_FORMAT)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header (delta-seconds or HTTP-date) into seconds from now.
+    Returns None if the header is missing or unparseable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+
+    Attempt n (0-based) waits a random time in [0, min(max_delay, base_delay * 2**n)],
+    or the server's Retry-After if that is longer (capped at `max_retry_after`).
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 30.0,
+                 retry_statuses: Iterable[int] = DEFAULT_RETRY_STATUSES, max_retry_after: float = 300.0):
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.max_retry_after = max_retry_after
+
+    @classmethod
+    def from_config(cls, config: dict = None) -> "RetryPolicy":
+        config = RETRY_CONFIG if config is None else config
+        return cls(
+            max_retries=config.get("max_retries", 3),
+            base_delay=config.get("base_delay_seconds", 0.5),
+            max_delay=config.get("max_delay_seconds", 30.0),
+            retry_statuses=config.get("retry_statuses", DEFAULT_RETRY_STATUSES),
+            max_retry_after=config.get("max_retry_after_seconds", 300.0),
+        )
+
+    def should_retry_status(self, status_code: int) -> bool:
+        return status_code in self.retry_statuses
+
+    def compute_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            return max(backoff, min(retry_after, self.max_retry_after))
+        return backoff
+
+
+class CircuitBreaker:
+    """
+    Opens after `throttle_threshold` consecutive throttling responses and makes
+    every caller of `wait_if_open()` sleep until the cooldown (or the server's
+    Retry-After, if longer) has passed. A successful response closes it again.
+
+    With `state_path` set, the open-until time is kept in that file (after the
+    token bucket of a TokenBucketRateLimiter on the same path) under its lock, so
+    a breaker opened by one process pauses every process sharing the file.
+    Throttle counts stay per process.
+    """
+
+    def __init__(self, throttle_threshold: int = 3, cooldown_seconds: float = 60.0, state_path: Optional[str] = None):
+        self.throttle_threshold = max(1, throttle_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._consecutive_throttles = 0
+        self._open_until = 0.0
+
+        if state_path:
+            os.makedirs(os.path.dirname(os.path.abspath(state_path)), exist_ok=True)
+
+    @classmethod
+    def from_config(cls, config: dict = None, state_path: Optional[str] = None) -> "CircuitBreaker":
+        config = CIRCUIT_BREAKER_CONFIG if config is None else config
+        return cls(
+            throttle_threshold=config.get("throttle_threshold", 3),
+            cooldown_seconds=config.get("cooldown_seconds", 60.0),
+            state_path=state_path,
+        )
+
+    @property
+    def is_open(self) -> bool:
+        return time.time() < self._current_open_until()
+
+    def wait_if_open(self) -> float:
+        """Blocks while the breaker is open. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            remaining = self._current_open_until() - time.time()
+            if remaining <= 0:
+                return waited
+            time.sleep(remaining)
+            waited += remaining
+
+    def record_success(self):
+        with self._lock:
+            self._consecutive_throttles = 0
+
+    def record_throttle(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self._consecutive_throttles += 1
+            if self._consecutive_throttles < self.throttle_threshold:
+                return
+            pause = max(self.cooldown_seconds, retry_after or 0.0)
+            open_until = time.time() + pause
+            if self._extend_open_until(open_until):
+                log_warn(f"[CIRCUIT] SEC is throttling us; pausing all requests for {pause:.0f}s")
+            self._consecutive_throttles = 0
+
+    def _current_open_until(self) -> float:
+        """The latest open-until time set by this process or, with a state file, any other."""
+        if self.state_path:
+            with locked_state_file(self.state_path) as fd:
+                self._open_until = max(self._open_until, self._read_open_until(fd))
+        return self._open_until
+
+    def _extend_open_until(self, open_until: float) -> bool:
+        """Moves the open-until time forward (never back). Returns whether it moved."""
+        if not self.state_path:
+            extended = open_until > self._open_until
+            self._open_until = max(self._open_until, open_until)
+            return extended
+        with locked_state_file(self.state_path) as fd:
+            shared = self._read_open_until(fd)
+            extended = open_until > shared
+            if extended:
+                os.lseek(fd, SHARED_STATE_OFFSET, os.SEEK_SET)
+                os.write(fd, struct.pack(_OPEN_UNTIL_FORMAT, open_until))
+            self._open_until = max(self._open_until, shared, open_until)
+        return extended
+
+    @staticmethod
+    def _read_open_until(fd: int) -> float:
+        os.lseek(fd, SHARED_STATE_OFFSET, os.SEEK_SET)
+        raw = os.read(fd, _OPEN_UNTIL_SIZE)
+        if len(raw) == _OPEN_UNTIL_SIZE:
+            return struct.unpack(_OPEN_UNTIL_FORMAT, raw)[0]
+        return 0.0
+
+
+# Module-level registry so every downloader in the process pauses together (key: state file, None = in-process)
+_shared_circuit_breakers = {}
+_shared_circuit_breaker_lock = threading.Lock()
+
+
+def _shared_state_path() -> Optional[str]:
+    """
+    The state file the shared breaker uses, or None to keep it in-process.
+
+    The host state file only tracks throttling by the SEC: when requests go to another host
+    (EDGAR_BASE_URL) or are served from a cassette, their 429/503s must not pause real downloads.
+    """
+    if os.environ.get(BASE_URL_ENV_VAR) or os.environ.get(CASSETTE_ENV_VAR):
+        return None
+    return get_host_state_path()
+
+
+def get_shared_circuit_breaker() -> CircuitBreaker:
+    """
+    Get or create the process-wide CircuitBreaker configured under
+    `sec_downloader.circuit_breaker` in app_config.yaml. When the host rate limiter is
+    enabled and requests go to the SEC, the breaker shares its state file, so it opens
+    for every process on the host.
+    """
+    state_path = _shared_state_path()
+    with _shared_circuit_breaker_lock:
+        breaker = _shared_circuit_breakers.get(state_path)
+        if breaker is None:
+            breaker = _shared_circuit_breakers[state_path] = CircuitBreaker.from_config(state_path=state_path)
+            log_info(
+                f"[CIRCUIT] Shared circuit breaker: opens after {breaker.throttle_threshold} "
+                f"throttled responses for {breaker.cooldown_seconds:g}s "
+                f"({breaker.state_path or 'in-process'})"
+            )
+        return breaker
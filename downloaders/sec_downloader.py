@@ -1,66 +1,282 @@
 # downloaders/sec_downloader.py (refactored)
 
+import hashlib
+import os
 import time
+import threading
+from typing import Optional, Tuple
 import requests
 from downloaders.base_downloader import BaseDownloader
+from downloaders.http_transport import HttpTransport
+from downloaders.rate_limiter import TokenBucketRateLimiter
+from downloaders.retry_policy import RetryPolicy, CircuitBreaker, THROTTLE_STATUSES, parse_retry_after, get_shared_circuit_breaker
+from downloaders.validator_store import ValidatorStore
+from downloaders.hedging import HedgePolicy, get_shared_hedge_policy
+from utils.report_logger import log_warn
 
 class SECDownloader(BaseDownloader):
-    def __init__(self, user_agent: str, request_delay_seconds: float = 1.0):
+    def __init__(self, user_agent: str, request_delay_seconds: float = 1.0, transport: HttpTransport = None,
+                 rate_limiter: TokenBucketRateLimiter = None, retry_policy: RetryPolicy = None,
+                 circuit_breaker: CircuitBreaker = None, validator_store: ValidatorStore = None,
+                 hedge_policy: HedgePolicy = None):
         """
         Initializes the SECDownloader with a user agent and polite request delay.
+
+        Pass a shared `transport` to reuse pooled keep-alive connections across
+        downloaders and collectors; otherwise a private one is created.
+
+        Pass a `rate_limiter` (see downloaders.rate_limiter.get_host_rate_limiter) to
+        draw from a host-wide request budget instead of the per-instance delay.
+
+        `retry_policy` defaults to the `sec_downloader.retry` config and
+        `circuit_breaker` to the process-wide breaker shared by all downloaders.
+
+        Pass a `validator_store` (see downloaders.validator_store.get_shared_validator_store)
+        to make the `*_if_modified` methods send conditional requests. Their validators are
+        held until the caller reports success with `commit_validators`.
+
+        `hedge_policy` defaults to the process-wide policy from `sec_downloader.hedging`
+        (None when disabled); with one set, requests slower than the tracked p95 are hedged.
         """
         if not user_agent:
             raise ValueError("user_agent must be provided to SECDownloader.")
 
         self.user_agent = user_agent
+        self.transport = transport or HttpTransport(user_agent=user_agent)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy.from_config()
+        self.circuit_breaker = circuit_breaker or get_shared_circuit_breaker()
+        self.validator_store = validator_store
+        self._pending_validators = {}  # key → headers of a 200 not yet processed by the caller
+        self.hedge_policy = hedge_policy if hedge_policy is not None else get_shared_hedge_policy()
         self.delay = request_delay_seconds
         self.last_request_time = None
+        self._next_request_time = 0.0
+        self._throttle_lock = threading.Lock()
 
     def download(self, url: str) -> str:
         return self.download_html(url)
 
     def _throttle(self):
-        """Ensure polite delay between SEC requests."""
-        if self.last_request_time is not None:
-            elapsed = time.time() - self.last_request_time
-            if elapsed < self.delay:
-                time.sleep(self.delay - elapsed)
+        """
+        Ensure polite delay between SEC requests.
 
-    def _make_request(self, url: str) -> requests.Response:
+        Each caller reserves the next free request slot under a lock, so threads
+        sharing this downloader (see SgmlDownloader.download_many) stay under the
+        same global rate cap of one request per `delay` seconds.
+
+        When a shared rate limiter is configured it replaces the per-instance
+        delay, so all downloaders on the host share one aggregate budget.
+
+        Replayed cassette responses never reach the SEC and are not throttled.
+        """
+        if not self.transport.is_live:
+            return
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+            return
+
+        with self._throttle_lock:
+            now = time.time()
+            slot = max(now, self._next_request_time)
+            self._next_request_time = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _make_request(self, url: str, headers: dict = None, **kwargs) -> requests.Response:
         """Internal method to make a GET request with headers."""
-        headers = {"User-Agent": self.user_agent}
-        response = requests.get(url, headers=headers, timeout=10)
+        request_headers = {"User-Agent": self.user_agent}
+        if headers:
+            request_headers.update(headers)
+        response = self.transport.get(url, headers=request_headers, timeout=10, **kwargs)
         return response
 
+    def _send(self, url: str, headers: dict = None, **kwargs) -> requests.Response:
+        """One attempt of `_get_with_retry`: `_make_request`, hedged when a policy is set."""
+        if self.hedge_policy is None or not self.transport.is_live:
+            return self._make_request(url, headers=headers, **kwargs)
+        # Streamed, so the policy times and races the headers; the winner's body is read by
+        # the caller. The hedge is throttled like any request, so it spends rate budget
+        streamed = dict(kwargs, stream=True)
+        return self.hedge_policy.execute(
+            lambda: self._make_request(url, headers=headers, **streamed),
+            before_hedge=self._throttle
+        )
+
+    def _get_with_retry(self, url: str, headers: dict = None, ok_statuses: tuple = (200,), **kwargs) -> requests.Response:
+        """
+        Issues a throttled GET, retrying transient failures per `self.retry_policy`.
+
+        - Network errors and retryable statuses (429/5xx by default) are retried
+          with exponential backoff and jitter, honoring Retry-After.
+        - 429/503 responses are reported to the shared circuit breaker, which
+          pauses every downloader in the process once the SEC is throttling us.
+
+        Extra `headers` and keyword arguments (e.g. `stream=True`) are passed to
+        `_make_request`. Returns the first response whose status is in
+        `ok_statuses`, or raises once retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            self.circuit_breaker.wait_if_open()
+            self._throttle()
+            retry_after = None
+            try:
+                response = self._send(url, headers=headers, **kwargs)
+                self.last_request_time = time.time()
+            except requests.RequestException as e:
+                self.last_request_time = time.time()
+                if attempt >= self.retry_policy.max_retries:
+                    raise Exception(f"Network error occurred while fetching {url}: {str(e)}")
+                reason = f"network error: {e}"
+            else:
+                if response.status_code in ok_statuses:
+                    self.circuit_breaker.record_success()
+                    return response
+
+                if response.status_code in THROTTLE_STATUSES:
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    self.circuit_breaker.record_throttle(retry_after)
+                # Not returned, so nobody else will release it (a streamed body holds its connection)
+                response.close()
+
+                if (not self.retry_policy.should_retry_status(response.status_code)
+                        or attempt >= self.retry_policy.max_retries):
+                    raise Exception(f"Failed to fetch URL: {url}. Status code: {response.status_code}")
+                reason = f"status {response.status_code}"
+
+            delay = self.retry_policy.compute_delay(attempt, retry_after)
+            attempt += 1
+            log_warn(f"[RETRY] {url} ({reason}); attempt {attempt}/{self.retry_policy.max_retries} in {delay:.2f}s")
+            time.sleep(delay)
+
     def download_html(self, url: str) -> str:
         """
         Downloads raw HTML from the given SEC URL.
         Returns HTML content as a string.
         """
-        self._throttle()
-        try:
-            response = self._make_request(url)
-            self.last_request_time = time.time()
+        return self._get_with_retry(url).text
 
-            if response.status_code == 200:
-                return response.text
-            else:
-                raise Exception(f"Failed to fetch URL: {url}. Status code: {response.status_code}")
-        except requests.RequestException as e:
-            raise Exception(f"Network error occurred while fetching {url}: {str(e)}")
+    def download_bytes(self, url: str) -> bytes:
+        """
+        Downloads a resource as the raw bytes received.
+        Skips `response.text`, which runs charset detection over the whole body when
+        the server sends no charset; callers decode only what they need.
+        """
+        return self._get_with_retry(url).content
 
     def download_json(self, url: str) -> dict:
         """
         Downloads JSON data from a given SEC URL.
         """
-        self._throttle()
+        return self._get_with_retry(url).json()
+
+    def download_if_modified(self, url: str, key: str = None) -> Optional[requests.Response]:
+        """
+        Conditional GET using the validators stored under `key` (defaults to `url`).
+
+        Returns None on 304 Not Modified, otherwise the 200 response. Its validators
+        are held, not recorded: call `commit_validators(key)` once the body has been
+        processed. Without a validator store this is a plain GET.
+        """
+        key = key or url
+        headers = self.validator_store.conditional_headers(key) if self.validator_store is not None else {}
+        response = self._get_with_retry(url, headers=headers or None, ok_statuses=(200, 304))
+        if response.status_code == 304:
+            response.close()
+            return None
+        if self.validator_store is not None:
+            with self._throttle_lock:
+                self._pending_validators[key] = response.headers
+        return response
+
+    def download_json_if_modified(self, url: str, key: str = None) -> Optional[dict]:
+        """
+        Downloads JSON only if it changed since the last committed call with the same
+        `key` (defaults to `url`). Returns None when the server answers 304 Not Modified.
+
+        The response's validators are held, not recorded: call `commit_validators(key)`
+        once the data has been processed, so a failed run is fetched in full next time.
+        """
+        response = self.download_if_modified(url, key=key)
+        if response is None:
+            return None
+        return response.json()
+
+    def commit_validators(self, key: str):
+        """Records the validators held for `key` by the last `*_if_modified` call, if any."""
+        with self._throttle_lock:
+            headers = self._pending_validators.pop(key, None)
+        if self.validator_store is not None and headers is not None:
+            self.validator_store.record(key, headers)
+
+    def download_prefix(self, url: str, stop_marker: bytes, max_bytes: int = 65536,
+                        chunk_size: int = 8192) -> Optional[bytes]:
+        """
+        Fetches only the beginning of a resource with an HTTP Range request.
+
+        The body is streamed until `stop_marker` has been seen or `max_bytes`
+        have been read, and the connection is released without reading the rest.
+        Compression is disabled for this request so byte ranges refer to the file itself.
+
+        Returns:
+            bytes up to and including `stop_marker`, or None if it was not found
+            within `max_bytes` (the caller should fall back to a full fetch).
+        """
+        response = self._get_with_retry(
+            url,
+            headers={"Range": f"bytes=0-{max_bytes - 1}", "Accept-Encoding": "identity"},
+            ok_statuses=(200, 206),
+            stream=True
+        )
+        buffer = bytearray()
         try:
-            response = self._make_request(url)
-            self.last_request_time = time.time()
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if not chunk:
+                    continue
+                # Only rescan the tail that could contain a marker split across chunks
+                scan_from = max(0, len(buffer) - len(stop_marker))
+                buffer.extend(chunk)
+                marker_pos = buffer.find(stop_marker, scan_from)
+                if marker_pos != -1:
+                    return bytes(buffer[:marker_pos + len(stop_marker)])
+                if len(buffer) >= max_bytes:
+                    break
+        finally:
+            response.close()
+        return None
 
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise Exception(f"Failed to fetch URL: {url}. Status code: {response.status_code}")
-        except requests.RequestException as e:
-            raise Exception(f"Network error occurred while fetching {url}: {str(e)}")
+    def download_to_file(self, url: str, path: str, chunk_size: int = 1024 * 1024) -> Tuple[int, str]:
+        """
+        Streams a resource straight to `path` without holding the body in memory.
+
+        Chunks are written to `<path>.part` while a SHA-256 of the content is
+        computed; the file is fsynced and renamed into place only after the download
+        completes, so a partial file is never mistaken for a finished one.
+
+        Returns:
+            (bytes_written, sha256_hexdigest)
+        """
+        response = self._get_with_retry(url, stream=True)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part_path = f"{path}.part"
+        digest = hashlib.sha256()
+        written = 0
+        try:
+            with open(part_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    digest.update(chunk)
+                    written += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(part_path, path)
+        except Exception:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        finally:
+            response.close()
+        return written, digest.hexdigest()
@@ -0,0 +1,208 @@
+# downloaders/sgml_disk_cache.py
+
+'''
+# Role: Local, compressed, content-addressed disk cache of SGML submissions (SgmlDownloader's disk tier)
+- Submissions are stored once per content hash under cache_sgml/objects/, compressed with gzip
+  (or zstd when the optional `zstandard` package is installed and configured).
+- A small reference file per canonical accession (cache_sgml/accessions/) names the object holding it.
+- EDGAR archive files never change after acceptance, so entries never go stale. Every read is
+  decompressed and checked against the hash in the object name; corrupt entries are dropped and
+  reported as misses.
+- Lookups go through the SQLite catalog (utils/cache_manager.py), which also tracks sizes and last
+  access for LRU / idle eviction and purges by CIK, year or form type. Reference files remain the
+  durable mapping the catalog can be rebuilt from (`rebuild_catalog`).
+'''
+
+import gzip
+import hashlib
+import os
+import re
+import threading
+from typing import Optional
+
+from config.config_loader import ConfigLoader
+from utils.cache_manager import SgmlCacheCatalog, get_cache_root, get_catalog_path, get_shared_cache_catalog
+from utils.path_manager import build_sgml_object_path, build_sgml_ref_path
+from utils.report_logger import log_info, log_warn
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# Load config once at module import
+DISK_CACHE_CONFIG = (ConfigLoader.load_config().get("sec_downloader", {}) or {}).get("disk_cache", {}) or {}
+
+EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+DEFAULT_LEVELS = {"gzip": 6, "zstd": 10}
+
+# SEC-HEADER fields recorded in the catalog (only the first HEADER_SCAN_BYTES are searched)
+HEADER_SCAN_BYTES = 8192
+_FORM_TYPE_RE = re.compile(rb"CONFORMED SUBMISSION TYPE:\s*([^\r\n]+)")
+_CIK_RE = re.compile(rb"CENTRAL INDEX KEY:\s*(\d+)")
+_FILED_RE = re.compile(rb"FILED AS OF DATE:\s*(\d{4})")
+
+
+class SgmlDiskCache:
+    """Immutable store of submission bytes keyed by canonical accession (no dashes)."""
+
+    def __init__(self, compression: str = None, level: int = None, catalog: SgmlCacheCatalog = None):
+        compression = compression or DISK_CACHE_CONFIG.get("compression", "gzip")
+        if compression not in EXTENSIONS:
+            raise ValueError(f"[ERROR] Unsupported disk_cache compression: '{compression}' — expected 'gzip' or 'zstd'")
+        if compression == "zstd" and zstandard is None:
+            log_warn("[DISK-CACHE] zstd requested but the 'zstandard' package is not installed; using gzip")
+            compression = "gzip"
+        self.compression = compression
+        if level is None:
+            level = DISK_CACHE_CONFIG.get("level")
+        self.level = level if level is not None else DEFAULT_LEVELS[compression]
+        self._catalog = catalog
+
+    @property
+    def catalog(self) -> SgmlCacheCatalog:
+        """The catalog passed in, or the shared one of the current cache root (opened on first use)."""
+        return self._catalog or get_shared_cache_catalog()
+
+    def contains(self, key: str) -> bool:
+        return self._lookup(key) is not None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the decompressed, hash-verified submission, or None on a miss."""
+        entry = self._lookup(key)
+        if entry is None:
+            return None
+        path = entry["object_path"]
+        try:
+            with open(path, "rb") as f:
+                data = _decompress(path, f.read())
+        except FileNotFoundError:
+            log_warn(f"[DISK-CACHE] Catalogued entry for {key} is missing on disk ({path})")
+            self.catalog.remove(key)
+            return None
+        except (OSError, EOFError, ValueError, RuntimeError) as e:
+            log_warn(f"[DISK-CACHE] Unreadable entry for {key} ({path}): {e}; dropping it")
+            self._drop(key, path)
+            return None
+
+        if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+            log_warn(f"[DISK-CACHE] Hash mismatch for {key} ({path}); dropping it")
+            self._drop(key, path)
+            return None
+        self.catalog.touch(key)
+        return data
+
+    def put(self, key: str, data: bytes, cik: str = None, year: str = None) -> str:
+        """
+        Stores `data` under `key` and returns the object path. Identical content is stored once.
+        The catalog records `cik` / `year` (or the SEC-HEADER values when omitted) and the form type.
+        """
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = build_sgml_object_path(sha256, EXTENSIONS[self.compression])
+        if not os.path.exists(path):
+            _write_atomic(path, self._compress(data))
+            log_info(f"[DISK-CACHE] Stored {key}: {len(data) // 1024} KB → {os.path.getsize(path) // 1024} KB ({self.compression})")
+        _write_atomic(build_sgml_ref_path(key), os.path.relpath(path, _objects_root(path)).encode("ascii"))
+        self._record(key, path, sha256, data, cik, year)
+        return path
+
+    def rebuild_catalog(self, root: str = None) -> int:
+        """
+        Catalogs every reference file under `root` (default cache_sgml/accessions) that the catalog
+        lacks, e.g. entries written before it existed or after the catalog file was lost.
+        CIK and year come from the SEC-HEADER. Returns the count added.
+        """
+        root = root or os.path.join(get_cache_root(), "accessions")
+        added = 0
+        for _, _, files in os.walk(root):
+            for name in files:
+                key, extension = os.path.splitext(name)
+                if extension != ".ref" or self.catalog.lookup(key) is not None:
+                    continue
+                path = self._object_path(key)
+                if path is None:
+                    continue
+                try:
+                    with open(path, "rb") as f:
+                        data = _decompress(path, f.read())
+                except (OSError, EOFError, ValueError, RuntimeError) as e:
+                    log_warn(f"[DISK-CACHE] Skipping unreadable entry for {key}: {e}")
+                    continue
+                sha256 = hashlib.sha256(data).hexdigest()
+                if not os.path.basename(path).startswith(sha256):
+                    log_warn(f"[DISK-CACHE] Skipping corrupt entry for {key} ({path})")
+                    continue
+                self._record(key, path, sha256, data, None, None)
+                added += 1
+        log_info(f"[DISK-CACHE] Catalogued {added} existing entries from {root}")
+        return added
+
+    def _lookup(self, key: str):
+        # Reads never create the catalog: a cache that was never written is simply empty
+        if self._catalog is None and not os.path.exists(get_catalog_path()):
+            return None
+        return self.catalog.lookup(key)
+
+    def _record(self, key: str, path: str, sha256: str, data: bytes, cik: Optional[str], year: Optional[str]):
+        header = data[:HEADER_SCAN_BYTES]
+        self.catalog.record(
+            key, path, sha256,
+            size_bytes=os.path.getsize(path),
+            raw_bytes=len(data),
+            cik=cik or _header_field(_CIK_RE, header),
+            year=year or _header_field(_FILED_RE, header),
+            form_type=_header_field(_FORM_TYPE_RE, header),
+        )
+
+    def _object_path(self, key: str) -> Optional[str]:
+        ref_path = build_sgml_ref_path(key)
+        try:
+            with open(ref_path, "r", encoding="ascii") as f:
+                relative = f.read().strip()
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            log_warn(f"[DISK-CACHE] Unreadable reference for {key}: {e}")
+            return None
+        sha256, _, extension = os.path.basename(relative).partition(".txt")
+        return build_sgml_object_path(sha256, extension)
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=self.level, write_checksum=True).compress(data)
+        # mtime=0 keeps the compressed bytes a pure function of the content
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def _drop(self, key: str, path: str):
+        self.catalog.remove(key)
+        for stale in (build_sgml_ref_path(key), path):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+def _header_field(pattern: "re.Pattern", header: bytes) -> Optional[str]:
+    match = pattern.search(header)
+    return match.group(1).strip().decode("ascii", errors="replace") if match else None
+
+
+def _decompress(path: str, blob: bytes) -> bytes:
+    if path.endswith(EXTENSIONS["zstd"]):
+        if zstandard is None:
+            raise RuntimeError("the 'zstandard' package is required to read .zst entries")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return gzip.decompress(blob)
+
+
+def _objects_root(object_path: str) -> str:
+    # cache_sgml/objects/<ab>/<sha256>.txt.gz → cache_sgml/objects
+    return os.path.dirname(os.path.dirname(object_path))
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
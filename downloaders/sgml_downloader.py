@@ -1,20 +1,49 @@
 # downloaders/sgml_downloader.py
 
 '''
-# Role: Downloads SGML .txt using inherited retry logic
+# Role: Downloads SGML .txt using inherited retry logic (SECDownloader._get_with_retry)
 - Uses caching to mitigate using SgmlDownloader twice upon parsing metadata from sgml and then writing sgml to disk.
+- Memory cache is keyed by accession only: the same submission reached via the issuer CIK or a
+  reporting-owner CIK is fetched once (see utils/README.md, "SEC EDGAR URL Structure").
+- Fetches are single-flight: concurrent callers for an accession that is already downloading
+  wait for that request and share its result instead of issuing their own.
+- The disk cache (downloaders/sgml_disk_cache.py) is compressed, keyed by accession and never goes stale.
+- SGML already stored under raw/ (any CIK, see utils/artifact_locator.py) is read from disk, not re-downloaded.
+- With a cluster-wide shared cache configured (downloaders/shared_content_cache.py), it is consulted
+  before the SEC and filled after every download, so other hosts never re-fetch the submission.
 '''
 
 import os
-import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from config.config_loader import ConfigLoader
 from downloaders.sec_downloader import SECDownloader
+from downloaders.http_transport import HttpTransport
+from downloaders.rate_limiter import TokenBucketRateLimiter
+from downloaders.retry_policy import CircuitBreaker
+from downloaders.memory_cache import DEFAULT_MAX_BYTES, SgmlMemoryCache
+from downloaders.shared_content_cache import SharedContentCache, get_shared_content_cache
+from downloaders.sgml_disk_cache import SgmlDiskCache
 from models.dataclasses.sgml_text_document import SgmlTextDocument
-from utils.path_manager import build_cache_path
+from models.dataclasses.sgml_file_document import SgmlFileDocument
+from utils.artifact_locator import (
+    commit_part_file, find_stored_sgml, is_recorded_artifact, read_stored_sgml, register_raw_artifact, write_file_atomic
+)
 from utils.url_builder import construct_sgml_txt_url
+from utils.accession_formatter import format_for_url
 from utils.report_logger import log_info, log_warn, log_error
 
+SEC_HEADER_END = b"</SEC-HEADER>"
+
+# Load config once at module import
+DEFAULT_PREFETCH_WINDOW = max(0, (ConfigLoader.load_config().get("sec_downloader", {}) or {}).get("prefetch_window", 4))
+
 class SgmlDownloader(SECDownloader):
-    def __init__(self, user_agent: str, request_delay_seconds: float = 1.0, use_cache: bool = True):
+    def __init__(self, user_agent: str, request_delay_seconds: float = 1.0, use_cache: bool = True, max_workers: int = 4,
+                 transport: HttpTransport = None, rate_limiter: TokenBucketRateLimiter = None,
+                 shared_cache: SharedContentCache = None, memory_cache_max_bytes: int = DEFAULT_MAX_BYTES,
+                 disk_cache: SgmlDiskCache = None, circuit_breaker: CircuitBreaker = None):
         """
         Initializes the SGML downloader.
 
@@ -23,72 +52,143 @@ class SgmlDownloader(SECDownloader):
             use_cache (bool): 
                 If True, enables reading and writing to the local file-based SGML cache.
                 If False, disables all disk-based cache behavior (default).
+            max_workers (int): Maximum number of requests kept in flight by download_many().
+            transport (HttpTransport, optional): Shared pooled transport; a private one is created if omitted.
+            rate_limiter (TokenBucketRateLimiter, optional): Host-wide limiter replacing the per-instance delay.
+            shared_cache (SharedContentCache, optional): Cluster-wide submission cache; defaults to
+                `sec_downloader.shared_cache` in app_config.yaml (None when not configured).
+            memory_cache_max_bytes (int): Byte budget of the in-memory LRU of submissions.
+            disk_cache (SgmlDiskCache, optional): Local compressed cache used when `use_cache` is True;
+                defaults to `sec_downloader.disk_cache` in app_config.yaml.
+            circuit_breaker (CircuitBreaker, optional): Defaults to the process-wide breaker
+                shared by every SECDownloader.
         """        
-        super().__init__(user_agent=user_agent, request_delay_seconds=request_delay_seconds)
+        super().__init__(
+            user_agent=user_agent,
+            request_delay_seconds=request_delay_seconds,
+            transport=transport,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker
+        )
         self.use_cache = use_cache
-        self.memory_cache = {} # key: (cik, accession, year) → value: SgmlTextDocument
-        self.url_cache = {}   # key: url → value: content
+        self.max_workers = max(1, max_workers)
+        # key: canonical accession (no dashes) → SgmlTextDocument, with each URL used registered as an alias
+        self.memory_cache = SgmlMemoryCache(max_bytes=memory_cache_max_bytes)
+        self.header_cache = {}  # key: canonical accession → value: SEC-HEADER text (partial fetches)
+        self._background_executor = None  # created on first prefetch_async()
+        self._inflight = {}  # key: canonical accession (or ("header", accession)) → Future of the running fetch
+        self._inflight_lock = threading.Lock()
+        self.coalesced_requests = 0  # callers served by another caller's in-flight fetch
+        self.shared_cache = shared_cache if shared_cache is not None else get_shared_content_cache()
+        self.disk_cache = disk_cache or SgmlDiskCache()
 
     def clear_memory_cache(self):
-        """Clear both memory caches."""
+        """Clear all memory caches."""
         self.memory_cache.clear()
-        self.url_cache.clear()
+        self.header_cache.clear()
+
+    def evict(self, accession_number: str):
+        """Drops one accession from the memory caches, including every URL alias registered for it."""
+        key = self._accession_key(accession_number)
+        self.memory_cache.discard(key)
+        self.header_cache.pop(key, None)
+
+    def _single_flight(self, flight_key, fetch: Callable):
+        """
+        Runs `fetch` unless a fetch for `flight_key` is already running, in which case
+        waits for it and returns its result (or re-raises its error).
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(flight_key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[flight_key] = future
+            else:
+                self.coalesced_requests += 1
+
+        if not leader:
+            log_info(f"⏳ Waiting on in-flight fetch for {flight_key}")
+            return future.result()
+
+        try:
+            result = fetch()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(flight_key, None)
+
+    def _await_in_flight(self, flight_key):
+        """Blocks until a running fetch for `flight_key` (if any) finishes; its errors are ignored."""
+        with self._inflight_lock:
+            future = self._inflight.get(flight_key)
+        if future is not None:
+            future.exception()
+
+    @staticmethod
+    def _accession_key(accession_number: str) -> str:
+        """Canonical cache key: one entry per filing, whatever CIK or dash format was used."""
+        return format_for_url(accession_number)
+
+    def _accession_key_from_url(self, url: str) -> str:
+        """Derives the canonical accession key from an SGML .txt URL, or None for other URLs."""
+        filename = url.rstrip("/").rsplit("/", 1)[-1]
+        if not filename.endswith(".txt"):
+            return None
+        return self._accession_key(filename[:-len(".txt")])
 
     def has_in_memory_cache(self, url: str) -> bool:
-        """Check if a URL is in the memory cache."""
-        return url in self.url_cache
+        """Check if a URL (or the same accession under any CIK) is in the memory cache."""
+        if self.memory_cache.has_url(url):
+            return True
+        return self._accession_key_from_url(url) in self.memory_cache
 
     def get_from_memory_cache(self, url: str) -> str:
-        """Get content from memory cache by URL."""
-        return self.url_cache.get(url, "")
+        """Get content from memory cache by URL, falling back to the accession key."""
+        doc = self.memory_cache.get_by_url(url) or self.memory_cache.peek(self._accession_key_from_url(url))
+        return doc.content if doc else ""
 
-    def is_stale(self, path: str, max_age_seconds: int) -> bool:
-        try:
-            modified = os.path.getmtime(path)
-            return (time.time() - modified) > max_age_seconds
-        except OSError:
-            return True  # Treat unreadable or missing file as stale
+    def get_raw_from_memory_cache(self, url: str) -> bytes:
+        """Like `get_from_memory_cache`, but returns the submission bytes as held, without decoding."""
+        doc = self.memory_cache.get_by_url(url) or self.memory_cache.peek(self._accession_key_from_url(url))
+        return doc.raw if doc else b""
 
     def is_cached(self, cik: str, accession_number: str, year: str) -> bool:
-        path = build_cache_path(cik, accession_number, year)
-        return path is not None and os.path.exists(path)
+        return self.disk_cache.contains(self._accession_key(accession_number))
 
-    def read_from_cache(self, cik: str, accession_number: str, year: str) -> str:
+    def read_from_cache(self, cik: str, accession_number: str, year: str, as_bytes: bool = False) -> Union[str, bytes, None]:
         """
-        Attempts to read an SGML file from the local cache directory.
+        Reads an SGML submission from the local disk cache, decompressing and verifying it.
 
         Returns:
-            str or None: The file content if found, else None.
+            str (bytes with `as_bytes=True`) or None: The submission if cached and intact, else None.
 
         Notes:
             This method is only used if `use_cache` is True.
         """
-        path = build_cache_path(cik, accession_number, year)
-        if not path:
-            raise ValueError(f"[read_from_cache] Missing cache path for {accession_number}")
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read()
+        data = self.disk_cache.get(self._accession_key(accession_number))
+        if data is None or as_bytes:
+            return data
+        return data.decode("utf-8", errors="replace")
 
-    def write_to_cache(self, cik: str, accession_number: str, content: str, year: str):
+    def write_to_cache(self, cik: str, accession_number: str, content: Union[str, bytes], year: str):
         """
-        Writes the SGML content to the local cache directory.
+        Writes the SGML content to the local disk cache (compressed, keyed by accession).
 
         Parameters:
-            content (str): The raw SGML text to save.
+            content (str or bytes): The raw SGML to save; bytes are stored as received.
 
         Notes:
             This is gated by `use_cache` or overridden via `write_cache=True`.
         """
-        path = build_cache_path(cik, accession_number, year)
+        data = content if isinstance(content, bytes) else content.encode("utf-8")
+        path = self.disk_cache.put(self._accession_key(accession_number), data, cik=cik, year=year)
         log_info(f"[WRITE] Caching SGML: {accession_number} → {path}")
 
-        if not path:
-            log_warn(f"[write_to_cache] No cache path for {accession_number}, skipping write.")
-            return
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
-
     def download_sgml(self, cik: str, accession_number: str, year: str = None, *, write_cache: bool = None) -> SgmlTextDocument:
         """
         Downloads the SGML submission text file for a given filing.
@@ -101,7 +201,7 @@ class SgmlDownloader(SECDownloader):
             accession_number (str): Accession number of the filing.
             year (str): Four-digit year of the filing.
             write_cache (bool, optional): 
-                If True, writes the downloaded SGML to disk (cache_sgml/).
+                If True, writes the downloaded SGML to the compressed disk cache (cache_sgml/).
                 If False, disables disk write even if self.use_cache is True.
                 If None (default), uses the value of self.use_cache to decide.
 
@@ -118,45 +218,356 @@ class SgmlDownloader(SECDownloader):
             year_short = accession_number.split('-')[1] if '-' in accession_number else accession_number[2:4]
             year = f"20{year_short}"  # Assuming all years are 2000+
             
-        key = (cik, accession_number, year)
+        key = self._accession_key(accession_number)
         # Let construct_sgml_txt_url handle dash formatting consistently
         url = construct_sgml_txt_url(cik, accession_number)
         
-        # Update url_cache with this URL for future lookups
-        if key in self.memory_cache:
-            # Also update the URL cache for direct lookups
-            content = self.memory_cache[key].content
-            self.url_cache[url] = content
+        # The CIK in the URL does not matter: any earlier (or in-flight) fetch of this accession is reused
+        cached = self.memory_cache.get(key)
+        if cached is not None:
             log_info(f"🔁 Reusing in-memory SGML for {accession_number}")
-            return self.memory_cache[key]
-
-        log_info(f"[DEBUG] Checking SGML cache for: {accession_number}, year={year}")
-        path = build_cache_path(cik, accession_number, year)
-        log_info(f"[DEBUG] Cache path resolved: {path}")
+        else:
+            cached = self._single_flight(
+                key, lambda: self._fetch_sgml(cik, accession_number, year, key, url, write_cache)
+            )
+        # Register this URL as an alias for direct lookups
+        self.memory_cache.alias(url, key)
+        if cached.cik == cik:
+            return cached
+        return cached.for_cik(cik, accession_number)
 
-        if not path:
-            log_warn(f"[download_sgml] Cannot resolve cache path for {accession_number}")
-            return SgmlTextDocument(cik=cik, accession_number=accession_number, content="")
+    def _fetch_sgml(self, cik: str, accession_number: str, year: str, key: str, url: str,
+                    write_cache: bool) -> SgmlTextDocument:
+        """Disk cache or network fetch behind download_sgml; runs once per accession at a time."""
+        # A fetch that finished between the caller's cache check and this one already stored it
+        cached = self.memory_cache.peek(key)
+        if cached is not None:
+            return cached
 
+        # Archive files never change after acceptance, so a disk entry is always current
         if self.use_cache and self.is_cached(cik, accession_number, year):
-            if not self.is_stale(path, max_age_seconds=86400):
+            data = self.read_from_cache(cik, accession_number, year, True)
+            if data is not None:
                 log_info(f"⚡ Cache hit for SGML: {accession_number}")
-                content = self.read_from_cache(cik, accession_number, year)
-                doc = SgmlTextDocument(cik=cik, accession_number=accession_number, content=content)
-                self.memory_cache[key] = doc
-                self.url_cache[url] = content  # Also update the URL cache
+                if isinstance(data, bytes):
+                    doc = SgmlTextDocument(cik=cik, accession_number=accession_number, raw=data)
+                else:
+                    doc = SgmlTextDocument(cik=cik, accession_number=accession_number, content=data)
+                self.memory_cache.put(key, doc, url=url)
                 return doc
-            else:
-                log_info(f"♻️ Cache stale for SGML: {accession_number} — re-downloading.")
 
-        # URL already constructed at line 123, reusing the same approach
-        log_info(f"📥 Downloading SGML from SEC for {accession_number}")
-        content = self.download_html(url)
+        # Served only if the stored file still matches the size and SHA-256 it was indexed with
+        stored = read_stored_sgml(accession_number)
+        if stored is not None:
+            stored_path, raw = stored
+            log_info(f"📂 Using stored SGML for {accession_number}: {stored_path}")
+            doc = SgmlTextDocument(cik=cik, accession_number=accession_number, raw=raw)
+            self.memory_cache.put(key, doc, url=url)
+            return doc
+
+        raw = self.shared_cache.get(key) if self.shared_cache is not None else None
+        if raw is not None:
+            log_info(f"🌐 Shared cache hit for SGML: {accession_number}")
+        else:
+            # Kept as bytes: no charset detection, and disk writes / indexing never re-encode it
+            log_info(f"📥 Downloading SGML from SEC for {accession_number}")
+            raw = self.download_bytes(url)
+            if self.shared_cache is not None:
+                self.shared_cache.put(key, raw)
 
         if self.use_cache and write_cache:
-            self.write_to_cache(cik, accession_number, content, year)
+            self.write_to_cache(cik, accession_number, raw, year)
+
+        doc = SgmlTextDocument(cik=cik, accession_number=accession_number, raw=raw)
+        self.memory_cache.put(key, doc, url=url)
+        return doc
+
+    def download_sgml_header(self, cik: str, accession_number: str, year: str = None, max_bytes: int = 65536) -> str:
+        """
+        Returns the SEC-HEADER portion of a submission without downloading the whole `.txt`.
+
+        Uses a Range request that stops reading once `</SEC-HEADER>` is seen. If the
+        header is not found within `max_bytes`, falls back to a full `download_sgml`.
+        A submission already held in the memory cache is returned as-is (it contains the header).
+
+        Parameters:
+            cik (str): CIK used to build the URL.
+            accession_number (str): Accession number of the filing.
+            year (str, optional): Passed to `download_sgml` on fallback.
+            max_bytes (int): Upper bound on bytes read before falling back.
+
+        Returns:
+            str: The SEC-HEADER text (the full text only for text-built or header-less submissions).
+        """
+        key = self._accession_key(accession_number)
+        if key in self.memory_cache:
+            return self._header_text(self.memory_cache.peek(key))
+        if key in self.header_cache:
+            return self.header_cache[key]
+
+        # A full download already under way makes the Range request redundant
+        self._await_in_flight(key)
+        if key in self.memory_cache:
+            return self._header_text(self.memory_cache.peek(key))
+        return self._single_flight(
+            ("header", key), lambda: self._fetch_sgml_header(cik, accession_number, year, key, max_bytes)
+        )
+
+    def _fetch_sgml_header(self, cik: str, accession_number: str, year: str, key: str, max_bytes: int) -> str:
+        if key in self.header_cache:
+            return self.header_cache[key]
+
+        if self.shared_cache is not None:
+            raw = self.shared_cache.get(key)
+            if raw is not None:
+                # Cheaper than a Range request to the SEC; keep the whole submission for later stages
+                doc = SgmlTextDocument(cik=cik, accession_number=accession_number, raw=raw)
+                self.memory_cache.put(key, doc)
+                return self._header_text(doc)
+
+        stored_path = find_stored_sgml(accession_number)
+        if stored_path:
+            with open(stored_path, "rb") as f:
+                prefix = f.read(max_bytes)
+            end = prefix.find(SEC_HEADER_END)
+            if end != -1:
+                header = prefix[:end + len(SEC_HEADER_END)].decode("utf-8", errors="replace")
+                self.header_cache[key] = header
+                return header
+
+        url = construct_sgml_txt_url(cik, accession_number)
+
+        log_info(f"📥 Fetching SEC-HEADER only for {accession_number}")
+        prefix = self.download_prefix(url, SEC_HEADER_END, max_bytes=max_bytes)
+        if prefix is None:
+            log_info(f"[download_sgml_header] No SEC-HEADER end within {max_bytes} bytes for {accession_number}; fetching full submission")
+            return self._header_text(self.download_sgml(cik, accession_number, year))
+
+        header = prefix.decode("utf-8", errors="replace")
+        self.header_cache[key] = header
+        return header
+
+    @staticmethod
+    def _header_text(doc: SgmlTextDocument) -> str:
+        """SEC-HEADER of a held submission; byte-backed ones decode only the header."""
+        data = doc.data
+        if isinstance(data, bytes):
+            end = data.find(SEC_HEADER_END)
+            if end != -1:
+                return data[:end + len(SEC_HEADER_END)].decode("utf-8", errors="replace")
+        return doc.content
+
+    def download_sgml_to_file(self, cik: str, accession_number: str, path: str) -> SgmlFileDocument:
+        """
+        Streams the SGML submission straight to `path` (normally the raw SGML path
+        from build_raw_filepath_by_type) and returns a file-backed handle.
+
+        Unlike `download_sgml`, the content is never held in memory and is not added
+        to the memory cache, so peak memory stays flat regardless of filing size.
+        If the accession is already in memory it is written out instead of re-fetched.
+        Every branch writes `<path>.part`, fsyncs it and renames it into place, and the file is
+        registered with its size and SHA-256 in the raw artifact index (utils/artifact_locator.py).
+        An existing file at `path` is reused only while it matches what the index recorded.
+
+        Returns:
+            SgmlFileDocument: Handle to the stored submission.
+        """
+        if os.path.exists(path):
+            if is_recorded_artifact(accession_number, path):
+                log_info(f"⚡ SGML already on disk for {accession_number}: {path}")
+                return SgmlFileDocument(cik=cik, accession_number=accession_number, path=path,
+                                        size_bytes=os.path.getsize(path))
+            log_warn(f"[download_sgml_to_file] Unverified SGML at {path} for {accession_number}; fetching it again")
+
+        key = self._accession_key(accession_number)
+        self._await_in_flight(key)
+        cached = self.memory_cache.peek(key)
+        if cached is not None:
+            size_bytes, sha256 = write_file_atomic(path, cached.raw)
+            register_raw_artifact(accession_number, "sgml", path, cik=cik, size_bytes=size_bytes, sha256=sha256)
+            return SgmlFileDocument(cik=cik, accession_number=accession_number, path=path,
+                                    size_bytes=size_bytes, sha256=sha256)
+
+        part_path = f"{path}.part"
+        if self.shared_cache is not None and self.shared_cache.get_to_file(key, part_path):
+            log_info(f"🌐 Shared cache hit for SGML: {accession_number} → {path}")
+            size_bytes, sha256 = commit_part_file(part_path, path)
+            register_raw_artifact(accession_number, "sgml", path, cik=cik, size_bytes=size_bytes, sha256=sha256)
+            return SgmlFileDocument(cik=cik, accession_number=accession_number, path=path,
+                                    size_bytes=size_bytes, sha256=sha256)
+
+        url = construct_sgml_txt_url(cik, accession_number)
+        log_info(f"📥 Streaming SGML from SEC to disk for {accession_number}")
+        size_bytes, sha256 = self.download_to_file(url, path)
+        register_raw_artifact(accession_number, "sgml", path, cik=cik, size_bytes=size_bytes, sha256=sha256)
+        if self.shared_cache is not None:
+            self.shared_cache.put_file(key, path)
+        log_info(f"📄 Streamed {size_bytes // 1024} KB for {accession_number} → {path}")
+        return SgmlFileDocument(cik=cik, accession_number=accession_number, path=path,
+                                size_bytes=size_bytes, sha256=sha256)
+
+    def download_many(
+        self,
+        accessions: Iterable[Tuple],
+        *,
+        write_cache: bool = None,
+        max_workers: int = None
+    ) -> Iterator[Tuple[str, Optional[SgmlTextDocument], Optional[Exception]]]:
+        """
+        Downloads a batch of SGML submissions concurrently.
+
+        Up to `max_workers` requests are kept in flight; every request still goes
+        through `_throttle`, so the batch as a whole respects the downloader's
+        request delay. Each result is stored in the memory (and optionally disk)
+        cache exactly as `download_sgml` would, so later per-accession calls are
+        served from memory.
+
+        Parameters:
+            accessions: Iterable of (cik, accession_number) or (cik, accession_number, year) tuples.
+            write_cache (bool, optional): Passed through to `download_sgml`.
+            max_workers (int, optional): Overrides `self.max_workers` for this batch.
+
+        Yields:
+            (accession_number, SgmlTextDocument or None, Exception or None) in completion order.
+        """
+        jobs = self._unique_jobs(accessions)
+        if not jobs:
+            return
+
+        workers = min(max_workers or self.max_workers, len(jobs))
+        log_info(f"📥 Downloading {len(jobs)} SGML submissions with {workers} worker(s)")
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.download_sgml, cik, accession_number, year, write_cache=write_cache): accession_number
+                for cik, accession_number, year in jobs
+            }
+            for future in as_completed(futures):
+                accession_number = futures[future]
+                try:
+                    yield accession_number, future.result(), None
+                except Exception as e:
+                    log_warn(f"[download_many] Failed to download {accession_number}: {e}")
+                    yield accession_number, None, e
+
+    def _unique_jobs(self, accessions: Iterable[Tuple]) -> List[Tuple[str, str, Optional[str]]]:
+        """(cik, accession_number, year) per distinct accession, in input order."""
+        jobs = []
+        seen = set()
+        for item in accessions:
+            cik, accession_number = item[0], item[1]
+            year = item[2] if len(item) > 2 else None
+            key = self._accession_key(accession_number)
+            if key in seen:
+                continue
+            seen.add(key)
+            jobs.append((cik, accession_number, year))
+        return jobs
+
+    def prefetch_async(self, cik: str, accession_number: str, year: str = None, *, write_cache: bool = None) -> Future:
+        """
+        Starts `download_sgml` for one accession on a background worker and returns immediately.
+
+        The result lands in the memory cache, so the caller's later `download_sgml`
+        for the same accession is a memory hit. Callers should wait on the returned
+        future before using the accession; a failed prefetch carries its exception
+        on the future and is retried by the regular call.
+        """
+        if self._background_executor is None:
+            self._background_executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="sgml-prefetch"
+            )
+        return self._background_executor.submit(
+            self.download_sgml, cik, accession_number, year, write_cache=write_cache
+        )
+
+    def read_ahead(self, items: Iterable, target: Callable[[Any], Optional[Tuple]], *,
+                   window: int = None, write_cache: bool = None) -> Iterator:
+        """
+        Yields `items` in order while the submissions of the next `window` items download
+        in the background (`prefetch_async`), so a per-item loop finds each one in the
+        memory cache. Only the next `window` submissions are fetched ahead of the loop, so
+        a batch larger than the memory budget is not evicted before it is used, provided the
+        budget holds `window` + 2 submissions (the window, the current and the previous one).
+
+        `target(item)` returns the (cik, accession_number, year) to fetch for an item, or
+        None for items the loop handles without the memory cache (e.g. streamed to disk).
+        `window` defaults to `sec_downloader.prefetch_window`; 0 disables read-ahead.
+        A failed read-ahead is logged and left for the loop's own `download_sgml` to retry.
+        """
+        items = list(items)
+        window = DEFAULT_PREFETCH_WINDOW if window is None else max(0, window)
+        in_flight: Dict[int, Future] = {}
+        try:
+            for position, item in enumerate(items):
+                for ahead in range(position + 1, min(len(items), position + 1 + window)):
+                    job = target(items[ahead]) if ahead not in in_flight else None
+                    if job:
+                        cik, accession_number = job[0], job[1]
+                        year = job[2] if len(job) > 2 else None
+                        in_flight[ahead] = self.prefetch_async(cik, accession_number, year, write_cache=write_cache)
+                future = in_flight.pop(position, None)
+                if future is not None and future.exception() is not None:
+                    log_warn(f"[PREFETCH] Read-ahead failed, falling back to direct download: {future.exception()}")
+                yield item
+        finally:
+            for future in in_flight.values():
+                future.cancel()
+
+    def shutdown_prefetch(self):
+        """Stops the background prefetch workers, abandoning downloads that have not started."""
+        if self._background_executor is not None:
+            self._background_executor.shutdown(wait=True, cancel_futures=True)
+            self._background_executor = None
+
+    def prefetch(self, accessions: Iterable[Tuple], *, write_cache: bool = None) -> int:
+        """
+        Warms the caches for a batch of accessions, up to `max_workers` at a time.
+
+        Stops queuing once the bytes fetched, plus an estimate for the requests still in
+        flight, would exceed `memory_cache.max_bytes`: fetching more would evict the
+        batch's own entries before the caller reads them, so each would be downloaded
+        twice. The rest of the batch is left to the caller's `download_sgml` calls (or
+        use `read_ahead`, which never holds more than a window). Failures are logged and
+        left for those calls to surface.
+
+        Returns:
+            int: Number of submissions successfully fetched.
+        """
+        jobs = self._unique_jobs(accessions)
+        if not jobs:
+            return 0
+        budget = self.memory_cache.max_bytes
+        workers = min(self.max_workers, len(jobs))
+        fetched = fetched_bytes = largest = 0
+        queued = 0
+        running: Dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                # The largest submission so far stands in for each one still in flight
+                while (queued < len(jobs) and len(running) < workers
+                       and (not budget or fetched_bytes + (len(running) + 1) * largest <= budget)):
+                    cik, accession_number, year = jobs[queued]
+                    running[executor.submit(self.download_sgml, cik, accession_number, year,
+                                            write_cache=write_cache)] = accession_number
+                    queued += 1
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    accession_number = running.pop(future)
+                    try:
+                        sgml_doc = future.result()
+                    except Exception as e:
+                        log_warn(f"[prefetch] Failed to download {accession_number}: {e}")
+                        continue
+                    size = sgml_doc.footprint()
+                    fetched += 1
+                    fetched_bytes += size
+                    largest = max(largest, size)
 
-        doc = SgmlTextDocument(cik=cik, accession_number=accession_number, content=content)
-        self.memory_cache[key] = doc
-        self.url_cache[url] = content  # Also update the URL cache
-        return doc
\ No newline at end of file
+        if queued < len(jobs):
+            log_info(f"📥 Prefetched {queued} of {len(jobs)} SGML submissions; the rest exceed the "
+                     f"{budget / (1024 * 1024):.1f} MB memory cache and are fetched on demand")
+        return fetched
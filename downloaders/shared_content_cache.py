@@ -0,0 +1,376 @@
+# downloaders/shared_content_cache.py
+
+'''
+# Role: Cluster-wide cache of SEC submissions shared by every ingestion host
+- SgmlDownloader consults it before going to the SEC and fills it after a download,
+  so each submission is fetched from the SEC once per cluster instead of once per host.
+- Entries are keyed by canonical accession (no dashes) and never change once written.
+  Each entry is stored with the SHA-256 of its body (a `.sha256` sidecar; the
+  X-Content-SHA256 header over HTTP). Bodies are checked against it, and against their
+  declared length, on every PUT and GET, so a truncated or corrupted entry is never served.
+- Backends: a shared directory (e.g. on NFS) or a small HTTP service (see
+  scripts/shared_cache/run_shared_cache_server.py), which itself stores to a directory.
+  The service binds to 127.0.0.1 unless given another address.
+- The cache is an optimization only: backend errors are logged and treated as misses.
+'''
+
+import hashlib
+import os
+import re
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import BinaryIO, Optional, Tuple
+
+import requests
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+from config.config_loader import ConfigLoader
+from utils.report_logger import log_info, log_warn
+
+# Load config once at module import
+SHARED_CACHE_CONFIG = ConfigLoader.load_config().get("sec_downloader", {}).get("shared_cache", {}) or {}
+
+_KEY_RE = re.compile(r"^[0-9A-Za-z]+$")
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+DIGEST_HEADER = "X-Content-SHA256"
+CHUNK_SIZE = 1024 * 1024
+
+
+class SharedContentCache(ABC):
+    """Immutable byte store keyed by canonical accession."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the stored submission, or None on a miss."""
+        pass
+
+    @abstractmethod
+    def put(self, key: str, data: bytes):
+        pass
+
+    def get_to_file(self, key: str, path: str) -> bool:
+        """Writes the stored submission to `path`. Returns False on a miss."""
+        data = self.get(key)
+        if data is None:
+            return False
+        _write_atomic(path, data)
+        return True
+
+    def put_file(self, key: str, path: str):
+        with open(path, "rb") as f:
+            self.put(key, f.read())
+
+
+class FilesystemSharedCache(SharedContentCache):
+    """
+    Directory shared between hosts (NFS/SMB mount). Writes are atomic renames, so readers never
+    see partial files; each entry's SHA-256 sidecar is written after its body and checked on read.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, key: str) -> str:
+        if not _KEY_RE.match(key):
+            raise ValueError(f"[ERROR] Invalid shared cache key: '{key}'")
+        # Two-level fan-out keeps directories small on network filesystems
+        return os.path.join(self.root, key[-2:], f"{key}.txt")
+
+    def digest_for(self, key: str) -> Optional[str]:
+        """Recorded SHA-256 of an entry, or None when the entry is missing or incomplete."""
+        try:
+            with open(f"{self.path_for(key)}.sha256", "r", encoding="ascii") as f:
+                digest = f.read().strip()
+        except OSError:
+            return None
+        return digest if _SHA256_RE.match(digest) else None
+
+    def get(self, key: str) -> Optional[bytes]:
+        digest = self.digest_for(key)
+        if digest is None:
+            return None
+        try:
+            with open(self.path_for(key), "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            log_warn(f"[SHARED-CACHE] Read failed for {key}: {e}")
+            return None
+        if hashlib.sha256(data).hexdigest() != digest:
+            log_warn(f"[SHARED-CACHE] Entry {key} does not match its SHA-256; ignoring it")
+            return None
+        return data
+
+    def put(self, key: str, data: bytes):
+        try:
+            _write_atomic(self.path_for(key), data)
+            _write_atomic(f"{self.path_for(key)}.sha256", hashlib.sha256(data).hexdigest().encode("ascii"))
+        except OSError as e:
+            log_warn(f"[SHARED-CACHE] Write failed for {key}: {e}")
+
+    def get_to_file(self, key: str, path: str) -> bool:
+        digest = self.digest_for(key)
+        if digest is None:
+            return False
+        try:
+            with open(self.path_for(key), "rb") as source:
+                return _stream_verified(source, path, digest, key=key)
+        except FileNotFoundError:
+            return False
+        except OSError as e:
+            log_warn(f"[SHARED-CACHE] Copy failed for {key}: {e}")
+            return False
+
+    def put_file(self, key: str, path: str):
+        try:
+            _, digest = _file_digest(path)
+            _copy_atomic(path, self.path_for(key))
+            _write_atomic(f"{self.path_for(key)}.sha256", digest.encode("ascii"))
+        except OSError as e:
+            log_warn(f"[SHARED-CACHE] Write failed for {key}: {e}")
+
+    def put_stream(self, key: str, stream: BinaryIO, length: int, digest: str) -> bool:
+        """
+        Stores exactly `length` bytes read from `stream`, only if they hash to `digest`.
+        Returns False (storing nothing) for a short or mismatching body.
+        """
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        hasher = hashlib.sha256()
+        remaining = length
+        try:
+            with open(tmp_path, "wb") as f:
+                while remaining > 0:
+                    chunk = stream.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    remaining -= len(chunk)
+            if remaining or hasher.hexdigest() != digest:
+                os.remove(tmp_path)
+                return False
+            os.replace(tmp_path, path)
+            _write_atomic(f"{path}.sha256", digest.encode("ascii"))
+            return True
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class HttpSharedCache(SharedContentCache):
+    """
+    Client for the shared cache HTTP service: GET/PUT {base_url}/{key}, with the body's
+    SHA-256 in the X-Content-SHA256 header both ways. File transfers are streamed.
+    """
+
+    def __init__(self, base_url: str, timeout: float = 5.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            response = self.session.get(f"{self.base_url}/{key}", timeout=self.timeout)
+        except requests.RequestException as e:
+            log_warn(f"[SHARED-CACHE] GET failed for {key}: {e}")
+            return None
+        if response.status_code != 200:
+            if response.status_code != 404:
+                log_warn(f"[SHARED-CACHE] GET {key} returned {response.status_code}")
+            return None
+        data = response.content
+        digest, length = _declared(response.headers)
+        if digest is None or len(data) != length or hashlib.sha256(data).hexdigest() != digest:
+            log_warn(f"[SHARED-CACHE] GET {key} returned a short or corrupted body; ignoring it")
+            return None
+        return data
+
+    def put(self, key: str, data: bytes):
+        headers = {DIGEST_HEADER: hashlib.sha256(data).hexdigest()}
+        self._put(key, data, headers)
+
+    def get_to_file(self, key: str, path: str) -> bool:
+        try:
+            with self.session.get(f"{self.base_url}/{key}", timeout=self.timeout, stream=True) as response:
+                if response.status_code != 200:
+                    if response.status_code != 404:
+                        log_warn(f"[SHARED-CACHE] GET {key} returned {response.status_code}")
+                    return False
+                digest, length = _declared(response.headers)
+                if digest is None:
+                    log_warn(f"[SHARED-CACHE] GET {key} carried no {DIGEST_HEADER}; ignoring it")
+                    return False
+                return _stream_verified(response.raw, path, digest, length=length, key=key)
+        except (requests.RequestException, Urllib3HTTPError, OSError) as e:
+            log_warn(f"[SHARED-CACHE] GET failed for {key}: {e}")
+            return False
+
+    def put_file(self, key: str, path: str):
+        try:
+            size, digest = _file_digest(path)
+            with open(path, "rb") as f:
+                self._put(key, f, {DIGEST_HEADER: digest, "Content-Length": str(size)})
+        except OSError as e:
+            log_warn(f"[SHARED-CACHE] PUT failed for {key}: {e}")
+
+    def _put(self, key: str, body, headers: dict):
+        try:
+            response = self.session.put(f"{self.base_url}/{key}", data=body, headers=headers, timeout=self.timeout)
+            if response.status_code not in (200, 201, 204):
+                log_warn(f"[SHARED-CACHE] PUT {key} returned {response.status_code}")
+        except requests.RequestException as e:
+            log_warn(f"[SHARED-CACHE] PUT failed for {key}: {e}")
+
+
+def make_shared_cache_server(root: str, host: str = "127.0.0.1", port: int = 8770) -> ThreadingHTTPServer:
+    """
+    Builds the HTTP service fronting a FilesystemSharedCache at `root` (call serve_forever()).
+    Listens on loopback only unless `host` says otherwise. A PUT is stored only if its body is
+    as long as its Content-Length and hashes to its X-Content-SHA256; otherwise it gets a 400.
+    """
+    store = FilesystemSharedCache(root)
+
+    class Handler(BaseHTTPRequestHandler):
+        def _key(self) -> Optional[str]:
+            key = self.path.strip("/")
+            if not _KEY_RE.match(key):
+                self.send_error(400, "Invalid key")
+                return None
+            return key
+
+        def do_GET(self):
+            key = self._key()
+            if key is None:
+                return
+            digest = store.digest_for(key)
+            try:
+                source = open(store.path_for(key), "rb") if digest is not None else None
+            except FileNotFoundError:
+                source = None
+            if source is None:
+                self.send_error(404)
+                return
+            with source:
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(os.fstat(source.fileno()).st_size))
+                self.send_header(DIGEST_HEADER, digest)
+                self.end_headers()
+                shutil.copyfileobj(source, self.wfile, CHUNK_SIZE)
+
+        def do_PUT(self):
+            key = self._key()
+            if key is None:
+                return
+            digest = (self.headers.get(DIGEST_HEADER) or "").lower()
+            length = self.headers.get("Content-Length")
+            if not _SHA256_RE.match(digest) or length is None or not length.isdigit():
+                self.send_error(400, f"Content-Length and {DIGEST_HEADER} are required")
+                return
+            if not store.put_stream(key, self.rfile, int(length), digest):
+                self.send_error(400, "Body is short or does not match its SHA-256")
+                return
+            self.send_response(201)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def _write_atomic(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _copy_atomic(source: str, path: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    shutil.copyfile(source, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _stream_verified(source: BinaryIO, path: str, digest: str, length: int = None, key: str = "") -> bool:
+    """
+    Copies `source` to `path` in chunks, renaming it into place only if the body hashes to
+    `digest` (and is `length` bytes, when given). Returns False, leaving nothing at `path`, otherwise.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                f.write(chunk)
+                hasher.update(chunk)
+                size += len(chunk)
+        if (length is not None and size != length) or hasher.hexdigest() != digest:
+            log_warn(f"[SHARED-CACHE] Entry {key} is short or does not match its SHA-256; ignoring it")
+            os.remove(tmp_path)
+            return False
+        os.replace(tmp_path, path)
+        return True
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _file_digest(path: str) -> Tuple[int, str]:
+    hasher = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+            size += len(chunk)
+    return size, hasher.hexdigest()
+
+
+def _declared(headers) -> Tuple[Optional[str], Optional[int]]:
+    """(SHA-256, Content-Length) a response declares; either is None when missing or malformed."""
+    digest = (headers.get(DIGEST_HEADER) or "").lower()
+    length = headers.get("Content-Length")
+    return (digest if _SHA256_RE.match(digest) else None), (int(length) if length and length.isdigit() else None)
+
+
+# Module-level instance so every downloader in the process shares one client
+_shared_content_cache = None
+_shared_content_cache_lock = threading.Lock()
+
+
+def get_shared_content_cache() -> Optional[SharedContentCache]:
+    """
+    Returns the process-wide cache configured under `sec_downloader.shared_cache`
+    in app_config.yaml ("filesystem" with `path`, or "http" with `url`), or None when disabled.
+    """
+    global _shared_content_cache
+    backend = SHARED_CACHE_CONFIG.get("backend")
+    if not backend:
+        return None
+
+    with _shared_content_cache_lock:
+        if _shared_content_cache is None:
+            if backend == "filesystem":
+                _shared_content_cache = FilesystemSharedCache(SHARED_CACHE_CONFIG["path"])
+                log_info(f"[SHARED-CACHE] Using shared directory {SHARED_CACHE_CONFIG['path']}")
+            elif backend == "http":
+                _shared_content_cache = HttpSharedCache(SHARED_CACHE_CONFIG["url"],
+                                                        timeout=SHARED_CACHE_CONFIG.get("timeout_seconds", 5.0))
+                log_info(f"[SHARED-CACHE] Using cache service {SHARED_CACHE_CONFIG['url']}")
+            else:
+                raise ValueError(f"[ERROR] Unsupported shared_cache backend: '{backend}' — expected 'filesystem' or 'http'")
+        return _shared_content_cache
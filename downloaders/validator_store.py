@@ -0,0 +1,156 @@
+# downloaders/validator_store.py
+
+'''
+# Role: Conditional GET validators for SEC resources we re-poll
+- crawler.idx and submissions JSON are fetched many times a day but change far less often.
+- Stores the ETag / Last-Modified returned for each URL so the next request can be conditional.
+- A 304 Not Modified lets the caller skip both the download and the re-parse.
+'''
+
+import os
+import sqlite3
+import tempfile
+import threading
+from typing import Iterable, Optional
+
+from config.config_loader import ConfigLoader
+from utils.report_logger import log_info, log_warn
+
+DEFAULT_STATE_PATH = os.path.join(tempfile.gettempdir(), "edgar_sec_validators.sqlite3")
+
+# Load config once at module import
+CONDITIONAL_GET_CONFIG = ConfigLoader.load_config().get("sec_downloader", {}).get("conditional_get", {}) or {}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS validators (
+    key           TEXT PRIMARY KEY,  -- URL, or URL#forms=... for a filtered collect
+    etag          TEXT,
+    last_modified TEXT
+);
+"""
+
+
+def validator_key(url: str, forms: Optional[Iterable[str]] = None) -> str:
+    """
+    Store key for `url` as collected with a form filter. The same resource yields different
+    records per filter, so a 304 for one filter says nothing about another.
+    """
+    return f"{url}#forms={','.join(sorted(forms))}" if forms else url
+
+
+class ValidatorStore:
+    """
+    Maps a key (normally the URL) to the validators last seen for it.
+
+    With `state_path` set, entries are persisted in SQLite so later runs can send
+    conditional requests too; each record is a single-row upsert, and processes
+    sharing the file see each other's entries. Validators should only be recorded
+    once the caller has finished processing the body; otherwise a failed run would
+    be answered with 304 next time and its data silently skipped.
+    """
+
+    def __init__(self, state_path: Optional[str] = None):
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._validators = {}  # used when there is no state file
+        self._conn = self._connect() if state_path else None
+
+    def conditional_headers(self, key: str) -> dict:
+        """Returns If-None-Match / If-Modified-Since headers for `key` (empty if unknown)."""
+        entry = self._get(key)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(self, key: str, response_headers) -> bool:
+        """
+        Stores the ETag / Last-Modified from a 200 response.
+        Returns False (and stores nothing) if the server sent neither.
+        """
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return False
+        with self._lock:
+            if self._conn is None:
+                self._validators[key] = {"etag": etag, "last_modified": last_modified}
+                return True
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO validators (key, etag, last_modified) VALUES (?, ?, ?)",
+                    (key, etag, last_modified),
+                )
+            except sqlite3.Error as e:
+                log_warn(f"[CONDITIONAL] Failed to record validators for {key}: {e}")
+                return False
+        return True
+
+    def forget(self, key: str):
+        with self._lock:
+            if self._conn is None:
+                self._validators.pop(key, None)
+            else:
+                self._conn.execute("DELETE FROM validators WHERE key = ?", (key,))
+
+    def __contains__(self, key: str) -> bool:
+        return self._get(key) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._conn is None:
+                return len(self._validators)
+            return self._conn.execute("SELECT COUNT(*) FROM validators").fetchone()[0]
+
+    def _get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            if self._conn is None:
+                return self._validators.get(key)
+            try:
+                row = self._conn.execute(
+                    "SELECT etag, last_modified FROM validators WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                log_warn(f"[CONDITIONAL] Validator lookup failed for {key}: {e}")
+                return None
+        return dict(row) if row is not None else None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+            conn = sqlite3.connect(self.state_path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            return conn
+        except (OSError, sqlite3.Error) as e:
+            # Unconditional requests are always correct, so an unusable file only costs bandwidth
+            log_warn(f"[CONDITIONAL] Ignoring unusable validator store {self.state_path}: {e}")
+            return None
+
+
+# Module-level instance so collectors in the process share one store
+_shared_validator_store = None
+_shared_validator_store_lock = threading.Lock()
+
+
+def get_shared_validator_store() -> Optional[ValidatorStore]:
+    """
+    Returns the process-wide ValidatorStore configured under
+    `sec_downloader.conditional_get` in app_config.yaml, or None when it is disabled.
+    """
+    global _shared_validator_store
+    config = CONDITIONAL_GET_CONFIG
+    if not config.get("enabled", False):
+        return None
+
+    with _shared_validator_store_lock:
+        if _shared_validator_store is None:
+            _shared_validator_store = ValidatorStore(state_path=config.get("state_path") or DEFAULT_STATE_PATH)
+            log_info(f"[CONDITIONAL] Using validator store {_shared_validator_store.state_path} "
+                     f"({len(_shared_validator_store)} entries)")
+        return _shared_validator_store
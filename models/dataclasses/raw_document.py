@@ -1,7 +1,7 @@
 # models/dataclasses/raw_document.py
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Union
 from datetime import date
 
 @dataclass
@@ -13,7 +13,7 @@ class RawDocument:
     filename: str
     source_url: str
     source_type: str              # usually same as document_type
-    content: str                  # field for raw file body
+    content: Union[str, bytes]    # field for raw file body (bytes are written as-is)
     filing_date: date             
     description: Optional[str] = None
     is_primary: bool = False
@@ -0,0 +1,34 @@
+# models/dataclasses/sgml_file_document.py
+
+'''
+Purpose: File-backed counterpart of SgmlTextDocument for very large submissions.
+The SGML body stays on disk; consumers open it and read lazily instead of holding it in memory.
+
+Use in:
+- Return type of SgmlDownloader.download_sgml_to_file()
+- Input to SgmlDocumentIndexer.index_documents_from_file()
+'''
+from dataclasses import dataclass
+from typing import IO, Optional
+
+@dataclass
+class SgmlFileDocument:
+    cik: str
+    accession_number: str
+    path: str
+    size_bytes: int
+    sha256: Optional[str] = None   # None when the file was already on disk and not re-hashed
+
+    def open(self) -> IO[str]:
+        """Opens the stored submission for streaming text reads."""
+        return open(self.path, "r", encoding="utf-8", errors="replace")
+
+    # Log/debug output
+    def __repr__(self):
+        return (
+            f"<SgmlFileDocument("
+            f"cik={self.cik}, "
+            f"accession={self.accession_number}, "
+            f"path={self.path}, "
+            f"size={self.size_bytes} bytes)>"
+        )
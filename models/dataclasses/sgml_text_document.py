@@ -6,15 +6,62 @@ Purpose: Carries the raw .txt content and basic metadata (CIK, accession) for do
 Use in:
 - Return type of SgmlDownloader.download_sgml()
 - Input to SgmlFilingParser.parse_to_documents()
+
+Downloads are held as the raw bytes the SEC sent (`raw`). `content` decodes them on first
+access only, so stages that work on bytes (indexing, disk writes) never pay for a full decode.
+A holder that budgets memory (SgmlMemoryCache) is told through `on_convert` when a document
+starts holding a second form, and re-reads `footprint()`.
 '''
-from dataclasses import dataclass
-from typing import Optional
+import sys
+from typing import Callable, Optional, Union
+
+_EMPTY_STR_SIZE = sys.getsizeof("")
+
 
-@dataclass
 class SgmlTextDocument:
-    cik: str
-    accession_number: str
-    content: str
+    def __init__(self, cik: str, accession_number: str, content: Optional[str] = None, raw: Optional[bytes] = None):
+        self.cik = cik
+        self.accession_number = accession_number
+        self._content = content if content is not None or raw is not None else ""
+        self._raw = raw
+        self.on_convert: Optional[Callable[["SgmlTextDocument"], None]] = None
+
+    @property
+    def content(self) -> str:
+        """Submission text; decoded from `raw` (UTF-8, undecodable bytes replaced) on first access."""
+        if self._content is None:
+            self._content = self._raw.decode("utf-8", errors="replace")
+            self._converted()
+        return self._content
+
+    @property
+    def raw(self) -> bytes:
+        """Submission bytes; encoded from `content` on first access for text-built documents."""
+        if self._raw is None:
+            self._raw = self._content.encode("utf-8")
+            self._converted()
+        return self._raw
+
+    def footprint(self) -> int:
+        """Approximate memory held, in bytes: the raw bytes plus the decoded text, when each is held."""
+        size = len(self._raw) if self._raw is not None else 0
+        if self._content is not None:
+            # 1, 2 or 4 bytes per character depending on the widest character
+            size += sys.getsizeof(self._content) - _EMPTY_STR_SIZE
+        return size
+
+    @property
+    def data(self) -> Union[str, bytes]:
+        """The submission in whichever form it already holds, without converting it."""
+        return self._raw if self._raw is not None else self._content
+
+    def _converted(self):
+        if self.on_convert is not None:
+            self.on_convert(self)
+
+    def for_cik(self, cik: str, accession_number: str) -> "SgmlTextDocument":
+        """Same submission addressed under another CIK; shares the underlying buffers."""
+        return SgmlTextDocument(cik=cik, accession_number=accession_number, content=self._content, raw=self._raw)
 
     # Log/debug output
     def __repr__(self):
@@ -22,5 +69,5 @@ class SgmlTextDocument:
             f"<SgmlTextDocument("
             f"cik={self.cik}, "
             f"accession={self.accession_number}, "
-            f"content_len={len(self.content)} chars)>"
+            f"content_len={len(self.data)} {'bytes' if self._raw is not None else 'chars'})>"
         )
@@ -0,0 +1,144 @@
+# orchestrators/atom_feed/latest_filings_poller.py
+
+# Long-running intraday ingest: latest-filings Atom feed → filing_metadata → per-accession pipeline
+
+import time
+from collections import OrderedDict, defaultdict
+from typing import Dict, List
+
+from orchestrators.base_orchestrator import BaseOrchestrator
+from orchestrators.crawler_idx.daily_ingestion_pipeline import DailyIngestionPipeline
+from collectors.atom_feed.latest_filings_collector import (
+    DEFAULT_FEED_URL, AtomFeedSource, HttpAtomFeedSource, LatestFilingsCollector
+)
+from writers.crawler_idx.filing_metadata_writer import FilingMetadataWriter
+from models.database import get_db_session
+from models.orm_models.filing_metadata import FilingMetadata
+from config.config_loader import ConfigLoader
+from utils.job_tracker import create_job
+from utils.report_logger import log_info, log_warn, log_error
+
+# Accessions remembered in-process so repeated feed entries skip the DB lookup
+SEEN_CACHE_SIZE = 10000
+
+
+class LatestFilingsPoller(BaseOrchestrator):
+    """
+    Polls the current-filings feed and pushes each new accession through
+    DailyIngestionPipeline.run(process_only=[...]) within seconds of it being filed.
+
+    Accessions already in filing_metadata (from an earlier poll or the daily
+    crawler.idx run) are skipped. New ones are written first, so anything that
+    fails downstream is still picked up by the end-of-day pipeline.
+    """
+
+    def __init__(self, source: AtomFeedSource = None, pipeline: DailyIngestionPipeline = None,
+                 poll_interval_seconds: float = None, include_forms: List[str] = None):
+        config = ConfigLoader.load_config()
+        feed_config = config.get("ingestion", {}).get("latest_filings_feed", {}) or {}
+        user_agent = config.get("sec_downloader", {}).get("user_agent", "SafeHarborBot/1.0")
+
+        if source is None:
+            source = HttpAtomFeedSource(user_agent=user_agent, url=feed_config.get("url") or DEFAULT_FEED_URL)
+        self.collector = LatestFilingsCollector(source)
+        self.writer = FilingMetadataWriter()
+        self.pipeline = pipeline or DailyIngestionPipeline(use_cache=False)
+        self.poll_interval_seconds = (
+            poll_interval_seconds if poll_interval_seconds is not None
+            else feed_config.get("poll_interval_seconds", 10)
+        )
+        self.include_forms = (
+            include_forms if include_forms is not None
+            else config.get("crawler_idx", {}).get("include_forms_default", [])
+        )
+        self._seen = OrderedDict()
+        self._jobs_by_date: Dict[str, str] = {}
+
+    def orchestrate(self) -> List[str]:
+        """
+        Runs one poll cycle. Returns the accessions handed to the pipeline.
+        """
+        records = self.collector.collect(include_forms=self.include_forms)
+        if records is None:
+            return []
+
+        candidates = [r for r in records if r.accession_number not in self._seen]
+        if not candidates:
+            self.collector.commit()
+            return []
+
+        known = self._known_accessions([r.accession_number for r in candidates])
+        new_records = [r for r in candidates if r.accession_number not in known]
+        for accession_number in known:
+            self._remember(accession_number)
+        if not new_records:
+            self.collector.commit()
+            return []
+
+        log_info(f"[ATOM] {len(new_records)} new filings: {[r.accession_number for r in new_records]}")
+        failed = set(self.writer.upsert_many(new_records))
+        # Only what reached filing_metadata is remembered, and the feed is committed only when
+        # nothing failed: otherwise the next poll sees the failed accessions again
+        new_records = [r for r in new_records if r.accession_number not in failed]
+        for record in new_records:
+            self._remember(record.accession_number)
+        if failed:
+            log_warn(f"[ATOM] {len(failed)} filings not written; retrying them next poll: {sorted(failed)}")
+        else:
+            self.collector.commit()
+
+        # The feed can span midnight; jobs are tracked per filing date like the daily pipeline
+        by_date = defaultdict(list)
+        for record in new_records:
+            by_date[record.filing_date.isoformat()].append(record.accession_number)
+
+        processed = []
+        for target_date, accessions in by_date.items():
+            try:
+                self.pipeline.run(
+                    target_date=target_date,
+                    process_only=accessions,
+                    job_id=self._job_for(target_date)
+                )
+                processed.extend(accessions)
+            except Exception as e:
+                log_error(f"[ATOM] Pipeline failed for {accessions}: {e}")
+        return processed
+
+    def run(self, max_polls: int = None):
+        """
+        Polls until interrupted (or `max_polls` cycles have run).
+        """
+        log_info(f"[ATOM] Polling latest filings every {self.poll_interval_seconds}s")
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                started = time.time()
+                try:
+                    self.orchestrate()
+                except Exception as e:
+                    # A bad poll must not kill the poller; the next cycle retries
+                    log_warn(f"[ATOM] Poll failed: {e}")
+                polls += 1
+                if max_polls is None or polls < max_polls:
+                    time.sleep(max(0.0, self.poll_interval_seconds - (time.time() - started)))
+        except KeyboardInterrupt:
+            log_info("[ATOM] Poller stopped")
+
+    def _known_accessions(self, accessions: List[str]) -> set:
+        with get_db_session() as session:
+            rows = session.query(FilingMetadata.accession_number).filter(
+                FilingMetadata.accession_number.in_(accessions)
+            ).all()
+        return {row[0] for row in rows}
+
+    def _remember(self, accession_number: str):
+        self._seen[accession_number] = True
+        self._seen.move_to_end(accession_number)
+        while len(self._seen) > SEEN_CACHE_SIZE:
+            self._seen.popitem(last=False)
+
+    def _job_for(self, target_date: str) -> str:
+        if target_date not in self._jobs_by_date:
+            self._jobs_by_date[target_date] = create_job(target_date, f"Latest filings feed for {target_date}")
+        return self._jobs_by_date[target_date]
@@ -5,7 +5,10 @@ from orchestrators.crawler_idx.filing_documents_orchestrator import FilingDocume
 from orchestrators.crawler_idx.sgml_disk_orchestrator import SgmlDiskOrchestrator
 from orchestrators.forms.form4_orchestrator import Form4Orchestrator
 from parsers.sgml.indexers.sgml_indexer_factory import SgmlIndexerFactory
+from collectors.crawler_idx.filing_documents_collector import OWNERSHIP_FORMS
 from downloaders.sgml_downloader import SgmlDownloader
+from downloaders.http_transport import HttpTransport
+from downloaders.rate_limiter import get_host_rate_limiter
 from utils.report_logger import log_info, log_warn, log_error
 from utils.job_tracker import create_job, get_job_progress, update_batch_status, update_record_status
 from config.config_loader import ConfigLoader
@@ -21,19 +24,39 @@ class DailyIngestionPipeline:
         self.use_cache = use_cache
         self.config = ConfigLoader.load_config()
         self.user_agent = self.config.get("sec_downloader", {}).get("user_agent", "SafeHarborBot/1.0")
-        self.meta_orchestrator = FilingMetadataOrchestrator()
+        downloader_config = self.config.get("sec_downloader", {})
+
+        # One pooled transport for every SEC request in the run (crawler.idx + SGML)
+        self.transport = HttpTransport(
+            user_agent=self.user_agent,
+            pool_size=downloader_config.get("pool_size", 10)
+        )
+        self.meta_orchestrator = FilingMetadataOrchestrator(transport=self.transport)
 
         # Shared downloader instance of SgmlDownloader across Pipelines 2 and 3
         self.sgml_downloader = SgmlDownloader(
             user_agent=self.user_agent,
-            use_cache=False
+            use_cache=False,
+            max_workers=downloader_config.get("max_workers", 4),
+            transport=self.transport,
+            rate_limiter=get_host_rate_limiter(),
+            memory_cache_max_bytes=downloader_config.get("memory_cache_max_mb", 512) * 1024 * 1024
         )
 
+        # Large non-ownership submissions are streamed to their raw SGML path by Pipeline 2
+        # (bounded memory); Pipeline 3 then finds them already written.
         self.docs_orchestrator = FilingDocumentsOrchestrator(
             use_cache=False,
             write_cache=False,
-            downloader=self.sgml_downloader
+            downloader=self.sgml_downloader,
+            stream_to_disk=downloader_config.get("stream_to_disk", False)
         )
+        self.stream_to_disk = downloader_config.get("stream_to_disk", False)
+
+        # Read-ahead: up to K upcoming accessions download in the background while the
+        # current one is indexed and written. Each is evicted once processed, so at most
+        # K + 1 submissions are held in memory. 0 disables read-ahead.
+        self.prefetch_window = max(0, downloader_config.get("prefetch_window", 4))
 
         self.sgml_orchestrator = SgmlDiskOrchestrator(
             use_cache=False,
@@ -148,6 +171,13 @@ class DailyIngestionPipeline:
             # Execute query to get records
             records_to_process = query.all()
             accession_filters = [r.accession_number for r in records_to_process]
+            # Only submissions Pipeline 2 holds in memory are worth reading ahead; streamed
+            # ones go straight to disk and would be downloaded twice.
+            prefetch_targets = {
+                r.accession_number: (r.cik, r.accession_number, str(r.filing_date.year))
+                for r in records_to_process
+                if not (self.stream_to_disk and r.form_type not in OWNERSHIP_FORMS)
+            }
             
             log_info(f"[META] Selected {len(accession_filters)} records to process: {accession_filters}")
             
@@ -167,59 +197,69 @@ class DailyIngestionPipeline:
         # === Process each record individually with error handling ===
         successfully_processed = []
         failed_records = []
+        in_flight = {}  # accession → Future from SgmlDownloader.prefetch_async
         
-        for accession_number in accession_filters:
-            try:
-                log_info(f"[PIPELINE] Processing {accession_number}")
-
-                # Get the filing metadata record
-                with get_db_session() as session:
-                    filing_record = session.query(FilingMetadata).filter_by(
-                        accession_number=accession_number
-                    ).first()
-
-                    if not filing_record:
-                        log_error(f"[ERROR] Filing metadata not found for {accession_number}")
-                        continue
-
-                # === Pipeline 2: FilingDocuments (SGML Index) ===
-                log_info(f"[DOCS] Document indexing for {accession_number}")
-                self.docs_orchestrator.run(accession_filters=[accession_number])
-
-                # === Pipeline 3: SGML Disk Writer ===
-                log_info(f"[SGML] SGML disk download for {accession_number}")
-                self.sgml_orchestrator.run(accession_filters=[accession_number])
-
-                # === Form-Specific Processing ===
-                # Form 4 specialized processing
-                if filing_record.form_type.strip().upper() in ["4", "FORM 4", "4/A", "FORM 4/A"]:
-                    log_info(f"[FORM4] Processing Form 4 data for {accession_number}")
-
-                    # Use the dedicated Form4Orchestrator
-                    form4_result = self.form4_orchestrator.run(
-                        accession_filters=[accession_number],
-                        reprocess=True  # Process even if already exists
-                    )
+        try:
+            for position, accession_number in enumerate(accession_filters):
+                self._fill_prefetch_window(accession_filters, position, prefetch_targets, in_flight)
+                self._await_prefetch(in_flight.pop(accession_number, None))
+                try:
+                    log_info(f"[PIPELINE] Processing {accession_number}")
 
-                    if form4_result and form4_result.get("succeeded", 0) > 0:
-                        log_info(f"[FORM4] Successfully processed Form 4 data for {accession_number}")
-                    else:
-                        log_warn(f"[FORM4] Failed to process Form 4 data for {accession_number}")
-                        # Note: We don't fail the entire pipeline if just the Form 4 specialized
-                        # processing fails, as the general document indexing succeeded
+                    # Get the filing metadata record
+                    with get_db_session() as session:
+                        filing_record = session.query(FilingMetadata).filter_by(
+                            accession_number=accession_number
+                        ).first()
 
-                # Mark as successfully processed
-                update_record_status(accession_number, 'completed')
-                successfully_processed.append(accession_number)
+                        if not filing_record:
+                            log_error(f"[ERROR] Filing metadata not found for {accession_number}")
+                            continue
 
-            except Exception as e:
-                error_msg = f"{str(e)}\n{traceback.format_exc()}"
-                log_error(f"[ERROR] Failed to process {accession_number}: {error_msg}")
-                update_record_status(accession_number, 'failed', error_msg)
-                failed_records.append((accession_number, error_msg))
+                    # === Pipeline 2: FilingDocuments (SGML Index) ===
+                    log_info(f"[DOCS] Document indexing for {accession_number}")
+                    self.docs_orchestrator.run(accession_filters=[accession_number])
 
-        # Clear in-memory SGML cache to prevent memory leaks
-        self.sgml_downloader.clear_memory_cache()
+                    # === Pipeline 3: SGML Disk Writer ===
+                    log_info(f"[SGML] SGML disk download for {accession_number}")
+                    self.sgml_orchestrator.run(accession_filters=[accession_number])
+
+                    # === Form-Specific Processing ===
+                    # Form 4 specialized processing
+                    if filing_record.form_type.strip().upper() in ["4", "FORM 4", "4/A", "FORM 4/A"]:
+                        log_info(f"[FORM4] Processing Form 4 data for {accession_number}")
+
+                        # Use the dedicated Form4Orchestrator
+                        form4_result = self.form4_orchestrator.run(
+                            accession_filters=[accession_number],
+                            reprocess=True  # Process even if already exists
+                        )
+
+                        if form4_result and form4_result.get("succeeded", 0) > 0:
+                            log_info(f"[FORM4] Successfully processed Form 4 data for {accession_number}")
+                        else:
+                            log_warn(f"[FORM4] Failed to process Form 4 data for {accession_number}")
+                            # Note: We don't fail the entire pipeline if just the Form 4 specialized
+                            # processing fails, as the general document indexing succeeded
+
+                    # Mark as successfully processed
+                    update_record_status(accession_number, 'completed')
+                    successfully_processed.append(accession_number)
+
+                except Exception as e:
+                    error_msg = f"{str(e)}\n{traceback.format_exc()}"
+                    log_error(f"[ERROR] Failed to process {accession_number}: {error_msg}")
+                    update_record_status(accession_number, 'failed', error_msg)
+                    failed_records.append((accession_number, error_msg))
+                finally:
+                    # Keeps memory bounded by the read-ahead window rather than the day's volume
+                    self.sgml_downloader.evict(accession_number)
+        finally:
+            # Stop read-ahead first, so no prefetch still in flight refills the cache being cleared
+            self.sgml_downloader.shutdown_prefetch()
+            log_info(f"[SGML-CACHE] {self.sgml_downloader.memory_cache.stats()}")
+            self.sgml_downloader.clear_memory_cache()
+            self.transport.log_metrics(label="HTTP")
 
         # Log summary
         log_info(f"[ALL] Daily ingestion pipeline completed for {target_date}")
@@ -229,4 +269,21 @@ class DailyIngestionPipeline:
         
         # Report final job progress
         job_progress = get_job_progress(job_id)
-        log_info(f"[JOB] Progress: {job_progress['completed']}/{job_progress['total']} completed ({job_progress['progress_pct']:.1f}%), {job_progress['failed']} failed")
\ No newline at end of file
+        log_info(f"[JOB] Progress: {job_progress['completed']}/{job_progress['total']} completed ({job_progress['progress_pct']:.1f}%), {job_progress['failed']} failed")
+
+    def _fill_prefetch_window(self, accession_filters: list, position: int, prefetch_targets: dict, in_flight: dict):
+        """Keeps the next `prefetch_window` accessions after `position` downloading in the background."""
+        for accession_number in accession_filters[position + 1:position + 1 + self.prefetch_window]:
+            target = prefetch_targets.get(accession_number)
+            if target and accession_number not in in_flight:
+                cik, accession, year = target
+                in_flight[accession_number] = self.sgml_downloader.prefetch_async(cik, accession, year, write_cache=False)
+
+    @staticmethod
+    def _await_prefetch(future):
+        """Waits for the current accession's read-ahead; a failure is left for Pipeline 2 to retry and report."""
+        if future is None:
+            return
+        error = future.exception()
+        if error is not None:
+            log_warn(f"[PREFETCH] Read-ahead failed, falling back to direct download: {error}")
@@ -11,7 +11,8 @@ from config.config_loader import ConfigLoader
 from utils.report_logger import log_info, log_warn
 
 class FilingDocumentsOrchestrator(BaseOrchestrator):
-    def __init__(self, use_cache: bool = True, write_cache: bool = True, downloader: SgmlDownloader = None):
+    def __init__(self, use_cache: bool = True, write_cache: bool = True, downloader: SgmlDownloader = None,
+                 stream_to_disk: bool = False):
         config = ConfigLoader.load_config()
         self.user_agent = config.get("sec_downloader", {}).get("user_agent", "SafeHarborBot/1.0")
         self.db_session = get_db_session()
@@ -20,7 +21,8 @@ class FilingDocumentsOrchestrator(BaseOrchestrator):
             user_agent=self.user_agent,
             use_cache=use_cache,
             write_cache=write_cache,
-            downloader=downloader
+            downloader=downloader,
+            stream_to_disk=stream_to_disk
             )
         self.writer = FilingDocumentsWriter(db_session=self.db_session)
         self.config = config
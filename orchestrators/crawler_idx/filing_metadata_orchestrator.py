@@ -4,16 +4,22 @@
 
 from orchestrators.base_orchestrator import BaseOrchestrator
 from collectors.crawler_idx.filing_metadata_collector import FilingMetadataCollector
+from downloaders.http_transport import HttpTransport
+from downloaders.validator_store import get_shared_validator_store
 from writers.crawler_idx.filing_metadata_writer import FilingMetadataWriter
 from config.config_loader import ConfigLoader
 from utils.report_logger import log_info, log_warn
 from models.dataclasses.filing_metadata import FilingMetadata
 
 class FilingMetadataOrchestrator(BaseOrchestrator):
-    def __init__(self):
+    def __init__(self, transport: HttpTransport = None):
         config = ConfigLoader.load_config()
         user_agent = config.get("sec_downloader", {}).get("user_agent", "SafeHarborBot/1.0")
-        self.collector = FilingMetadataCollector(user_agent=user_agent)
+        self.collector = FilingMetadataCollector(
+            user_agent=user_agent,
+            transport=transport,
+            validator_store=get_shared_validator_store()
+        )
         self.writer = FilingMetadataWriter()
         self.config = config
 
@@ -32,8 +38,16 @@ class FilingMetadataOrchestrator(BaseOrchestrator):
                 include_forms=include_forms,
                 limit=limit
             )
+            if parsed_records is None:
+                log_info(f"[META] crawler.idx for {date_str} unchanged since last run; nothing to write")
+                return
             log_info(f"[META] Collected {len(parsed_records)} filing metadata records for {date_str}")
-            self.writer.upsert_many(parsed_records)
+            failed = self.writer.upsert_many(parsed_records)
+            if failed:
+                # Not recording the validators makes the next run re-fetch crawler.idx and retry these
+                log_warn(f"[META] {len(failed)} filing metadata records failed to write; crawler.idx will be re-fetched next run")
+            else:
+                self.collector.commit_validators()
         except Exception as e:
             log_warn(f"[META] Error during orchestrate(): {e}")
             raise
@@ -0,0 +1,52 @@
+# orchestrators/crawler_idx/full_index_orchestrator.py
+
+# Bulk-loads filing_metadata from quarterly full-index files (backfills)
+
+from typing import Dict, List, Tuple
+
+from orchestrators.base_orchestrator import BaseOrchestrator
+from collectors.crawler_idx.full_index_collector import FullIndexCollector
+from writers.crawler_idx.filing_metadata_writer import FilingMetadataWriter
+from config.config_loader import ConfigLoader
+from utils.report_logger import log_info, log_warn
+
+class FullIndexOrchestrator(BaseOrchestrator):
+    def __init__(self, batch_size: int = 5000):
+        config = ConfigLoader.load_config()
+        user_agent = config.get("sec_downloader", {}).get("user_agent", "SafeHarborBot/1.0")
+        self.collector = FullIndexCollector(user_agent=user_agent)
+        self.writer = FilingMetadataWriter()
+        self.batch_size = batch_size
+
+    def orchestrate(self, quarters: List[Tuple[int, int]], include_forms: List[str] = None,
+                    index_type: str = "master", refresh: bool = False) -> Dict[str, int]:
+        """
+        Loads each (year, quarter) in turn, inserting `batch_size` rows per statement.
+        Returns rows inserted per quarter, keyed "YYYY-QTRn".
+        """
+        inserted_by_quarter = {}
+        for year, quarter in quarters:
+            key = f"{year}-QTR{quarter}"
+            try:
+                inserted = 0
+                batch = []
+                for record in self.collector.iter_records(year, quarter, include_forms=include_forms,
+                                                          index_type=index_type, refresh=refresh):
+                    batch.append(record)
+                    if len(batch) >= self.batch_size:
+                        inserted += self.writer.bulk_insert(batch)
+                        batch = []
+                inserted += self.writer.bulk_insert(batch)
+                inserted_by_quarter[key] = inserted
+                log_info(f"[FULL-INDEX] {key}: inserted {inserted} new filing_metadata rows")
+            except Exception as e:
+                log_warn(f"[FULL-INDEX] Error loading {key}: {e}")
+                raise
+        return inserted_by_quarter
+
+    def run(self, quarters: List[Tuple[int, int]], include_forms: List[str] = None,
+            index_type: str = "master", refresh: bool = False) -> Dict[str, int]:
+        log_info(f"[FULL-INDEX] Starting backfill of {len(quarters)} quarters")
+        results = self.orchestrate(quarters, include_forms=include_forms, index_type=index_type, refresh=refresh)
+        log_info(f"[FULL-INDEX] Completed backfill: {sum(results.values())} rows inserted")
+        return results
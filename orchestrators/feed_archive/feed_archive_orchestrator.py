@@ -0,0 +1,139 @@
+# orchestrators/feed_archive/feed_archive_orchestrator.py
+
+# Backfills filing_metadata, filing_documents and Form 4 data from a local daily feed archive
+
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from orchestrators.base_orchestrator import BaseOrchestrator
+from collectors.feed_archive.feed_archive_collector import FeedArchiveCollector
+from parsers.sgml.indexers.sgml_indexer_factory import SgmlIndexerFactory
+from writers.crawler_idx.filing_metadata_writer import FilingMetadataWriter
+from writers.crawler_idx.filing_documents_writer import FilingDocumentsWriter
+from writers.forms.form4_writer import Form4Writer
+from models.adapters.dataclass_to_orm import convert_parsed_doc_to_filing_doc
+from models.database import get_db_session
+from sqlalchemy.exc import SQLAlchemyError
+from models.dataclasses.filing_metadata import FilingMetadata
+from models.dataclasses.sgml_text_document import SgmlTextDocument
+from models.orm_models.filing_metadata import FilingMetadata as FilingMetadataORM
+from utils.report_logger import log_info, log_error
+
+# Submission bytes held per batch before it is written
+DEFAULT_MAX_BATCH_BYTES = 64 * 1024 * 1024
+
+
+class FeedArchiveOrchestrator(BaseOrchestrator):
+    """
+    Routes every submission in a feed archive through the same indexers and
+    writers as Pipelines 1, 2 and Form 4, without any per-filing network calls.
+    Submissions are written in batches of at most `max_batch_bytes` of SGML (a single
+    larger submission forms its own batch), so memory stays bounded however big the
+    filings are. Each filing_metadata row is marked completed or failed, like the
+    daily pipeline does.
+    """
+
+    def __init__(self, max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES):
+        self.max_batch_bytes = max_batch_bytes
+        self.metadata_writer = FilingMetadataWriter()
+
+    def orchestrate(self, archive_path: str, include_forms: List[str] = None, limit: int = None) -> Dict[str, Any]:
+        collector = FeedArchiveCollector(archive_path)
+        results = {"submissions": 0, "documents": 0, "form4": 0, "failed": 0, "failures": []}
+
+        with get_db_session() as db_session:
+            documents_writer = FilingDocumentsWriter(db_session=db_session)
+            form4_writer = Form4Writer(db_session)
+
+            batch = []
+            batch_bytes = 0
+            for submission in collector.iter_submissions(include_forms=include_forms, limit=limit):
+                size = len(submission[1].raw)
+                if batch and batch_bytes + size > self.max_batch_bytes:
+                    self._write_batch(batch, db_session, documents_writer, form4_writer, results)
+                    batch, batch_bytes = [], 0
+                batch.append(submission)
+                batch_bytes += size
+            if batch:
+                self._write_batch(batch, db_session, documents_writer, form4_writer, results)
+
+        log_info(
+            f"[FEED] Backfilled {results['submissions']} submissions: {results['documents']} documents, "
+            f"{results['form4']} Form 4 filings, {results['failed']} failed"
+        )
+        return results
+
+    def _write_batch(self, batch: List[Tuple[FilingMetadata, SgmlTextDocument]], db_session,
+                     documents_writer: FilingDocumentsWriter, form4_writer: Form4Writer, results: Dict[str, Any]):
+        # filing_metadata first: filing_documents and form4_filings reference it
+        self.metadata_writer.upsert_many([metadata for metadata, _ in batch])
+        results["submissions"] += len(batch)
+
+        filing_docs = []
+        form4_batch = []
+        errors: Dict[str, str] = {}
+        for metadata, sgml_doc in batch:
+            try:
+                indexer = SgmlIndexerFactory.create_indexer(metadata.form_type, metadata.cik, metadata.accession_number)
+                # Indexed from the archive bytes; only tag blocks and the XML are decoded
+                indexed = indexer.index_documents(sgml_doc.raw)
+
+                # Specialized indexers (Form 4) return a dict with the form data alongside the documents
+                if isinstance(indexed, dict):
+                    parsed_metadata = indexed.get("documents", [])
+                    if indexed.get("form4_data"):
+                        form4_batch.append((metadata.accession_number, indexed["form4_data"]))
+                else:
+                    parsed_metadata = indexed
+
+                for doc in parsed_metadata:
+                    if doc.issuer_cik is None:
+                        doc.issuer_cik = metadata.cik
+                filing_docs.extend(convert_parsed_doc_to_filing_doc(doc) for doc in parsed_metadata)
+            except Exception as e:
+                log_error(f"[FEED] Failed to index {metadata.accession_number}: {e}")
+                errors[metadata.accession_number] = str(e)
+
+        documents_writer.write_documents(filing_docs)
+        results["documents"] += len(filing_docs)
+
+        for accession_number, form4_data in form4_batch:
+            try:
+                if form4_writer.write_form4_data(form4_data):
+                    results["form4"] += 1
+                else:
+                    errors[accession_number] = "Failed to write Form 4 data"
+            except Exception as e:
+                log_error(f"[FEED] Failed to write Form 4 data for {accession_number}: {e}")
+                errors[accession_number] = str(e)
+
+        results["failed"] += len(errors)
+        results["failures"].extend({"accession_number": a, "error": e} for a, e in errors.items())
+        self._update_status([metadata.accession_number for metadata, _ in batch], errors, db_session)
+
+    @staticmethod
+    def _update_status(accession_numbers: List[str], errors: Dict[str, str], db_session):
+        """Marks the batch's filing_metadata rows completed, or failed with the error."""
+        now = datetime.now()
+        records = db_session.query(FilingMetadataORM).filter(
+            FilingMetadataORM.accession_number.in_(accession_numbers)
+        ).all()
+        for record in records:
+            if record.accession_number in errors:
+                record.processing_status = "failed"
+                record.processing_error = errors[record.accession_number]
+            else:
+                record.processing_status = "completed"
+                record.processing_completed_at = now
+                record.processing_error = None
+        try:
+            db_session.commit()
+        except SQLAlchemyError as e:
+            db_session.rollback()
+            log_error(f"[FEED] Failed to update processing status for {len(records)} filings: {e}")
+
+    def run(self, archive_path: str, include_forms: List[str] = None, limit: int = None) -> Dict[str, Any]:
+        log_info(f"[FEED] Starting feed archive backfill from {archive_path}")
+        results = self.orchestrate(archive_path, include_forms=include_forms, limit=limit)
+        log_info(f"[FEED] Completed feed archive backfill from {archive_path}")
+        return results
@@ -6,6 +6,7 @@ from parsers.forms.form4_parser import Form4Parser
 from writers.forms.form4_writer import Form4Writer
 from writers.shared.raw_file_writer import RawFileWriter
 from downloaders.sgml_downloader import SgmlDownloader
+from downloaders.rate_limiter import get_host_rate_limiter
 from models.database import get_db_session
 from models.dataclasses.raw_document import RawDocument
 from models.orm_models.filing_metadata import FilingMetadata
@@ -14,11 +15,15 @@ from utils.report_logger import log_info, log_warn, log_error
 from utils.url_builder import construct_sgml_txt_url
 from utils.accession_formatter import format_for_url, format_for_filename, format_for_db
 from utils.path_manager import build_raw_filepath_by_type
+from utils.artifact_locator import find_stored_sgml, register_raw_artifact, write_file_atomic
+from utils.sgml_buffer import SgmlBuffer, close_sgml_buffer, open_sgml_mapping
+from utils.parse_cache import ParseResultCache, content_sha256, get_shared_parse_cache
+from writers.shared.identity_cache import IdentityCache, get_shared_identity_cache
+from sqlalchemy.exc import SQLAlchemyError
 from config.config_loader import ConfigLoader
 from datetime import datetime
-import os
 import traceback
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Union
 
 class Form4Orchestrator(BaseOrchestrator):
     """
@@ -32,7 +37,11 @@ class Form4Orchestrator(BaseOrchestrator):
     It respects the shared downloader pattern of the DailyIngestionPipeline.
     """
 
-    def __init__(self, use_cache: bool = False, write_cache: bool = False, downloader: SgmlDownloader = None):
+    # Name of this orchestrator's results in the parse cache
+    PARSE_CACHE_NAME = "form4"
+
+    def __init__(self, use_cache: bool = False, write_cache: bool = False, downloader: SgmlDownloader = None,
+                 parse_cache: ParseResultCache = None, identity_cache: IdentityCache = None):
         """
         Initialize the Form4Orchestrator.
 
@@ -40,6 +49,8 @@ class Form4Orchestrator(BaseOrchestrator):
             use_cache: Whether to use file-based cache (defaults to False like DailyIngestionPipeline)
             write_cache: Whether to write to file-based cache (defaults to False like DailyIngestionPipeline)
             downloader: Shared SgmlDownloader instance (from DailyIngestionPipeline)
+            parse_cache: Cache of indexer outputs (defaults to the shared one; None when disabled in config)
+            identity_cache: Entity / security identity map shared with the writers (defaults to the shared one)
         """
         self.config = ConfigLoader.load_config()
         self.base_data_path = self.config.get("storage", {}).get("base_data_path", "data")
@@ -56,9 +67,13 @@ class Form4Orchestrator(BaseOrchestrator):
             self.downloader = SgmlDownloader(
                 user_agent=self.user_agent,
                 request_delay_seconds=0.1,
-                use_cache=self.use_cache
+                use_cache=self.use_cache,
+                rate_limiter=get_host_rate_limiter()
             )
 
+        self.parse_cache = parse_cache or get_shared_parse_cache()
+        self.identity_cache = identity_cache or get_shared_identity_cache()
+
         log_info(f"[FORM4] Initialized with shared downloader: {downloader is not None}")
 
     def orchestrate(self, target_date: str = None, limit: int = None,
@@ -105,13 +120,25 @@ class Form4Orchestrator(BaseOrchestrator):
             log_info(f"[FORM4] Found {len(filings_to_process)} Form 4 filings to process")
             results["total"] = len(filings_to_process)
 
+            # Load every filer entity of the batch (and their securities) with one IN query each,
+            # so the writers find most identities in the shared cache instead of SELECTing them
+            try:
+                self.identity_cache.warm_up(db_session, [f.cik for f in filings_to_process])
+            except SQLAlchemyError as e:
+                log_warn(f"[FORM4] Identity cache warm-up failed: {e}")
+                db_session.rollback()
+
             # Create writer instances
             form4_writer = Form4Writer(db_session)
             # Initialize RawFileWriter specifically for XML
             raw_writer = RawFileWriter(file_type="xml") if write_raw_xml else None
 
-            # Process each filing
-            for filing in filings_to_process:
+            # Process each filing, reading the next few ahead so _get_sgml_content finds each
+            # in the downloader's memory cache without holding the whole batch there
+            for filing in self.downloader.read_ahead(
+                filings_to_process,
+                lambda f: (f.cik, f.accession_number, f.filing_date.strftime("%Y") if f.filing_date else None)
+            ):
                 try:
                     results["processed"] += 1
                     log_info(f"[FORM4] Processing filing {filing.accession_number} ({results['processed']}/{results['total']})")
@@ -128,9 +155,12 @@ class Form4Orchestrator(BaseOrchestrator):
                         })
                         continue
 
-                    # Create and use indexer
-                    indexer = Form4SgmlIndexer(filing.cik, filing.accession_number)
-                    indexed_data = indexer.index_documents(sgml_content)
+                    # Index it, or reuse the result of an earlier run over the same content
+                    try:
+                        indexed_data = self._index_sgml(filing.cik, filing.accession_number, sgml_content)
+                    finally:
+                        # A file mapped from disk is not needed once its fields are extracted
+                        close_sgml_buffer(sgml_content)
 
                     form4_data = indexed_data.get("form4_data")
                     xml_content = indexed_data.get("xml_content")
@@ -225,6 +255,9 @@ class Form4Orchestrator(BaseOrchestrator):
             # Commit any remaining changes
             db_session.commit()
 
+        # Keep the identities for the next run (when identity_cache.snapshot_path is set)
+        self.identity_cache.save_snapshot()
+
         log_info(
             f"[FORM4] Completed Form 4 processing: {results['succeeded']} succeeded, "
             f"{results['failed']} failed, {results['skipped']} skipped"
@@ -263,6 +296,28 @@ class Form4Orchestrator(BaseOrchestrator):
             log_error(f"[FORM4] Run failed: {e}")
             raise
 
+    def _index_sgml(self, cik: str, accession_number: str, sgml_content: Union[str, SgmlBuffer]) -> Dict[str, Any]:
+        """
+        Form4SgmlIndexer output for the filing. Served from the parse cache when the same content
+        was indexed before by the same parser version (re-runs and --retry-failed then skip the
+        XML parse entirely); stored there otherwise.
+        """
+        indexer = Form4SgmlIndexer(cik, accession_number)
+        content_hash = content_sha256(sgml_content) if self.parse_cache is not None else None
+        version = getattr(indexer, "PARSER_VERSION", None)
+
+        if content_hash and version:
+            cached = self.parse_cache.get(self.PARSE_CACHE_NAME, version, content_hash, context=cik)
+            if cached is not None:
+                log_info(f"[FORM4] Using cached parse result for {accession_number} (parser v{version})")
+                return cached
+
+        indexed_data = indexer.index_documents(sgml_content)
+
+        if content_hash and version and indexed_data.get("form4_data"):
+            self.parse_cache.put(self.PARSE_CACHE_NAME, version, content_hash, indexed_data, context=cik)
+        return indexed_data
+
     def _get_filings_to_process(self, db_session, target_date: str = None, limit: int = None,
                                 accession_filters: List[str] = None, reprocess: bool = False) -> List[FilingMetadata]:
         """
@@ -309,7 +364,7 @@ class Form4Orchestrator(BaseOrchestrator):
         # Execute query
         return query.all()
 
-    def _get_sgml_content(self, cik: str, accession_number: str) -> Optional[str]:
+    def _get_sgml_content(self, cik: str, accession_number: str) -> Optional[SgmlBuffer]:
         """
         Get SGML content for a filing using the most efficient source.
         Prioritizes memory cache, then disk cache, then downloading.
@@ -326,7 +381,8 @@ class Form4Orchestrator(BaseOrchestrator):
             accession_number: Accession number
 
         Returns:
-            String content of the SGML or None if not found
+            The submission bytes, a read-only mapping of the stored file when read from
+            disk (close it with `close_sgml_buffer`), or None if not found
         """
         log_info(f"[FORM4] Getting SGML content for {accession_number}")
 
@@ -336,50 +392,29 @@ class Form4Orchestrator(BaseOrchestrator):
         # Check if the downloader has this URL in its memory cache
         if self.downloader.has_in_memory_cache(url):
             log_info(f"[FORM4] Using SGML from memory cache for {accession_number}")
-            sgml_content = self.downloader.get_from_memory_cache(url)
-            
+            # The bytes held by the cache; never decoded as a whole
+            sgml_content = self.downloader.get_raw_from_memory_cache(url)
+
             # Bug 8: After getting content, try to extract issuer CIK
-            xml_start = sgml_content.find("<XML>")
-            xml_end = sgml_content.find("</XML>", xml_start) if xml_start != -1 else -1
-            issuer_cik = None
-            if xml_start != -1 and xml_end != -1:
-                xml_content = sgml_content[xml_start+5:xml_end].strip()
-                issuer_cik = Form4Parser.extract_issuer_cik_from_xml(xml_content)
+            issuer_cik = self._extract_xml_issuer_cik(sgml_content)
             if issuer_cik and issuer_cik != cik:
                 log_info(f"[FORM4] Found issuer CIK {issuer_cik} in XML, different from {cik}")
                 # If we found a different issuer CIK, check if we should try another URL
                 alt_url = construct_sgml_txt_url(issuer_cik, format_for_url(accession_number))
                 if alt_url != url and self.downloader.has_in_memory_cache(alt_url):
                     log_info(f"[FORM4] Found alternate URL in cache using issuer CIK {issuer_cik}")
-                    return self.downloader.get_from_memory_cache(alt_url)
-            
+                    return self.downloader.get_raw_from_memory_cache(alt_url)
+
             return sgml_content
 
-        # Next, try from disk if Pipeline 3 has already saved it
-        sgml_path = self._get_sgml_file_path(cik, accession_number)
-        if os.path.exists(sgml_path):
-            log_info(f"[FORM4] Using SGML from disk for {accession_number}")
-            with open(sgml_path, 'r', encoding='utf-8', errors='replace') as f:
-                sgml_content = f.read()
-                
-                # Bug 8: Try to extract issuer CIK from the content
-                xml_start = sgml_content.find("<XML>")
-                xml_end = sgml_content.find("</XML>", xml_start) if xml_start != -1 else -1
-                issuer_cik = None
-                if xml_start != -1 and xml_end != -1:
-                    xml_content = sgml_content[xml_start+5:xml_end].strip()
-                    issuer_cik = Form4Parser.extract_issuer_cik_from_xml(xml_content)
-                if issuer_cik and issuer_cik != cik:
-                    log_info(f"[FORM4] Found issuer CIK {issuer_cik} in XML, different from {cik}")
-                    
-                    # Check if there's a file under the issuer CIK path
-                    alt_path = self._get_sgml_file_path(issuer_cik, accession_number)
-                    if os.path.exists(alt_path) and alt_path != sgml_path:
-                        log_info(f"[FORM4] Found file at issuer CIK path {alt_path}, using that instead")
-                        with open(alt_path, 'r', encoding='utf-8', errors='replace') as f2:
-                            return f2.read()
-                
-                return sgml_content
+        # Next, try from disk if Pipeline 3 (or an earlier standalone run) has already saved it.
+        # The artifact index is keyed by accession, so a file stored under the issuer CIK
+        # is found even when `cik` is a reporting owner.
+        sgml_path = find_stored_sgml(accession_number, self._get_sgml_file_path(cik, accession_number))
+        if sgml_path:
+            log_info(f"[FORM4] Using SGML from disk for {accession_number}: {sgml_path}")
+            # Mapped, not read: the indexer decodes only the SEC-HEADER and the XML block
+            return open_sgml_mapping(sgml_path)
 
         # Finally, try to download (this will also update memory cache)
         log_info(f"[FORM4] Downloading SGML for {accession_number}")
@@ -395,32 +430,19 @@ class Form4Orchestrator(BaseOrchestrator):
         # Get SgmlTextDocument from downloader
         sgml_doc = self.downloader.download_sgml(cik, accession_number, year)
         
-        # Extract string content from the dataclass
+        # Take the bytes as downloaded: indexing and the disk write need no decode
         if sgml_doc:
-            # Handle either SgmlTextDocument object or string
-            if hasattr(sgml_doc, 'content'):
-                sgml_content = sgml_doc.content
-            else:
-                sgml_content = str(sgml_doc)
-                
+            sgml_content = self._raw_sgml(sgml_doc)
+
             # Bug 8: Try to extract issuer CIK from content before writing to disk
-            xml_start = sgml_content.find("<XML>")
-            xml_end = sgml_content.find("</XML>", xml_start) if xml_start != -1 else -1
-            issuer_cik = None
-            if xml_start != -1 and xml_end != -1:
-                xml_content = sgml_content[xml_start+5:xml_end].strip()
-                issuer_cik = Form4Parser.extract_issuer_cik_from_xml(xml_content)
+            issuer_cik = self._extract_xml_issuer_cik(sgml_content)
             if issuer_cik and issuer_cik != cik:
                 log_info(f"[FORM4] Found issuer CIK {issuer_cik} in downloaded XML, different from {cik}")
                 
                 # Try to download with issuer CIK if it's different
                 alt_sgml_doc = self.downloader.download_sgml(issuer_cik, accession_number, year)
                 if alt_sgml_doc:
-                    if hasattr(alt_sgml_doc, 'content'):
-                        new_content = alt_sgml_doc.content
-                    else:
-                        new_content = str(alt_sgml_doc)
-                        
+                    new_content = self._raw_sgml(alt_sgml_doc)
                     if new_content:
                         log_info(f"[FORM4] Successfully downloaded using issuer CIK {issuer_cik}")
                         sgml_content = new_content
@@ -430,18 +452,37 @@ class Form4Orchestrator(BaseOrchestrator):
             if sgml_content and self.write_cache:
                 # Bug 8: Use the correct CIK (original or issuer) for path construction
                 sgml_path = self._get_sgml_file_path(cik, accession_number)
-                os.makedirs(os.path.dirname(sgml_path), exist_ok=True)
-                with open(sgml_path, 'w', encoding='utf-8') as f:
-                    f.write(sgml_content)
+                # Written as received ('wb', via .part + rename) and indexed with its size and hash
+                size_bytes, sha256 = write_file_atomic(sgml_path, sgml_content)
+                register_raw_artifact(accession_number, "sgml", sgml_path, cik=cik, form_type="4",
+                                      size_bytes=size_bytes, sha256=sha256)
                 log_info(f"[FORM4] Wrote SGML to disk at {sgml_path}")
             
             return sgml_content
         
         return None
 
+    @staticmethod
+    def _raw_sgml(sgml_doc) -> bytes:
+        """Bytes of a downloaded submission (SgmlTextDocument.raw, or a plain string encoded)."""
+        if hasattr(sgml_doc, 'raw'):
+            return sgml_doc.raw
+        return str(sgml_doc).encode("utf-8")
+
+    @staticmethod
+    def _extract_xml_issuer_cik(sgml_content: bytes) -> Optional[str]:
+        """Issuer CIK from the submission's <XML> block; only that block is decoded."""
+        xml_start = sgml_content.find(b"<XML>")
+        xml_end = sgml_content.find(b"</XML>", xml_start) if xml_start != -1 else -1
+        if xml_start == -1 or xml_end == -1:
+            return None
+        xml_content = sgml_content[xml_start+5:xml_end].decode("utf-8", errors="replace").strip()
+        return Form4Parser.extract_issuer_cik_from_xml(xml_content)
+
     def _get_sgml_file_path(self, cik: str, accession_number: str) -> str:
         """
-        Get the path to the SGML file for a given CIK and accession number.
+        Get the raw SGML path for a given CIK and accession number, in the same layout
+        RawFileWriter uses (raw/sgml/{cik}/{year}/4/{accession}/{accession}.txt).
 
         Args:
             cik: CIK
@@ -450,16 +491,16 @@ class Form4Orchestrator(BaseOrchestrator):
         Returns:
             Path to the SGML file
         """
-        # Normalize accession number for path construction
-        acc_clean = format_for_filename(accession_number)
-
-        # Construct path based on config and standard pattern
-        sgml_path = os.path.join(
-            self.base_data_path,
-            "sgml",
-            cik,
-            f"{acc_clean}.txt"
+        accession = format_for_db(accession_number)
+        # Filing year from the accession (0000123456-YY-123456); the metadata year is not passed in
+        year = f"20{accession.split('-')[1]}" if accession.count('-') == 2 else datetime.now().strftime("%Y")
+
+        return build_raw_filepath_by_type(
+            file_type="sgml",
+            year=year,
+            cik=cik,
+            form_type="4",
+            accession_or_subtype=accession,
+            filename=f"{accession}.txt",
+            force_base_path=self.base_data_path,
         )
-
-        return sgml_path
-        
@@ -1,8 +1,8 @@
 # orchestrators/submissions_ingestion_orchestrator.py
 
 from orchestrators.base_orchestrator import BaseOrchestrator
-from utils.path_utils import build_path_args
 import utils.path_manager as path_manager
+from utils.path_manager import build_path_args
 
 class SubmissionsIngestionOrchestrator(BaseOrchestrator):
     def __init__(self, collector, downloader, writer, forms_filter=None):
@@ -23,7 +23,13 @@ class SubmissionsIngestionOrchestrator(BaseOrchestrator):
 
         # Step 1: Collect recent filings metadata
         filings_metadata = self.collector.collect(cik, forms_filter=self.forms_filter)
+        if filings_metadata is None:
+            print(f"⏭️ Submissions for {cik} unchanged since last run; nothing to ingest")
+            return
 
+        # Validators are committed only if every collected filing was processed, so a limited
+        # or partly failed run is fetched in full (not answered with 304) next time
+        complete = not limit or len(filings_metadata) <= limit
         if limit:
             filings_metadata = filings_metadata[:limit]  # Only take first N filings
 
@@ -60,4 +66,8 @@ class SubmissionsIngestionOrchestrator(BaseOrchestrator):
                 print(f"✅ Successfully processed {accession_number} ({form_type})")
 
             except Exception as e:
+                complete = False
                 print(f"❌ Error processing {accession_number}: {str(e)}")
+
+        if complete:
+            self.collector.commit_validators(cik)
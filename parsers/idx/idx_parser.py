@@ -1,29 +1,38 @@
 # parsers/idx/idx_parser.py
 
 from datetime import datetime
-from typing import List
+from typing import Iterable, Iterator, List
 from models.dataclasses.filing_metadata import FilingMetadata
-from utils.report_logger import log_warn
+from utils.report_logger import log_info, log_warn
 
 class CrawlerIdxParser:
     @staticmethod
-    def parse_lines(lines: List[str]) -> List[FilingMetadata]:
-        parsed = []
+    def parse_lines(lines: Iterable[str]) -> List[FilingMetadata]:
+        """
+        Parses crawler.idx lines into a list of records (see iter_parse_lines()).
+        """
+        records = list(CrawlerIdxParser.iter_parse_lines(lines))
+        log_info(f"[DEBUG] Parsing complete. Found {len(records)} valid records.")
+        return records
 
-        # Locate start of data (line of dashes)
-        start_index = 0
-        for i, line in enumerate(lines):
-            if set(line.strip()) == {"-"}:
-                start_index = i + 1
-                break
+    @staticmethod
+    def _parse_date(value: str):
+        value = value.strip()
+        return datetime.strptime(value, "%Y-%m-%d" if "-" in value else "%Y%m%d").date()
 
-        from utils.report_logger import log_info
-        log_info(f"[DEBUG] Starting to parse {len(lines) - start_index} data lines")
-        
-        line_count = 0
-        valid_count = 0
-        for line in lines[start_index:]:
-            line_count += 1
+    @staticmethod
+    def iter_parse_lines(lines: Iterable[str]) -> Iterator[FilingMetadata]:
+        """
+        Streams records from crawler.idx / quarterly full-index lines; parse_lines() collects them.
+        Consumes any line iterable (e.g. an open file) and yields records one at a time,
+        so a quarter with a million filings is never materialized as a list of lines.
+        """
+        in_data = False
+        for line in lines:
+            if not in_data:
+                # Data starts after the line of dashes
+                in_data = set(line.strip()) == {"-"}
+                continue
             if not line.strip():
                 continue
 
@@ -31,41 +40,43 @@ class CrawlerIdxParser:
             if len(parts) < 5:
                 log_warn(f"[SKIPPED] Malformed line (too few parts): {line}")
                 continue
-
             try:
-                # Extract fields
-                company_name = " ".join(parts[:-4])
-                form_type = parts[-4]
-                cik = parts[-3]
-                filing_date_str = parts[-2]
-                filing_url = parts[-1]
-
-                # Parse date
-                filing_date = datetime.strptime(filing_date_str.strip(), "%Y%m%d").date()
-
-                # Extract accession number from URL
-                accession_number = (
-                    filing_url.split("/")[-1].replace("-index.htm", "").strip()
+                filing_url = parts[-1].strip()
+                yield FilingMetadata(
+                    cik=parts[-3].strip(),
+                    form_type=parts[-4].strip(),
+                    filing_date=CrawlerIdxParser._parse_date(parts[-2]),
+                    filing_url=filing_url,
+                    accession_number=filing_url.split("/")[-1].replace("-index.htm", "").strip(),
                 )
+            except Exception as e:
+                log_warn(f"[SKIPPED] Error parsing line: {line} — {e}")
 
-                # Build FilingMetadata dataclass
-                record = FilingMetadata(
+    @staticmethod
+    def iter_parse_master_lines(lines: Iterable[str]) -> Iterator[FilingMetadata]:
+        """
+        Streams records from a quarterly master.idx / master.gz file.
+        Lines are pipe-delimited: CIK|Company Name|Form Type|Date Filed|edgar/data/CIK/ACCESSION.txt
+        """
+        in_data = False
+        for line in lines:
+            if not in_data:
+                in_data = set(line.strip()) == {"-"}
+                continue
+            parts = line.rstrip("\r\n").split("|")
+            if len(parts) != 5:
+                if line.strip():
+                    log_warn(f"[SKIPPED] Malformed master.idx line: {line}")
+                continue
+            try:
+                cik, _, form_type, date_filed, filename = parts
+                accession_number = filename.rsplit("/", 1)[-1].replace(".txt", "").strip()
+                yield FilingMetadata(
                     cik=cik.strip(),
                     form_type=form_type.strip(),
-                    filing_date=filing_date,
-                    filing_url=filing_url.strip(),
+                    filing_date=CrawlerIdxParser._parse_date(date_filed),
+                    filing_url=f"https://www.sec.gov/Archives/edgar/data/{cik.strip()}/{accession_number}-index.htm",
                     accession_number=accession_number,
                 )
-                parsed.append(record)
-                valid_count += 1
-                if valid_count % 1000 == 0:
-                    from utils.report_logger import log_info
-                    log_info(f"[DEBUG] Parsed {valid_count} valid records (processed {line_count} lines)")
-
             except Exception as e:
-                log_warn(f"[SKIPPED] Error parsing line: {line} — {e}")
-                continue
-
-        from utils.report_logger import log_info
-        log_info(f"[DEBUG] Parsing complete. Processed {line_count} lines, found {valid_count} valid records.")
-        return parsed
+                log_warn(f"[SKIPPED] Error parsing master.idx line: {line} — {e}")
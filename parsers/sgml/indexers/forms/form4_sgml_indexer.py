@@ -8,22 +8,30 @@ from models.dataclasses.forms.form4_relationship import Form4RelationshipData
 from models.dataclasses.entity import EntityData
 from parsers.forms.form4_parser import Form4Parser
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, Union
 import xml.etree.ElementTree as ET
 import re
 from utils.report_logger import log_info, log_warn, log_error
+from utils.sgml_buffer import SgmlBuffer, as_searchable, is_sgml_buffer
 
 class Form4SgmlIndexer(SgmlDocumentIndexer):
     """
     Specialized indexer for Form 4 filings that extracts both document metadata
     and Form 4-specific entity and transaction data.
     """
+    # Version of what index_documents returns; cached results of other versions are discarded
+    # (utils/parse_cache.py). Bump on any change to this indexer, Form4Parser or the Form 4
+    # dataclasses that alters the output.
+    PARSER_VERSION = "1"
+
     def __init__(self, cik: str, accession_number: str):
         super().__init__(cik, accession_number, "4")
         
-    def index_documents(self, txt_contents: str) -> Dict[str, Any]:
+    def index_documents(self, txt_contents: Union[str, SgmlBuffer]) -> Dict[str, Any]:
         """
         Parses SGML content to extract document metadata and form4-specific data.
+        Accepts text, raw bytes or a mapped file; for the latter only the SEC-HEADER
+        and the <XML> block are decoded (see `_extract_form4_text`).
         
         Returns:
             Dict containing:
@@ -34,6 +42,9 @@ class Form4SgmlIndexer(SgmlDocumentIndexer):
         """
         # Extract standard document metadata
         documents = super().index_documents(txt_contents)
+
+        if is_sgml_buffer(txt_contents):
+            txt_contents = self._extract_form4_text(as_searchable(txt_contents))
         
         # Extract Form 4 specific data
         form4_data = self.extract_form4_data(txt_contents)
@@ -96,6 +107,26 @@ class Form4SgmlIndexer(SgmlDocumentIndexer):
             "issuer_cik": issuer_cik  # Bug 8: Include issuer_cik in the return value
         }
     
+    @staticmethod
+    def _extract_form4_text(data) -> str:
+        """
+        Text holding only what the Form 4 extraction reads from a byte / mapped submission:
+        the SEC-HEADER (everything before the first <DOCUMENT>) and the first <XML> block,
+        located with `find` so exhibits and other document bodies are never decoded.
+        """
+        document_pos = data.find(b"<DOCUMENT>")
+        text = data[:document_pos if document_pos != -1 else len(data)].decode("utf-8", errors="replace")
+        if document_pos != -1:
+            text += "<DOCUMENT>\n"
+
+        xml_start = data.find(b"<XML>")
+        if xml_start == -1:
+            return text
+        xml_end = data.find(b"</XML>", xml_start)
+        if xml_end == -1:
+            return text + "<XML>\n"  # reported as unclosed by extract_xml_content
+        return text + "<XML>" + data[xml_start + 5:xml_end].decode("utf-8", errors="replace") + "</XML>\n"
+
     def extract_form4_data(self, txt_contents: str) -> Form4FilingData:
         """
         Extract Form 4 specific data from SGML content including issuer, 
@@ -3,13 +3,18 @@
 '''  
 Pure logic for parsing SGML content already in memory. (Utility class) 
 - Raw parser for SGML content
+- index_documents_from_file() memory-maps a stored submission instead, decoding only the
+  SEC-HEADER and each <DOCUMENT>'s tag block (everything before <TEXT>).
+- index_documents() also accepts the raw bytes from SgmlDownloader, or any mmap / memoryview
+  (see utils/sgml_buffer.py); only the header and tag blocks are decoded, never the document bodies.
 '''
 
-from typing import List, Optional
+from typing import List, Optional, Union
 from utils.url_builder import construct_primary_document_url, normalize_cik
 from parsers.base_parser import BaseParser
 from models.dataclasses.filing_document_metadata import FilingDocumentMetadata
 from utils.report_logger import log_debug
+from utils.sgml_buffer import SgmlBuffer, as_searchable, is_sgml_buffer, map_sgml_file
 
 IGNORE_EXTENSIONS = (
     ".js", ".css", ".xlsx", ".zip", ".json",
@@ -33,12 +38,19 @@ class SgmlDocumentIndexer(BaseParser):
         Prefer `parse_to_documents()` for production use.
         """
         entries = txt_contents.split("<DOCUMENT>")
+        return self._parse_entries(entries[1:])
+
+    def _parse_entries(self, entries: List[str]) -> dict:
+        """
+        Builds the primary_doc URL + exhibit dicts from per-<DOCUMENT> blocks.
+        Only the tag lines at the top of each block (TYPE, SEQUENCE, FILENAME, DESCRIPTION) are read.
+        """
         exhibits = []
         
         # Track sequence numbers if available
         seq_map = {}
 
-        for idx, entry in enumerate(entries[1:]):
+        for idx, entry in enumerate(entries):
             filename = self._extract_tag("FILENAME", entry)
             description = self._extract_tag("DESCRIPTION", entry)
             ex_type = self._extract_tag("TYPE", entry)
@@ -175,19 +187,61 @@ class SgmlDocumentIndexer(BaseParser):
         # If no newline either, return the rest of the content
         return block[start_pos:].strip()
 
-    def index_documents(self, txt_contents: str) -> list[FilingDocumentMetadata]:
+    def index_documents(self, txt_contents: Union[str, SgmlBuffer]) -> list[FilingDocumentMetadata]:
         """
         Parses the SGML `.txt` content and returns a list of FilingDocumentMetadata pointers.
         Each represents an embedded document (exhibit, primary, or supporting file).
+        Accepts text, raw bytes or a mapped file (see `_split_index_blocks`).
+        """
+        data = as_searchable(txt_contents) if is_sgml_buffer(txt_contents) else txt_contents
+        header, entries = self._split_index_blocks(data)
+        result = self._parse_entries(entries)
+        # <ISSUER> only from the SEC-HEADER: a document body may quote one
+        issuer_info = self.extract_issuer_info(header)
+        return self._build_documents(result, issuer_info.get("issuer_cik"))
+
+    def index_documents_from_file(self, path: str) -> list[FilingDocumentMetadata]:
+        """
+        Same as `index_documents`, but reads a stored `.txt` submission through a read-only mmap.
+
+        Document bodies (<TEXT> … </TEXT>) are never decoded and only the pages searched are
+        read, so memory use depends on the number of documents, not on the size of the filing.
         """
-        result: dict = self.parse(txt_contents)
+        with map_sgml_file(path) as data:
+            header, entries = self._split_index_blocks(data)
+        result = self._parse_entries(entries)
+        issuer_info = self.extract_issuer_info(header)
+        return self._build_documents(result, issuer_info.get("issuer_cik"))
+
+    @staticmethod
+    def _split_index_blocks(data) -> tuple:
+        """
+        Returns (header_text, [document tag blocks]) from text, bytes or a mapped file: the header
+        is everything before the first <DOCUMENT>, each block the tag lines before its <TEXT>.
+        Only those slices are decoded; document bodies never are.
+        """
+        if isinstance(data, str):
+            marker, text_marker, decode = "<DOCUMENT>", "<TEXT>", lambda chunk: chunk
+        else:
+            marker, text_marker = b"<DOCUMENT>", b"<TEXT>"
+            decode = lambda chunk: chunk.decode("utf-8", errors="replace")
+        pos = data.find(marker)
+        header = decode(data[:pos if pos != -1 else len(data)])
+
+        entries = []
+        while pos != -1:
+            start = pos + len(marker)
+            pos = data.find(marker, start)
+            end = pos if pos != -1 else len(data)
+            text_pos = data.find(text_marker, start, end)
+            entries.append(decode(data[start:text_pos if text_pos != -1 else end]))
+        return header, entries
+
+    def _build_documents(self, result: dict, issuer_cik: Optional[str]) -> list[FilingDocumentMetadata]:
+        """Converts parsed exhibit dicts into FilingDocumentMetadata pointers."""
         primary_doc_url = result.get("primary_document_url")
         exhibits = result.get("exhibits", [])
 
-        # Extract issuer CIK if possible
-        issuer_info = self.extract_issuer_info(txt_contents)
-        issuer_cik = issuer_info.get("issuer_cik")
-
         documents = []
         for ex in exhibits:
             filename = ex.get("filename", "").strip()
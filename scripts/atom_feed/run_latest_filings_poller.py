@@ -0,0 +1,50 @@
+# scripts/atom_feed/run_latest_filings_poller.py
+
+"""
+Run the intraday latest-filings poller.
+
+New accessions in the EDGAR current-filings Atom feed are written to filing_metadata and
+processed through the daily pipeline (documents, SGML, Form 4) within seconds of filing.
+
+Usage:
+    python scripts/atom_feed/run_latest_filings_poller.py
+    python scripts/atom_feed/run_latest_filings_poller.py --interval 5 --include_forms 4
+    python scripts/atom_feed/run_latest_filings_poller.py --feed_file tests/fixtures/latest_filings.atom --max_polls 1
+"""
+
+import argparse, os, sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+from collectors.atom_feed.latest_filings_collector import FileAtomFeedSource
+from orchestrators.atom_feed.latest_filings_poller import LatestFilingsPoller
+from config.config_loader import ConfigLoader
+from utils.report_logger import log_info, log_error
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll the EDGAR latest filings feed")
+    parser.add_argument("--interval", type=float, help="Seconds between polls (default from app_config.yaml)")
+    parser.add_argument("--include_forms", nargs="*", help="Only include specific form types (e.g. 4 8-K)")
+    parser.add_argument("--feed_file", type=str, help="Read the feed from a local Atom file instead of the SEC")
+    parser.add_argument("--max_polls", type=int, help="Stop after this many polls (default: run until interrupted)")
+
+    args = parser.parse_args()
+
+    if not ConfigLoader.load_config().get("ingestion", {}).get("use_rss_feed", False):
+        log_error("[CLI] ingestion.use_rss_feed is disabled in app_config.yaml")
+        sys.exit(1)
+
+    poller = LatestFilingsPoller(
+        source=FileAtomFeedSource(args.feed_file) if args.feed_file else None,
+        poll_interval_seconds=args.interval,
+        include_forms=args.include_forms
+    )
+    try:
+        poller.run(max_polls=args.max_polls)
+        log_info("🎯 Latest filings poller finished.")
+    except Exception as e:
+        log_error(f"[CLI] Latest filings poller failed: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
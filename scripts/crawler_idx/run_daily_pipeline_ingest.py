@@ -8,6 +8,8 @@ Usage:
     python scripts/crawler_idx/run_daily_pipeline_ingest.py --date 2025-05-12 --job-id <uuid>
     python scripts/crawler_idx/run_daily_pipeline_ingest.py --retry-failed --job-id <uuid>
     python scripts/crawler_idx/run_daily_pipeline_ingest.py --accessions 0001234567-25-000001 0001234567-25-000002
+    python scripts/crawler_idx/run_daily_pipeline_ingest.py --date 2025-05-12 --limit 50 --record cassettes/2025-05-12
+    python scripts/crawler_idx/run_daily_pipeline_ingest.py --date 2025-05-12 --limit 50 --replay cassettes/2025-05-12
 """
 
 import argparse
@@ -18,6 +20,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
 
 from orchestrators.crawler_idx.daily_ingestion_pipeline import DailyIngestionPipeline
+from downloaders.cassette import CASSETTE_ENV_VAR
 from utils.report_logger import log_info, log_error
 from utils.filing_calendar import is_valid_filing_day
 from utils.form_type_validator import FormTypeValidator
@@ -47,6 +50,11 @@ def main():
     
     # Pipeline options
     parser.add_argument("--no-cache", action="store_true", help="Disable SGML cache usage")
+
+    # HTTP cassette: capture a live run once, then replay it without touching the SEC
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="CASSETTE_DIR", help="Record every SEC response to this directory")
+    cassette_group.add_argument("--replay", metavar="CASSETTE_DIR", help="Serve every SEC request from a recorded cassette")
     
     args = parser.parse_args()
     
@@ -77,6 +85,15 @@ def main():
         job_progress = get_job_progress(args.job_id)
         log_info(f"[CLI] Job {args.job_id} status: {job_progress['completed']}/{job_progress['total']} completed, {job_progress['failed']} failed")
     
+    # Picked up by every HttpTransport the pipeline creates
+    if args.record:
+        os.environ[CASSETTE_ENV_VAR] = f"record:{args.record}"
+    elif args.replay:
+        if not os.path.isdir(args.replay):
+            log_error(f"[CLI] Cassette not found: {args.replay}")
+            sys.exit(1)
+        os.environ[CASSETTE_ENV_VAR] = f"replay:{args.replay}"
+    
     try:
         log_info(f"[CLI] 🔁 Launching DailyIngestionPipeline (date={args.date}, limit={args.limit}, job_id={args.job_id})")
         pipeline = DailyIngestionPipeline(use_cache=not args.no_cache)
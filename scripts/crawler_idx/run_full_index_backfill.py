@@ -0,0 +1,42 @@
+# scripts/crawler_idx/run_full_index_backfill.py
+
+"""
+Backfill filing_metadata from the SEC's quarterly full-index files.
+
+Usage:
+    python scripts/crawler_idx/run_full_index_backfill.py --start_year 2015 --end_year 2024
+    python scripts/crawler_idx/run_full_index_backfill.py --start_year 2024 --end_year 2024 --quarters 1 2 --include_forms 4 10-K
+"""
+
+import argparse, sys
+from orchestrators.crawler_idx.full_index_orchestrator import FullIndexOrchestrator
+from utils.report_logger import log_info, log_error
+
+def main():
+    parser = argparse.ArgumentParser(description="Run quarterly full-index backfill")
+    parser.add_argument("--start_year", type=int, required=True, help="First year to load")
+    parser.add_argument("--end_year", type=int, required=True, help="Last year to load (inclusive)")
+    parser.add_argument("--quarters", nargs="*", type=int, default=[1, 2, 3, 4], help="Quarters to load (default: all)")
+    parser.add_argument("--include_forms", nargs="*", help="Only include specific form types (e.g. 10-K 8-K)")
+    parser.add_argument("--index_type", choices=["master", "crawler"], default="master", help="Which full-index file to read")
+    parser.add_argument("--refresh", action="store_true", help="Re-download index files already on disk")
+    parser.add_argument("--batch_size", type=int, default=5000, help="Rows per INSERT statement")
+
+    args = parser.parse_args()
+
+    quarters = [(year, q) for year in range(args.start_year, args.end_year + 1) for q in args.quarters]
+    orchestrator = FullIndexOrchestrator(batch_size=args.batch_size)
+    try:
+        results = orchestrator.run(
+            quarters,
+            include_forms=args.include_forms,
+            index_type=args.index_type,
+            refresh=args.refresh
+        )
+        log_info(f"🎯 Backfill complete. {sum(results.values())} rows inserted across {len(results)} quarters.")
+    except Exception as e:
+        log_error(f"[CLI] Full-index backfill failed: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
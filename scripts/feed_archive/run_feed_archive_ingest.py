@@ -0,0 +1,55 @@
+# scripts/feed_archive/run_feed_archive_ingest.py
+
+"""
+Backfill from locally downloaded EDGAR daily feed archives (Feed/YYYY/QTRn/YYYYMMDD.nc.tar.gz).
+
+Every submission in each archive is written to filing_metadata, filing_documents and
+(for Form 4) the form4 tables, with no per-filing requests to the SEC.
+
+Usage:
+    python scripts/feed_archive/run_feed_archive_ingest.py --archives /data/feed/2024/QTR1/20240102.nc.tar.gz
+    python scripts/feed_archive/run_feed_archive_ingest.py --dir /data/feed/2024 --include_forms 4 10-K
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+from orchestrators.feed_archive.feed_archive_orchestrator import FeedArchiveOrchestrator
+from utils.report_logger import log_info, log_error
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill from EDGAR daily feed archives")
+    input_group = parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument("--archives", nargs="+", help="Feed archive files to ingest")
+    input_group.add_argument("--dir", type=str, help="Directory searched recursively for *.nc.tar.gz archives")
+    parser.add_argument("--include_forms", nargs="*", help="Only include specific form types (e.g. 4 10-K)")
+    parser.add_argument("--limit", type=int, help="Limit submissions per archive (for testing)")
+    parser.add_argument("--batch_mb", type=float, default=64, help="Megabytes of SGML held per write batch")
+
+    args = parser.parse_args()
+
+    archives = args.archives or sorted(glob.glob(os.path.join(args.dir, "**", "*.nc.tar.gz"), recursive=True))
+    if not archives:
+        log_error("[CLI] No feed archives found")
+        sys.exit(1)
+
+    orchestrator = FeedArchiveOrchestrator(max_batch_bytes=int(args.batch_mb * 1024 * 1024))
+    failed_archives = []
+    for archive_path in archives:
+        try:
+            results = orchestrator.run(archive_path, include_forms=args.include_forms, limit=args.limit)
+            log_info(f"[CLI] {os.path.basename(archive_path)}: {results['submissions']} submissions, {results['failed']} failed")
+        except Exception as e:
+            log_error(f"[CLI] Feed archive ingest failed for {archive_path}: {e}")
+            failed_archives.append(archive_path)
+
+    log_info(f"🎯 Feed backfill complete. {len(archives) - len(failed_archives)}/{len(archives)} archives ingested.")
+    if failed_archives:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# scripts/shared_cache/run_shared_cache_server.py
+
+"""
+Run the cluster-wide SGML content cache service.
+
+Ingestion hosts point `sec_downloader.shared_cache` at it (backend: "http", url: http://<host>:8770)
+so each submission is downloaded from the SEC once per cluster. It listens on 127.0.0.1 by default;
+pass --host (e.g. the cluster-internal interface) to serve other hosts, behind a firewall.
+
+Usage:
+    python scripts/shared_cache/run_shared_cache_server.py --root /srv/edgar_shared_cache
+    python scripts/shared_cache/run_shared_cache_server.py --root /srv/edgar_shared_cache --host 10.0.0.5 --port 8770
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+from downloaders.shared_content_cache import make_shared_cache_server
+from utils.report_logger import log_info
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the shared SGML content cache over HTTP")
+    parser.add_argument("--root", required=True, help="Directory holding cached submissions")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind (default: loopback only)")
+    parser.add_argument("--port", type=int, default=8770)
+
+    args = parser.parse_args()
+
+    server = make_shared_cache_server(args.root, host=args.host, port=args.port)
+    log_info(f"[SHARED-CACHE] Serving {args.root} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log_info("[SHARED-CACHE] Server stopped")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+# scripts/tools/rebuild_artifact_index.py
+
+"""
+Register every file already stored under raw/ in the artifact index (raw/artifact_index.sqlite3).
+
+Files written by the pipelines are indexed as they are written; run this once for a raw/ tree
+written before the index existed (or by an older version that did not hash files). Every file
+is hashed, so it can take a while on a large tree.
+
+Usage:
+    python scripts/tools/rebuild_artifact_index.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+from utils.artifact_locator import get_shared_artifact_index
+from utils.report_logger import log_info, log_error
+
+def main():
+    index = get_shared_artifact_index()
+    try:
+        registered = index.rebuild()
+        log_info(f"🎯 Artifact index rebuilt: {registered} files registered in {index.db_path}")
+    except Exception as e:
+        log_error(f"[CLI] Artifact index rebuild failed: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
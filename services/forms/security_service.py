@@ -7,6 +7,7 @@ from models.orm_models.forms.security_orm import Security
 from models.orm_models.forms.derivative_security_orm import DerivativeSecurity
 from models.dataclasses.forms.security_data import SecurityData
 from models.dataclasses.forms.derivative_security_data import DerivativeSecurityData
+from writers.shared.identity_cache import IdentityCache, get_shared_identity_cache
 from models.adapters.security_adapter import (
     convert_security_data_to_orm,
     convert_security_orm_to_data,
@@ -17,11 +18,20 @@ from models.adapters.security_adapter import (
 class SecurityService:
     """Service for managing securities"""
     
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, identity_cache: IdentityCache = None):
         self.db_session = db_session
+        # Shared (title, issuer) → id map; needs a real Session, whose commit publishes new securities
+        if identity_cache is None and isinstance(db_session, Session):
+            identity_cache = get_shared_identity_cache()
+        self.identity_cache = identity_cache
     
     def get_or_create_security(self, security_data: SecurityData) -> str:
         """Get existing security or create a new one, return the ID"""
+        if self.identity_cache:
+            cached_id = self.identity_cache.get_security(security_data.title, security_data.issuer_entity_id)
+            if cached_id:
+                return cached_id
+
         # Check if security exists
         security = self.db_session.query(Security).filter(
             Security.title == security_data.title,
@@ -29,12 +39,17 @@ class SecurityService:
         ).first()
         
         if security:
+            if self.identity_cache:
+                self.identity_cache.put_security(security.title, security.issuer_entity_id, security.id)
             return str(security.id)
         
         # Create new security
         new_security = convert_security_data_to_orm(security_data)
         self.db_session.add(new_security)
         self.db_session.flush()  # Generate ID without committing
+        if self.identity_cache:
+            self.identity_cache.put_security(new_security.title, new_security.issuer_entity_id, new_security.id,
+                                             session=self.db_session)
         
         return str(new_security.id)
     
@@ -0,0 +1,59 @@
+# tests/atom_feed/test_latest_filings_collector.py
+
+import os, sys
+from datetime import date
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+from collectors.atom_feed.latest_filings_collector import (
+    FileAtomFeedSource, HttpAtomFeedSource, LatestFilingsCollector
+)
+from downloaders.retry_policy import CircuitBreaker
+from downloaders.sec_downloader import SECDownloader
+from downloaders.validator_store import ValidatorStore
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "fixtures", "latest_filings.atom")
+
+
+def test_parse_feed_prefers_issuer_entry():
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        records = LatestFilingsCollector.parse_feed(f.read())
+
+    assert [(r.accession_number, r.form_type, r.cik) for r in records] == [
+        ("0000921895-25-001190", "4", "1084869"),
+        ("0000320193-25-000055", "8-K", "320193"),
+    ]
+    assert records[0].filing_date == date(2025, 5, 12)
+    assert records[0].filing_url == "https://www.sec.gov/Archives/edgar/data/1084869/0000921895-25-001190-index.htm"
+
+
+def test_file_source_reports_unchanged_feed_once_committed():
+    collector = LatestFilingsCollector(FileAtomFeedSource(FIXTURE_PATH))
+    assert [r.form_type for r in collector.collect(include_forms=["4"])] == ["4"]
+    assert collector.collect() is not None  # not committed: the failed poll is retried
+    collector.commit()
+    assert collector.collect() is None
+
+
+def test_http_source_uses_conditional_requests():
+    with open(FIXTURE_PATH, encoding="utf-8") as f:
+        feed_xml = f.read()
+    transport = MagicMock()
+    transport.is_live = False  # not throttled
+    transport.get.side_effect = [
+        MagicMock(status_code=200, text=feed_xml, headers={"Last-Modified": "Mon, 12 May 2025 14:05:30 GMT"}),
+        MagicMock(status_code=304, headers={}),
+    ]
+    downloader = SECDownloader(user_agent="test-agent", transport=transport, circuit_breaker=CircuitBreaker(),
+                               validator_store=ValidatorStore())
+    source = HttpAtomFeedSource(user_agent="test-agent", url="http://127.0.0.1:8080/feed", downloader=downloader)
+
+    assert source.fetch() == feed_xml
+    assert downloader.validator_store.conditional_headers("http://127.0.0.1:8080/feed") == {}
+    source.commit()  # entries processed
+    assert downloader.validator_store.conditional_headers("http://127.0.0.1:8080/feed") == {
+        "If-Modified-Since": "Mon, 12 May 2025 14:05:30 GMT"
+    }
+    assert LatestFilingsCollector(source).collect() is None
+    assert transport.get.call_args.kwargs["headers"]["If-Modified-Since"] == "Mon, 12 May 2025 14:05:30 GMT"
@@ -0,0 +1,34 @@
+# tests/atom_feed/test_latest_filings_poller.py
+
+import os, sys
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+from collectors.atom_feed.latest_filings_collector import FileAtomFeedSource
+from orchestrators.atom_feed.latest_filings_poller import LatestFilingsPoller
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "fixtures", "latest_filings.atom")
+
+
+def make_poller(monkeypatch, failed):
+    pipeline = MagicMock()
+    poller = LatestFilingsPoller(source=FileAtomFeedSource(FIXTURE_PATH), pipeline=pipeline, include_forms=[])
+    poller.writer = MagicMock()
+    poller.writer.upsert_many.side_effect = [failed, []]
+    monkeypatch.setattr(poller, "_known_accessions", lambda accessions: set())
+    monkeypatch.setattr(poller, "_job_for", lambda target_date: "job-1")
+    return poller, pipeline
+
+
+def test_accessions_that_fail_to_write_are_retried_next_poll(monkeypatch):
+    poller, pipeline = make_poller(monkeypatch, failed=["0000320193-25-000055"])
+
+    assert poller.orchestrate() == ["0000921895-25-001190"]
+    pipeline.run.assert_called_once()
+    assert pipeline.run.call_args.kwargs["process_only"] == ["0000921895-25-001190"]
+
+    # The feed was not committed, so the failed accession comes back and only it is written
+    assert poller.orchestrate() == ["0000320193-25-000055"]
+    assert [r.accession_number for r in poller.writer.upsert_many.call_args.args[0]] == ["0000320193-25-000055"]
+    assert poller.orchestrate() == []  # committed now: the feed is unchanged
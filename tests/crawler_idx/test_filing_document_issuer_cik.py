@@ -114,6 +114,7 @@ def test_filing_documents_collector_handles_issuer_cik(mock_extract_issuer, mock
     
     # Mock downloader
     mock_downloader = MagicMock()
+    mock_downloader.read_ahead.side_effect = lambda items, target, **kwargs: iter(items)
     mock_downloader_cls.return_value = mock_downloader
     
     # Mock SGML document
@@ -323,6 +324,7 @@ def test_sgml_disk_collector_handles_issuer_cik(mock_extract_issuer, mock_path_e
     
     # Mock downloader and SGML document
     mock_downloader = MagicMock()
+    mock_downloader.read_ahead.side_effect = lambda items, target, **kwargs: iter(items)
     mock_downloader_cls.return_value = mock_downloader
     
     mock_sgml_doc = SgmlTextDocument(
@@ -421,6 +423,7 @@ def test_sgml_disk_collector_falls_back_to_record_cik(mock_extract_issuer, mock_
     
     # Mock downloader and SGML document
     mock_downloader = MagicMock()
+    mock_downloader.read_ahead.side_effect = lambda items, target, **kwargs: iter(items)
     mock_downloader_cls.return_value = mock_downloader
     
     mock_sgml_doc = SgmlTextDocument(
@@ -105,6 +105,24 @@ class TestFilingMetadataOrchestrator(unittest.TestCase):
         # Verify writer was called with limited records
         mock_writer_instance.upsert_many.assert_called_with([test_records[0]])
 
+    @patch('orchestrators.crawler_idx.filing_metadata_orchestrator.FilingMetadataCollector')
+    @patch('orchestrators.crawler_idx.filing_metadata_orchestrator.FilingMetadataWriter')
+    def test_validators_are_committed_only_when_every_record_is_written(self, mock_writer, mock_collector):
+        """A partly failed write must not record crawler.idx validators, or the failed rows are never re-fetched"""
+        mock_collector_instance = mock_collector.return_value
+        mock_collector_instance.collect.return_value = [
+            FilingMetadata(accession_number='0001234567-25-000001', cik='1234567', form_type='10-K', filing_date=date(2025, 5, 12))
+        ]
+        mock_writer_instance = mock_writer.return_value
+
+        mock_writer_instance.upsert_many.return_value = ['0001234567-25-000001']
+        FilingMetadataOrchestrator().run(date_str='2025-05-12', include_forms=['10-K'])
+        mock_collector_instance.commit_validators.assert_not_called()
+
+        mock_writer_instance.upsert_many.return_value = []
+        FilingMetadataOrchestrator().run(date_str='2025-05-12', include_forms=['10-K'])
+        mock_collector_instance.commit_validators.assert_called_once()
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -39,7 +39,7 @@ def test_upsert_many_inserts_and_updates(test_db):
     )
 
     # First insert
-    writer.upsert_many([record])
+    assert writer.upsert_many([record]) == []
 
     # Update with new URL
     record.filing_url = "https://example.com/10-K-updated"
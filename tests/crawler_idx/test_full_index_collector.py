@@ -0,0 +1,69 @@
+# tests/crawler_idx/test_full_index_collector.py
+
+''' Verifies streaming parse of quarterly full-index files (master.gz / crawler.idx) '''
+
+import gzip
+import os, sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+import pytest
+from datetime import date
+from pathlib import Path
+
+from collectors.crawler_idx.full_index_collector import FullIndexCollector
+from parsers.idx.idx_parser import CrawlerIdxParser
+
+MASTER_IDX = """Description:           Master Index of EDGAR Dissemination Feed
+Last Data Received:    March 31, 2025
+Comments:              webmaster@sec.gov
+
+CIK|Company Name|Form Type|Date Filed|Filename
+--------------------------------------------------------------------------------
+320193|Apple Inc.|10-K|2025-01-31|edgar/data/320193/0000320193-25-000008.txt
+1084869|FLUSHING FINANCIAL CORP|4|2025-03-03|edgar/data/1084869/0000921895-25-001190.txt
+1580144|Pleasant Lake Partners LLC|4|2025-03-03|edgar/data/1580144/0000921895-25-001190.txt
+1067983|BERKSHIRE HATHAWAY INC|SC 13G|2025-02-14|edgar/data/1067983/0001193125-25-030001.txt
+"""
+
+
+@pytest.fixture
+def master_gz(tmp_path):
+    path = tmp_path / "master.gz"
+    with gzip.open(path, "wt", encoding="latin-1") as f:
+        f.write(MASTER_IDX)
+    return str(path)
+
+
+def test_iter_parse_master_lines():
+    records = list(CrawlerIdxParser.iter_parse_master_lines(MASTER_IDX.splitlines()))
+    assert len(records) == 4
+    assert records[0].accession_number == "0000320193-25-000008"
+    assert records[0].filing_date == date(2025, 1, 31)
+    assert records[0].filing_url == "https://www.sec.gov/Archives/edgar/data/320193/0000320193-25-000008-index.htm"
+    # Pipe-delimited, so form types with spaces survive intact
+    assert records[3].form_type == "SC 13G"
+
+
+def test_iter_parse_lines_matches_parse_lines():
+    lines = Path("tests/fixtures/crawler_sample.idx").read_text(encoding="utf-8").splitlines()
+    assert list(CrawlerIdxParser.iter_parse_lines(iter(lines))) == CrawlerIdxParser.parse_lines(lines)
+
+
+def test_collector_streams_local_gz_and_dedupes_accessions(master_gz):
+    collector = FullIndexCollector(user_agent="test-agent", downloader=object())
+    records = collector.collect(2025, 1, local_path=master_gz)
+
+    assert [r.accession_number for r in records] == [
+        "0000320193-25-000008", "0000921895-25-001190", "0001193125-25-030001"
+    ]
+    assert records[1].cik == "1084869"  # first filer row kept for multi-CIK accessions
+
+    forms = collector.collect(2025, 1, include_forms=["10-K"], local_path=master_gz)
+    assert [r.form_type for r in forms] == ["10-K"]
+
+
+def test_collector_rejects_bad_quarter(master_gz):
+    collector = FullIndexCollector(user_agent="test-agent", downloader=object())
+    with pytest.raises(ValueError):
+        collector.collect(2025, 5, local_path=master_gz)
@@ -121,11 +121,11 @@ def test_pipeline_skips_holiday_or_weekend():
 def test_pipeline_avoids_redundant_sgml_download(monkeypatch):
     call_counter = {"count": 0}
 
-    def mocked_download_html(self, url):
+    def mocked_download_bytes(self, url):
         call_counter["count"] += 1
-        return "test SGML content"
+        return b"test SGML content"
 
-    monkeypatch.setattr(SgmlDownloader, "download_html", mocked_download_html)
+    monkeypatch.setattr(SgmlDownloader, "download_bytes", mocked_download_bytes)
 
     pipeline = DailyIngestionPipeline(use_cache=True)
     pipeline.run(target_date="2025-05-12", limit=1)
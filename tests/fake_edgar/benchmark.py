@@ -0,0 +1,88 @@
+# tests/fake_edgar/benchmark.py
+
+'''
+Offline throughput benchmark: crawler.idx + one day of SGML downloads against FakeEdgarServer.
+
+Usage:
+    python -m tests.fake_edgar.benchmark --filings 500 --latency 0.05 --workers 1 4 8
+    python -m tests.fake_edgar.benchmark --filings 200 --throttle_rate 0.05 --bandwidth_kbps 1024
+'''
+
+import argparse
+import time
+
+from tests.fake_edgar.server import FakeEdgarServer
+from collectors.crawler_idx.filing_metadata_collector import FilingMetadataCollector
+from downloaders.http_transport import HttpTransport
+from downloaders.rate_limiter import TokenBucketRateLimiter
+from downloaders.retry_policy import CircuitBreaker
+from downloaders.sgml_downloader import SgmlDownloader
+
+USER_AGENT = "FakeEdgarBenchmark/1.0 (benchmark@example.com)"
+
+
+def run_once(server: FakeEdgarServer, date_str: str, workers: int, requests_per_second: float) -> dict:
+    transport = HttpTransport(user_agent=USER_AGENT, pool_size=max(workers, 1), base_url=server.base_url)
+    # A private breaker: throttles injected by the fake server must not pause (or persist to)
+    # the host-wide state that real downloaders share
+    breaker = CircuitBreaker()
+    started = time.perf_counter()
+
+    collector = FilingMetadataCollector(user_agent=USER_AGENT, transport=transport)
+    collector.downloader.circuit_breaker = breaker
+    records = collector.collect(date_str)
+    downloader = SgmlDownloader(
+        user_agent=USER_AGENT,
+        use_cache=False,
+        max_workers=workers,
+        transport=transport,
+        rate_limiter=TokenBucketRateLimiter(requests_per_second),
+        circuit_breaker=breaker
+    )
+    failed = 0
+    for _, _, error in downloader.download_many(
+        [(r.cik, r.accession_number, str(r.filing_date.year)) for r in records]
+    ):
+        failed += error is not None
+
+    elapsed = time.perf_counter() - started
+    metrics = transport.metrics()
+    transport.close()
+    return {
+        "workers": workers,
+        "filings": len(records),
+        "failed": failed,
+        "seconds": round(elapsed, 2),
+        "filings_per_second": round(len(records) / elapsed, 1) if elapsed else 0.0,
+        "connections": metrics["connections_opened"],
+        "statuses": metrics["status_counts"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark downloaders against a fake EDGAR server")
+    parser.add_argument("--date", default="2025-05-12")
+    parser.add_argument("--filings", type=int, default=200, help="Filings in the generated crawler.idx")
+    parser.add_argument("--submission_size", type=int, default=50_000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--bandwidth_kbps", type=int)
+    parser.add_argument("--throttle_rate", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--requests_per_second", type=float, default=1000, help="Client-side rate cap")
+    args = parser.parse_args()
+
+    for workers in args.workers:
+        # Fresh server per run so stats and throttling are not shared between runs
+        with FakeEdgarServer(
+            fixture_dir=None, latency=args.latency, filings_per_day=args.filings,
+            submission_size=args.submission_size, throttle_rate=args.throttle_rate, retry_after=0,
+            bandwidth_bytes_per_sec=args.bandwidth_kbps * 1024 if args.bandwidth_kbps else None
+        ) as server:
+            result = run_once(server, args.date, workers, args.requests_per_second)
+            result["server_max_concurrency"] = server.stats["max_concurrency"]
+            result["server_throttled"] = server.stats["throttled"]
+            print(result)
+
+
+if __name__ == "__main__":
+    main()
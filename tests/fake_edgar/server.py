@@ -0,0 +1,353 @@
+# tests/fake_edgar/server.py
+
+'''
+# Role: Local stand-in for www.sec.gov / data.sec.gov for offline throughput benchmarks
+- Serves crawler.idx, submission .txt files, index.json, submissions JSON and the latest-filings feed.
+- Files found in the fixture directory are served as-is; anything else is generated on demand.
+- Latency, bandwidth and 429 injection are configurable, so concurrency / caching / retry changes can be measured.
+- Point the pipelines at it with EDGAR_BASE_URL=<server.base_url> (see downloaders/http_transport.py).
+
+Usage:
+    python -m tests.fake_edgar.server --port 8765 --latency 0.05 --bandwidth_kbps 2048 --throttle_rate 0.02
+    EDGAR_BASE_URL=http://127.0.0.1:8765 python scripts/crawler_idx/run_daily_pipeline_ingest.py --date 2025-05-12
+'''
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+
+DEFAULT_FIXTURE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "fixtures"))
+
+_CRAWLER_IDX_RE = re.compile(r"^/Archives/edgar/daily-index/(\d{4})/QTR(\d)/crawler\.(\d{8})\.idx$")
+_SGML_TXT_RE = re.compile(r"^/Archives/edgar/data/(\d+)/(\d{18})/(\d{10}-\d{2}-\d{6})\.txt$")
+_INDEX_JSON_RE = re.compile(r"^/Archives/edgar/data/(\d+)/(\d{18})/index\.json$")
+_SUBMISSIONS_RE = re.compile(r"^/submissions/CIK(\d{10})\.json$")
+_LATEST_FEED_PATH = "/cgi-bin/browse-edgar"
+
+SYNTHETIC_FORMS = ("4", "8-K", "10-Q", "4", "10-K", "S-1", "4", "13G")
+
+# Synthetic accession sequences are day_of_year * MAX_FILINGS_PER_DAY + index, zero-padded to six
+# digits, so a submission's filing date can be recovered from its accession alone
+MAX_FILINGS_PER_DAY = 1000
+
+
+class FakeEdgarServer:
+    """
+    Threaded fake EDGAR server.
+
+    Parameters:
+        fixture_dir: Directory searched for real files (by accession / file name) before generating one.
+        latency: Seconds added before every response.
+        bandwidth_bytes_per_sec: Throttles response bodies (None = unlimited).
+        throttle_rate: Fraction of requests answered with 429 + Retry-After.
+        retry_after: Value of the Retry-After header on injected 429s.
+        filings_per_day: Size of generated crawler.idx files (at most MAX_FILINGS_PER_DAY).
+        submission_size: Approximate size in bytes of generated .txt submissions.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, fixture_dir: str = DEFAULT_FIXTURE_DIR,
+                 latency: float = 0.0, bandwidth_bytes_per_sec: Optional[int] = None,
+                 throttle_rate: float = 0.0, retry_after: int = 1, filings_per_day: int = 100,
+                 submission_size: int = 50_000, seed: int = 0):
+        if not 0 < filings_per_day <= MAX_FILINGS_PER_DAY:
+            raise ValueError(f"filings_per_day must be between 1 and {MAX_FILINGS_PER_DAY}")
+        self.fixture_dir = fixture_dir
+        self.latency = latency
+        self.bandwidth_bytes_per_sec = bandwidth_bytes_per_sec
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.filings_per_day = filings_per_day
+        self.submission_size = submission_size
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self._in_flight = 0
+
+        handler = type("FakeEdgarHandler", (_FakeEdgarHandler,), {"server_state": self})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeEdgarServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    # --- bookkeeping -------------------------------------------------------
+
+    def _record(self, key: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _enter(self):
+        with self._stats_lock:
+            self._in_flight += 1
+            self.stats["max_concurrency"] = max(self.stats["max_concurrency"], self._in_flight)
+
+    def _exit(self):
+        with self._stats_lock:
+            self._in_flight -= 1
+
+    def _should_throttle(self) -> bool:
+        if self.throttle_rate <= 0:
+            return False
+        with self._random_lock:
+            return self._random.random() < self.throttle_rate
+
+    # --- content -----------------------------------------------------------
+
+    def resolve(self, path: str) -> Optional[Tuple[bytes, str, str]]:
+        """Returns (body, content_type, kind) for a request path, or None for 404."""
+        match = _CRAWLER_IDX_RE.match(path)
+        if match:
+            date_compact = match.group(3)
+            body = self._fixture(f"crawler.{date_compact}.idx") or self.synthetic_crawler_idx(date_compact)
+            return body, "text/plain", "crawler_idx"
+
+        match = _SGML_TXT_RE.match(path)
+        if match:
+            cik, _, accession = match.groups()
+            body = self._fixture(f"{accession}.txt") or self.synthetic_submission(cik, accession)
+            return body, "text/plain", "sgml"
+
+        match = _INDEX_JSON_RE.match(path)
+        if match:
+            cik, accession_clean = match.groups()
+            return self.synthetic_index_json(cik, accession_clean), "application/json", "index_json"
+
+        match = _SUBMISSIONS_RE.match(path)
+        if match:
+            cik = match.group(1)
+            body = self._fixture(f"CIK{cik}.json") or self.synthetic_submissions_json(cik)
+            return body, "application/json", "submissions_json"
+
+        if path == _LATEST_FEED_PATH:
+            body = self._fixture("latest_filings.atom")
+            return (body, "application/atom+xml", "atom_feed") if body else None
+
+        return None
+
+    def _fixture(self, filename: str) -> Optional[bytes]:
+        if not self.fixture_dir:
+            return None
+        path = os.path.join(self.fixture_dir, filename)
+        if not os.path.isfile(path):
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+
+    def synthetic_accessions(self, date_compact: str):
+        """Deterministic (cik, accession, form_type) triples for a given day."""
+        day_seq = int(date_compact) % 100000
+        year_short = date_compact[2:4]
+        day_of_year = datetime.strptime(date_compact, "%Y%m%d").timetuple().tm_yday
+        for i in range(self.filings_per_day):
+            cik = str(1000000 + (day_seq * 7 + i * 13) % 900000)
+            accession = f"{int(cik):010d}-{year_short}-{day_of_year * MAX_FILINGS_PER_DAY + i:06d}"
+            yield cik, accession, SYNTHETIC_FORMS[i % len(SYNTHETIC_FORMS)]
+
+    @staticmethod
+    def synthetic_filing_date(accession: str) -> str:
+        """
+        YYYYMMDD of the day a synthetic accession was listed on (see `synthetic_accessions`).
+        Accessions outside that scheme get January 1 of their year, so output stays deterministic.
+        """
+        year = 2000 + int(accession[11:13])
+        day_of_year = int(accession[14:]) // MAX_FILINGS_PER_DAY
+        filed = date(year, 1, 1)
+        if 1 <= day_of_year <= (date(year, 12, 31) - filed).days + 1:
+            filed += timedelta(days=day_of_year - 1)
+        return filed.strftime("%Y%m%d")
+
+    def synthetic_crawler_idx(self, date_compact: str) -> bytes:
+        lines = [
+            "Description:           Daily Crawler Index of EDGAR Dissemination Feed by Company Name",
+            "",
+            f"{'Company Name':<62}{'Form Type':<12}{'CIK':<12}{'Date Filed':<12}URL",
+            "-" * 140,
+        ]
+        for cik, accession, form_type in self.synthetic_accessions(date_compact):
+            url = f"https://www.sec.gov/Archives/edgar/data/{cik}/{accession}-index.htm"
+            lines.append(f"{'SYNTHETIC CO ' + cik:<62}{form_type:<12}{cik:<12}{date_compact:<12}{url}")
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    def synthetic_submission(self, cik: str, accession: str) -> bytes:
+        filed = self.synthetic_filing_date(accession)
+        header = (
+            f"<SEC-DOCUMENT>{accession}.txt : {filed}\n"
+            f"<SEC-HEADER>{accession}.hdr.sgml : {filed}\n"
+            f"ACCESSION NUMBER:\t\t{accession}\n"
+            f"CONFORMED SUBMISSION TYPE:\t8-K\n"
+            f"PUBLIC DOCUMENT COUNT:\t\t2\n"
+            f"FILED AS OF DATE:\t\t{filed}\n\n"
+            f"FILER:\n\n\tCOMPANY DATA:\n\t\tCOMPANY CONFORMED NAME:\t\t\tSYNTHETIC CO {int(cik)}\n"
+            f"\t\tCENTRAL INDEX KEY:\t\t\t{int(cik):010d}\n"
+            f"</SEC-HEADER>\n"
+        )
+        # Repeatable filler so generated bodies are stable across runs (and compress like real HTML)
+        filler_line = f"<p>Synthetic filing body for {accession}.</p>\n"
+        filler = filler_line * max(1, self.submission_size // len(filler_line))
+        documents = (
+            f"<DOCUMENT>\n<TYPE>8-K\n<SEQUENCE>1\n<FILENAME>primary.htm\n<DESCRIPTION>8-K\n<TEXT>\n"
+            f"<html><body>\n{filler}</body></html>\n</TEXT>\n</DOCUMENT>\n"
+            f"<DOCUMENT>\n<TYPE>EX-99.1\n<SEQUENCE>2\n<FILENAME>ex991.htm\n<DESCRIPTION>PRESS RELEASE\n<TEXT>\n"
+            f"<html><body>Exhibit</body></html>\n</TEXT>\n</DOCUMENT>\n"
+            f"</SEC-DOCUMENT>\n"
+        )
+        return (header + documents).encode("utf-8")
+
+    def synthetic_index_json(self, cik: str, accession_clean: str) -> bytes:
+        accession = f"{accession_clean[:10]}-{accession_clean[10:12]}-{accession_clean[12:]}"
+        listing = {
+            "directory": {
+                "name": f"/Archives/edgar/data/{cik}/{accession_clean}",
+                "item": [
+                    {"name": f"{accession}.txt", "type": "text.gif", "size": str(self.submission_size)},
+                    {"name": "primary.htm", "type": "text.gif", "size": str(self.submission_size)},
+                    {"name": "ex991.htm", "type": "text.gif", "size": "64"},
+                ],
+            }
+        }
+        return json.dumps(listing).encode("utf-8")
+
+    def synthetic_submissions_json(self, cik: str) -> bytes:
+        recent = {"accessionNumber": [], "primaryDocument": [], "filingDate": [], "form": [], "items": [], "isXBRL": []}
+        for i in range(10):
+            recent["accessionNumber"].append(f"{cik}-25-{i:06d}")
+            recent["primaryDocument"].append("primary.htm")
+            recent["filingDate"].append(f"2025-05-{(i % 28) + 1:02d}")
+            recent["form"].append(SYNTHETIC_FORMS[i % len(SYNTHETIC_FORMS)])
+            recent["items"].append("")
+            recent["isXBRL"].append(0)
+        return json.dumps({"cik": str(int(cik)), "name": f"SYNTHETIC CO {int(cik)}", "filings": {"recent": recent}}).encode("utf-8")
+
+
+class _FakeEdgarHandler(BaseHTTPRequestHandler):
+    server_state: FakeEdgarServer = None
+    protocol_version = "HTTP/1.1"  # keep-alive, like sec.gov
+
+    def do_GET(self):
+        state = self.server_state
+        state._enter()
+        try:
+            self._handle(state)
+        finally:
+            state._exit()
+
+    def _handle(self, state: FakeEdgarServer):
+        state._record("requests")
+        if state.latency:
+            time.sleep(state.latency)
+
+        if state._should_throttle():
+            state._record("throttled")
+            self._send(429, b"Request Rate Threshold Exceeded", "text/plain", {"Retry-After": str(state.retry_after)})
+            return
+
+        resolved = state.resolve(self.path.split("?", 1)[0])
+        if resolved is None:
+            state._record("not_found")
+            self._send(404, b"Not Found", "text/plain")
+            return
+
+        body, content_type, kind = resolved
+        state._record(kind)
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            state._record("not_modified")
+            self._send(304, b"", content_type, {"ETag": etag})
+            return
+
+        status, extra = 200, {"ETag": etag}
+        range_match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if range_match:
+            start = int(range_match.group(1))
+            end = int(range_match.group(2)) if range_match.group(2) else len(body) - 1
+            end = min(end, len(body) - 1)
+            extra["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            body, status = body[start:end + 1], 206
+            state._record("range")
+
+        self._send(status, body, content_type, extra)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        bandwidth = self.server_state.bandwidth_bytes_per_sec
+        if not bandwidth:
+            self.wfile.write(body)
+        else:
+            chunk_size = max(1024, bandwidth // 20)
+            for offset in range(0, len(body), chunk_size):
+                chunk = body[offset:offset + chunk_size]
+                self.wfile.write(chunk)
+                time.sleep(len(chunk) / bandwidth)
+        self.server_state._record("bytes_sent", len(body))
+
+    def log_message(self, format, *args):
+        # Benchmarks issue thousands of requests; keep stderr quiet
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fake EDGAR server for offline benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixture_dir", default=DEFAULT_FIXTURE_DIR)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--bandwidth_kbps", type=int, help="Per-connection bandwidth cap in KB/s")
+    parser.add_argument("--throttle_rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry_after", type=int, default=1)
+    parser.add_argument("--filings_per_day", type=int, default=100)
+    parser.add_argument("--submission_size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    server = FakeEdgarServer(
+        host=args.host, port=args.port, fixture_dir=args.fixture_dir, latency=args.latency,
+        bandwidth_bytes_per_sec=args.bandwidth_kbps * 1024 if args.bandwidth_kbps else None,
+        throttle_rate=args.throttle_rate, retry_after=args.retry_after,
+        filings_per_day=args.filings_per_day, submission_size=args.submission_size
+    )
+    print(f"Fake EDGAR listening on {server.base_url} (export EDGAR_BASE_URL={server.base_url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(f"Stats: {dict(server.stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# tests/fake_edgar/test_fake_edgar_server.py
+
+import os, sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+import pytest
+from tests.fake_edgar.server import FakeEdgarServer
+from collectors.crawler_idx.filing_metadata_collector import FilingMetadataCollector
+from downloaders.http_transport import HttpTransport
+from downloaders.retry_policy import RetryPolicy, CircuitBreaker
+from downloaders.sec_downloader import SECDownloader
+from downloaders.sgml_downloader import SgmlDownloader
+from utils.url_builder import construct_submission_json_url
+
+USER_AGENT = "test-agent@example.com"
+
+
+@pytest.fixture
+def server():
+    with FakeEdgarServer(filings_per_day=12, submission_size=2000) as fake:
+        yield fake
+
+
+def make_transport(server):
+    return HttpTransport(user_agent=USER_AGENT, pool_size=4, base_url=server.base_url)
+
+
+def test_base_url_override_only_rewrites_sec_hosts(server):
+    transport = make_transport(server)
+    assert transport.resolve_url("https://www.sec.gov/Archives/x.txt") == f"{server.base_url}/Archives/x.txt"
+    assert transport.resolve_url("https://data.sec.gov/submissions/CIK1.json") == f"{server.base_url}/submissions/CIK1.json"
+    assert transport.resolve_url("https://example.com/x") == "https://example.com/x"
+
+
+def test_pipeline_components_run_against_fake_server(server):
+    transport = make_transport(server)
+    records = FilingMetadataCollector(user_agent=USER_AGENT, transport=transport).collect("2025-05-12")
+    assert len(records) == 12
+
+    downloader = SgmlDownloader(user_agent=USER_AGENT, request_delay_seconds=0, use_cache=False,
+                                max_workers=4, transport=transport)
+    results = list(downloader.download_many([(r.cik, r.accession_number, "2025") for r in records]))
+    assert all(error is None for _, _, error in results)
+    assert all("<DOCUMENT>" in doc.content for _, doc, _ in results)
+
+    # Real fixtures are served when the accession matches a file in tests/fixtures
+    fixture_doc = downloader.download_sgml("1084869", "0000921895-25-001190", year="2025")
+    assert "Pleasant Lake Partners" in fixture_doc.content
+
+    submissions = SECDownloader(user_agent=USER_AGENT, request_delay_seconds=0, transport=transport)\
+        .download_json(construct_submission_json_url("320193"))
+    assert submissions["filings"]["recent"]["accessionNumber"]
+    assert server.stats["sgml"] == 13 and server.stats["crawler_idx"] == 1
+
+
+def test_injected_429s_are_retried(server):
+    server.throttle_rate = 1.0
+    server.retry_after = 0
+    downloader = SECDownloader(
+        user_agent=USER_AGENT,
+        request_delay_seconds=0,
+        transport=make_transport(server),
+        retry_policy=RetryPolicy(max_retries=2, base_delay=0),
+        circuit_breaker=CircuitBreaker(throttle_threshold=10, cooldown_seconds=0)
+    )
+    with pytest.raises(Exception):
+        downloader.download_html("https://www.sec.gov/Archives/edgar/data/320193/000032019325000001/0000320193-25-000001.txt")
+    assert server.stats["throttled"] == 3
+
+
+def test_synthetic_submissions_are_dated_by_the_day_that_listed_them(server):
+    accessions = [accession for _, accession, _ in server.synthetic_accessions("20250512")]
+    assert all(len(accession.split("-")[2]) == 6 for accession in accessions)
+    assert len(set(accessions)) == len(accessions)
+
+    cik, accession, _ = next(server.synthetic_accessions("20250512"))
+    body = server.synthetic_submission(cik, accession).decode("utf-8")
+    assert "FILED AS OF DATE:\t\t20250512\n" in body
+    assert body == server.synthetic_submission(cik, accession).decode("utf-8")
@@ -0,0 +1,92 @@
+# tests/feed_archive/test_feed_archive_collector.py
+
+import io
+import os
+import sys
+import tarfile
+from datetime import date
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+import pytest
+from collectors.feed_archive.feed_archive_collector import FeedArchiveCollector
+
+FORM4_FIXTURE = os.path.join(os.path.dirname(__file__), os.pardir, "fixtures", "0000921895-25-001190.txt")
+
+# Daily feed members use tagged headers rather than "KEY: value" lines
+NC_SUBMISSION = """<SUBMISSION>
+<ACCESSION-NUMBER>0000320193-25-000010
+<TYPE>10-K
+<PUBLIC-DOCUMENT-COUNT>2
+<FILING-DATE>20250428
+<FILER>
+<COMPANY-DATA>
+<CONFORMED-NAME>Apple Inc.
+<CIK>0000320193
+</COMPANY-DATA>
+</FILER>
+<DOCUMENT>
+<TYPE>10-K
+<SEQUENCE>1
+<FILENAME>aapl-20250329.htm
+<DESCRIPTION>10-K
+<TEXT>
+<html>annual report</html>
+</TEXT>
+</DOCUMENT>
+<DOCUMENT>
+<TYPE>EX-21.1
+<SEQUENCE>2
+<FILENAME>ex211.htm
+<TEXT>
+<html>subsidiaries</html>
+</TEXT>
+</DOCUMENT>
+</SUBMISSION>
+"""
+
+
+@pytest.fixture
+def feed_archive(tmp_path):
+    with open(FORM4_FIXTURE, "rb") as f:
+        form4_bytes = f.read()
+    members = [
+        ("0000921895-25-001190.nc", form4_bytes),
+        ("0000320193-25-000010.nc", NC_SUBMISSION.encode("utf-8")),
+        ("garbage.nc", b"not a submission"),
+    ]
+    path = tmp_path / "20250428.nc.tar.gz"
+    with tarfile.open(path, "w:gz") as archive:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return str(path), form4_bytes
+
+
+def test_collect_reads_metadata_from_member_headers(feed_archive):
+    archive_path, _ = feed_archive
+    records = FeedArchiveCollector(archive_path).collect()
+
+    assert [(r.accession_number, r.form_type, r.cik) for r in records] == [
+        ("0000921895-25-001190", "4", "1084869"),  # issuer, not the reporting owner
+        ("0000320193-25-000010", "10-K", "320193"),
+    ]
+    assert records[1].filing_date == date(2025, 4, 28)
+    assert records[1].filing_url == "https://www.sec.gov/Archives/edgar/data/320193/0000320193-25-000010-index.htm"
+
+
+def test_iter_submissions_streams_full_content_with_form_filter(feed_archive):
+    archive_path, form4_bytes = feed_archive
+    submissions = list(FeedArchiveCollector(archive_path).iter_submissions(include_forms=["4"]))
+
+    assert len(submissions) == 1
+    metadata, sgml_doc = submissions[0]
+    assert metadata.accession_number == sgml_doc.accession_number == "0000921895-25-001190"
+    assert sgml_doc.raw == form4_bytes  # kept as bytes, not decoded
+
+
+def test_missing_archive_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        FeedArchiveCollector(str(tmp_path / "missing.nc.tar.gz"))
@@ -114,6 +114,7 @@ def test_form4_orchestrator_run():
     
     # Simple downloader mock that returns SGML content
     mock_downloader = MagicMock()
+    mock_downloader.read_ahead.side_effect = lambda items, target, **kwargs: iter(items)
     mock_downloader.has_in_memory_cache.return_value = False
     mock_downloader.download_sgml.return_value = "<SEC-HEADER>Sample SGML Content</SEC-HEADER>"
     
@@ -159,6 +160,7 @@ def test_form4_orchestrator_handles_download_failure():
     """Test that the orchestrator properly handles download failures"""
     # Create mock downloader that fails to return SGML content
     mock_downloader = MagicMock()
+    mock_downloader.read_ahead.side_effect = lambda items, target, **kwargs: iter(items)
     mock_downloader.has_in_memory_cache.return_value = False
     mock_downloader.download_sgml.return_value = None  # Failed download
     
@@ -201,6 +203,7 @@ def test_form4_orchestrator_handles_download_failure():
 def test_form4_orchestrator_with_empty_results():
     """Test that the orchestrator handles empty query results correctly"""
     mock_downloader = MagicMock()
+    mock_downloader.read_ahead.side_effect = lambda items, target, **kwargs: iter(items)
     
     # Mock database session
     mock_db_session = MagicMock()
@@ -250,6 +253,7 @@ def test_form4_orchestrator_xml_file_path():
     
     # Mock downloader that returns SGML with XML
     mock_downloader = MagicMock()
+    mock_downloader.read_ahead.side_effect = lambda items, target, **kwargs: iter(items)
     mock_downloader.has_in_memory_cache.return_value = False
     mock_downloader.download_sgml.return_value = f"<SEC-HEADER></SEC-HEADER>\n{xml_content}"
     
@@ -348,13 +352,14 @@ FILED AS OF DATE: 20250515
     
     # Setup the mock downloader with appropriate behaviors
     mock_downloader = MagicMock()
+    mock_downloader.read_ahead.side_effect = lambda items, target, **kwargs: iter(items)
     
     # First time memory cache is checked, return False to force disk path check
     # Second time (alternate URL check) return True for the issuer CIK path
     mock_downloader.has_in_memory_cache.side_effect = [False, True]
     
     # When getting from memory cache, return the SGML content
-    mock_downloader.get_from_memory_cache.return_value = mock_sgml
+    mock_downloader.get_raw_from_memory_cache.return_value = mock_sgml.encode("utf-8")
     
     # When downloading, also return the SGML content as fallback
     mock_downloader.download_sgml.return_value = mock_sgml
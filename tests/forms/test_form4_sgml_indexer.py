@@ -804,4 +804,24 @@ def test_bug8_issuer_cik_extraction_from_entity():
     assert result["issuer_cik"] == "1234567", f"Incorrect issuer CIK: {result.get('issuer_cik')}"
     
     # Verify the issuer CIK is different from the CIK used to initialize the indexer
-    assert result["issuer_cik"] != indexer.cik, "issuer_cik should be different from initialization CIK"
\ No newline at end of file
+    assert result["issuer_cik"] != indexer.cik, "issuer_cik should be different from initialization CIK"
+
+
+def test_form4_sgml_indexer_accepts_mapped_file(tmp_path, sample_sgml_content):
+    from utils.sgml_buffer import map_sgml_file
+
+    path = tmp_path / "submission.txt"
+    path.write_text(sample_sgml_content, encoding="utf-8")
+    indexer = Form4SgmlIndexer(cik="0001084869", accession_number="0000921895-25-001190")
+    from_text = indexer.index_documents(sample_sgml_content)
+
+    with map_sgml_file(str(path)) as mapping:
+        from_mapping = indexer.index_documents(mapping)
+
+    assert from_mapping["documents"] == from_text["documents"]
+    assert from_mapping["xml_content"] == from_text["xml_content"]
+    assert from_mapping["issuer_cik"] == from_text["issuer_cik"]
+    form4_text, form4_mapped = from_text["form4_data"], from_mapping["form4_data"]
+    assert form4_mapped.period_of_report == form4_text.period_of_report
+    assert len(form4_mapped.relationships) == len(form4_text.relationships)
+    assert len(form4_mapped.transactions) == len(form4_text.transactions)
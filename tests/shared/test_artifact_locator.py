@@ -0,0 +1,100 @@
+# tests/shared/test_artifact_locator.py
+
+import os, sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+import datetime
+
+import pytest
+from downloaders.sgml_downloader import SgmlDownloader
+from models.dataclasses.raw_document import RawDocument
+from utils.artifact_locator import RawArtifactIndex, find_stored_sgml, get_artifact_index_path
+from utils.path_manager import build_raw_filepath_by_type
+from writers.shared.raw_file_writer import RawFileWriter
+
+ACCESSION = "0001234567-25-000001"
+SGML = b"<SEC-DOCUMENT>\n<SEC-HEADER>\nCONFORMED SUBMISSION TYPE:\t4\n</SEC-HEADER>\n</SEC-DOCUMENT>\n"
+
+
+@pytest.fixture
+def data_root(tmp_path, monkeypatch):
+    monkeypatch.setitem(__import__("utils.path_manager").path_manager.STORAGE_CONFIG, "base_data_path", str(tmp_path))
+    return tmp_path
+
+
+def write_issuer_sgml():
+    return RawFileWriter(file_type="sgml").write(RawDocument(
+        accession_number=ACCESSION, cik="0000320193", form_type="4", document_type="sgml",
+        filename=f"{ACCESSION}.txt", source_url="https://www.sec.gov", source_type="sgml",
+        content=SGML, filing_date=datetime.date(2025, 5, 12),
+    ))
+
+
+def test_sgml_written_under_issuer_cik_is_found_by_accession(data_root):
+    path = write_issuer_sgml()
+
+    # A reporting-owner layout would never have found it; the accession lookup does
+    owner_path = build_raw_filepath_by_type("sgml", "2025", "0001234567", "4", ACCESSION, f"{ACCESSION}.txt")
+    assert not os.path.exists(owner_path)
+    assert find_stored_sgml(ACCESSION, owner_path) == path
+    assert find_stored_sgml(ACCESSION.replace("-", "")) == path
+
+
+def test_deleted_files_are_dropped_from_the_index(data_root):
+    path = write_issuer_sgml()
+    os.remove(path)
+    assert find_stored_sgml(ACCESSION) is None
+
+
+def test_rebuild_picks_up_files_already_on_disk(data_root):
+    raw_path = build_raw_filepath_by_type("xml", "2024", "0000320193", "4/A", "0000320193-24-000009", "form4.xml")
+    legacy_path = os.path.join(str(data_root), "sgml", "0000320193", "000032019324000009.txt")
+    for path in (raw_path, legacy_path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(SGML)
+
+    index = RawArtifactIndex(get_artifact_index_path())
+    assert index.artifacts("000032019324000009") == []  # opening an index never walks raw/
+    assert index.rebuild() == 2
+    (xml_row,) = index.artifacts("000032019324000009", "xml")
+    assert (xml_row["cik"], xml_row["year"], xml_row["form_type"]) == ("0000320193", "2024", "4/A")
+    assert index.find("0000320193-24-000009", "sgml") == legacy_path
+
+
+def test_downloader_reads_stored_sgml_instead_of_downloading(data_root):
+    write_issuer_sgml()
+
+    class OfflineDownloader(SgmlDownloader):
+        def download_bytes(self, url):
+            raise AssertionError("stored SGML must not be re-downloaded")
+
+        def download_prefix(self, url, marker, max_bytes=65536):
+            raise AssertionError("stored SGML must not be re-downloaded")
+
+    downloader = OfflineDownloader(user_agent="test", use_cache=False)
+    assert downloader.download_sgml_header("0001234567", ACCESSION).endswith("</SEC-HEADER>")
+    assert downloader.download_sgml("0001234567", ACCESSION).raw == SGML
+
+
+def test_stored_sgml_that_no_longer_matches_its_hash_is_not_served(data_root):
+    path = write_issuer_sgml()
+    assert not os.path.exists(f"{path}.part")
+    with open(path, "r+b") as f:
+        f.write(b"<XXX")  # same size, different content
+
+    assert find_stored_sgml(ACCESSION) == path  # size still matches
+    assert find_stored_sgml(ACCESSION, verify_hash=True) is None
+    assert RawArtifactIndex(get_artifact_index_path()).artifacts(ACCESSION) == []
+
+
+def test_truncated_files_are_not_indexed(data_root):
+    path = write_issuer_sgml()
+    with open(path, "r+b") as f:
+        f.truncate(20)
+
+    assert find_stored_sgml(ACCESSION) is None
+    assert find_stored_sgml(ACCESSION, path) is None  # no </SEC-DOCUMENT>: an interrupted write
+    os.remove(get_artifact_index_path())
+    assert RawArtifactIndex(get_artifact_index_path()).artifacts(ACCESSION) == []
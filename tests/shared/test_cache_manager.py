@@ -10,12 +10,14 @@ sys.path.insert(
 )
 
 import shutil
+import time
 import pytest
-from utils.cache_manager import clear_sgml_cache, get_cache_root
+from utils.cache_manager import SgmlCacheCatalog, clear_sgml_cache, get_cache_root
 
 @pytest.fixture
 def setup_cache(tmp_path, monkeypatch):
     monkeypatch.setattr("utils.path_manager.STORAGE_CONFIG", {"base_data_path": str(tmp_path)})
+    monkeypatch.setattr("utils.cache_manager.STORAGE_CONFIG", {"base_data_path": str(tmp_path)})
     cache_root = get_cache_root()
     os.makedirs(os.path.join(cache_root, "2025", "0000000000"), exist_ok=True)
     file1 = os.path.join(cache_root, "2025", "0000000000", "20250101000001.txt")
@@ -35,3 +37,34 @@ def test_clear_all_files(setup_cache):
     ]
     assert len(remaining_files) == 0
 
+
+def catalog_entry(catalog, accession, size, cik="320193", year="2025", form_type="4"):
+    catalog.record(accession, f"/nonexistent/{accession}.txt.gz", sha256=accession, size_bytes=size,
+                   raw_bytes=size * 5, cik=cik, year=year, form_type=form_type)
+
+
+def test_catalog_evicts_least_recently_used_over_cap(tmp_path):
+    catalog = SgmlCacheCatalog(str(tmp_path / "catalog.sqlite3"), max_bytes=250)
+    catalog_entry(catalog, "a", 100)
+    time.sleep(0.01)
+    catalog_entry(catalog, "b", 100)
+    time.sleep(0.01)
+    catalog.touch("a")  # "b" is now the least recently used
+    catalog_entry(catalog, "c", 100)
+
+    assert catalog.lookup("b") is None
+    assert catalog.lookup("a") is not None and catalog.lookup("c") is not None
+    stats = catalog.stats()
+    assert stats["entries"] == 2 and stats["bytes"] == 200 and stats["compression_ratio"] == 5.0
+
+
+def test_catalog_purges_by_cik_year_and_form(tmp_path):
+    catalog = SgmlCacheCatalog(str(tmp_path / "catalog.sqlite3"))
+    catalog_entry(catalog, "a", 10, cik="0000320193", form_type="4")
+    catalog_entry(catalog, "b", 10, cik="320193", form_type="10-K")
+    catalog_entry(catalog, "c", 10, cik="789019", year="2024", form_type="4")
+
+    assert catalog.purge(cik="0000320193", form_type="4") == 1
+    assert catalog.purge(year="2024") == 1
+    assert catalog.lookup("b") is not None
+    assert catalog.stats()["entries"] == 1
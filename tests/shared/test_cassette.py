@@ -0,0 +1,60 @@
+# tests/shared/test_cassette.py
+
+import os, sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+import pytest
+from tests.fake_edgar.server import FakeEdgarServer
+from collectors.crawler_idx.filing_metadata_collector import FilingMetadataCollector
+from downloaders.cassette import CASSETTE_ENV_VAR, CassetteMissError, HttpCassette
+from downloaders.http_transport import HttpTransport
+from downloaders.sgml_downloader import SgmlDownloader
+
+USER_AGENT = "test-agent@example.com"
+
+
+def run_day(transport):
+    records = FilingMetadataCollector(user_agent=USER_AGENT, transport=transport).collect("2025-05-12")
+    downloader = SgmlDownloader(user_agent=USER_AGENT, request_delay_seconds=0, use_cache=False, transport=transport)
+    contents = {r.accession_number: downloader.download_sgml(r.cik, r.accession_number, "2025").content for r in records}
+    header = SgmlDownloader(user_agent=USER_AGENT, request_delay_seconds=0, use_cache=False, transport=transport)\
+        .download_sgml_header(records[0].cik, records[0].accession_number)
+    return records, contents, header
+
+
+def test_replay_reproduces_recorded_run_without_network(tmp_path):
+    cassette_dir = str(tmp_path / "cassette")
+    with FakeEdgarServer(filings_per_day=5, submission_size=2000) as server:
+        live = HttpTransport(user_agent=USER_AGENT, base_url=server.base_url,
+                             cassette=HttpCassette(cassette_dir, "record"))
+        recorded_records, recorded_contents, recorded_header = run_day(live)
+        live_requests = server.stats["requests"]
+
+    # Server is gone: every response must come from the cassette
+    replay = HttpTransport(user_agent=USER_AGENT, cassette=HttpCassette(cassette_dir, "replay"))
+    assert not replay.is_live
+    records, contents, header = run_day(replay)
+
+    assert [r.accession_number for r in records] == [r.accession_number for r in recorded_records]
+    assert contents == recorded_contents
+    assert header == recorded_header
+    assert replay.metrics()["requests"] == live_requests
+
+
+def test_replay_miss_raises_without_retrying(tmp_path):
+    os.makedirs(tmp_path / "empty")
+    transport = HttpTransport(user_agent=USER_AGENT, cassette=HttpCassette(str(tmp_path / "empty"), "replay"))
+    downloader = SgmlDownloader(user_agent=USER_AGENT, use_cache=False, transport=transport)
+    with pytest.raises(CassetteMissError):
+        downloader.download_sgml("320193", "0000320193-25-000001", "2025")
+
+
+def test_cassette_from_env(tmp_path, monkeypatch):
+    monkeypatch.setenv(CASSETTE_ENV_VAR, f"record:{tmp_path / 'c'}")
+    transport = HttpTransport(user_agent=USER_AGENT)
+    assert transport.cassette.recording and transport.is_live
+
+    monkeypatch.setenv(CASSETTE_ENV_VAR, f"bogus:{tmp_path}")
+    with pytest.raises(ValueError):
+        HttpTransport(user_agent=USER_AGENT)
@@ -0,0 +1,180 @@
+# tests/shared/test_hedging.py
+
+import os, sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from downloaders.hedging import HEDGE_WORKERS, HedgePolicy, LatencyTracker
+from downloaders.sec_downloader import SECDownloader
+
+
+def warmed_policy(latency=0.01, samples=20):
+    policy = HedgePolicy(percentile=0.95, min_samples=samples, min_delay=0.01, max_delay=1.0)
+    for _ in range(samples):
+        policy.tracker.record(latency)
+    return policy
+
+
+def test_latency_tracker_percentile():
+    tracker = LatencyTracker(window=100)
+    assert tracker.percentile(0.95) is None
+    for ms in range(1, 101):
+        tracker.record(ms / 1000)
+    assert tracker.percentile(0.95) == pytest.approx(0.095)
+    assert tracker.percentile(0.5) == pytest.approx(0.05)
+
+
+def test_no_hedge_until_enough_samples():
+    policy = HedgePolicy(min_samples=5)
+    hedge = MagicMock()
+    assert policy.execute(lambda: "response", before_hedge=hedge) == "response"
+    assert policy.hedges_sent == 0
+    hedge.assert_not_called()
+    assert len(policy.tracker) == 1
+
+
+def test_slow_request_is_hedged_and_fastest_wins():
+    policy = warmed_policy()
+    calls = []
+    lock = threading.Lock()
+    slow = MagicMock()
+
+    def send():
+        with lock:
+            calls.append(len(calls))
+            first = len(calls) == 1
+        if first:
+            time.sleep(0.5)
+            return slow
+        return "fast"
+
+    hedge = MagicMock()
+    started = time.perf_counter()
+    assert policy.execute(send, before_hedge=hedge) == "fast"
+    assert time.perf_counter() - started < 0.4
+    assert policy.hedges_sent == 1 and policy.hedges_won == 1
+    hedge.assert_called_once()
+
+    # The losing response is closed once it arrives
+    time.sleep(0.6)
+    slow.close.assert_called_once()
+
+
+def test_fast_request_is_not_hedged():
+    policy = warmed_policy(latency=0.5)
+    assert policy.execute(lambda: "ok") == "ok"
+    assert policy.hedges_sent == 0
+
+
+def test_error_is_raised_only_when_both_fail():
+    policy = warmed_policy()
+    attempts = []
+
+    def send():
+        attempts.append(1)
+        if len(attempts) == 1:
+            time.sleep(0.1)
+            raise ConnectionError("stalled")
+        return "backup"
+
+    assert policy.execute(send) == "backup"
+
+    def always_fail():
+        time.sleep(0.05)
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        policy.execute(always_fail)
+
+
+def test_sec_downloader_hedges_through_throttle():
+    policy = warmed_policy()
+    downloader = SECDownloader(user_agent="test", request_delay_seconds=0, hedge_policy=policy)
+    responses = iter([0.5, 0.0])
+
+    def fake_request(url, headers=None, **kwargs):
+        delay = next(responses)
+        time.sleep(delay)
+        response = MagicMock(status_code=200, content=b"body")
+        return response
+
+    downloader._make_request = fake_request
+    throttles = []
+    original_throttle = downloader._throttle
+    downloader._throttle = lambda: (throttles.append(1), original_throttle())
+
+    assert downloader.download_bytes("https://www.sec.gov/x") == b"body"
+    assert len(throttles) == 2  # the original request and the hedge
+    assert policy.hedges_sent == 1
+
+
+def test_failed_response_does_not_win_the_race():
+    policy = warmed_policy()
+    calls = []
+    lock = threading.Lock()
+
+    def send():
+        with lock:
+            calls.append(1)
+            first = len(calls) == 1
+        if first:
+            time.sleep(0.2)
+            return MagicMock(status_code=200)
+        return MagicMock(status_code=503)  # the hedge answers first, but with an error
+
+    assert policy.execute(send).status_code == 200
+    assert policy.hedges_sent == 1 and policy.hedges_won == 0
+
+    def always_503():
+        time.sleep(0.05)
+        return MagicMock(status_code=503)
+
+    assert policy.execute(always_503).status_code == 503  # left to the retry policy
+
+
+def test_no_hedge_when_primary_finishes_during_throttle():
+    policy = warmed_policy()
+    sends = []
+
+    def send():
+        sends.append(1)
+        time.sleep(0.1)
+        return "primary"
+
+    assert policy.execute(send, before_hedge=lambda: time.sleep(0.3)) == "primary"
+    assert len(sends) == 1 and policy.hedges_sent == 0
+
+
+def test_hedge_clock_starts_when_primary_starts():
+    policy = warmed_policy(latency=0.2)
+    policy.max_delay = 0.2
+    policy._get_executor()
+    blocker = threading.Event()
+    # Occupy every worker so the primary waits in the queue first
+    busy = [policy._executor.submit(blocker.wait) for _ in range(HEDGE_WORKERS)]
+    threading.Timer(0.3, blocker.set).start()
+
+    # Queued 0.3s, then answers 0.1s after starting: within the 0.2s delay, so no hedge
+    def send():
+        time.sleep(0.1)
+        return "ok"
+
+    assert policy.execute(send) == "ok"
+    assert policy.hedges_sent == 0
+    for future in busy:
+        future.result()
+
+
+def test_sec_downloader_hedges_on_headers():
+    policy = warmed_policy()
+    downloader = SECDownloader(user_agent="test", request_delay_seconds=0, hedge_policy=policy)
+    sent = []
+    downloader._make_request = lambda url, headers=None, **kwargs: sent.append(kwargs) or MagicMock(status_code=200)
+
+    downloader.download_bytes("https://www.sec.gov/x")
+    assert sent == [{"stream": True}]
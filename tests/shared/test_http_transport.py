@@ -0,0 +1,54 @@
+# tests/shared/test_http_transport.py
+
+import unittest
+from unittest.mock import patch, MagicMock
+import sys, os
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+import requests
+from downloaders.http_transport import HttpTransport
+from downloaders.sec_downloader import SECDownloader
+
+
+class TestHttpTransport(unittest.TestCase):
+    def setUp(self):
+        self.transport = HttpTransport(user_agent="test-agent@example.com", pool_size=4)
+
+    def test_session_negotiates_compression_and_pools(self):
+        self.assertEqual(self.transport.session.headers["Accept-Encoding"], "gzip, deflate")
+        self.assertEqual(self.transport.session.headers["User-Agent"], "test-agent@example.com")
+        adapter = self.transport.session.get_adapter("https://www.sec.gov/")
+        self.assertEqual(adapter._pool_maxsize, 4)
+
+    @patch("downloaders.http_transport.requests.Session.get")
+    def test_metrics_track_requests_and_errors(self, mock_get):
+        ok = MagicMock(status_code=200, content=b"x" * 2048)
+        mock_get.side_effect = [ok, requests.ConnectionError("boom")]
+
+        self.transport.get("https://www.sec.gov/a")
+        with self.assertRaises(requests.ConnectionError):
+            self.transport.get("https://www.sec.gov/b")
+
+        metrics = self.transport.metrics()
+        self.assertEqual(metrics["requests"], 2)
+        self.assertEqual(metrics["errors"], 1)
+        self.assertEqual(metrics["bytes_received"], 2048)
+        self.assertEqual(metrics["status_counts"], {200: 1})
+
+    @patch("downloaders.http_transport.requests.Session.get")
+    def test_downloaders_share_injected_transport(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=200, text="ok", content=b"ok")
+
+        first = SECDownloader(user_agent="test-agent", request_delay_seconds=0, transport=self.transport)
+        second = SECDownloader(user_agent="test-agent", request_delay_seconds=0, transport=self.transport)
+        first.download_html("https://www.sec.gov/1")
+        second.download_html("https://www.sec.gov/2")
+
+        self.assertIs(first.transport, second.transport)
+        self.assertEqual(self.transport.metrics()["requests"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+# tests/shared/test_identity_cache.py
+
+import os, sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from writers.shared.entity_writer import EntityWriter
+from writers.shared.identity_cache import IdentityCache
+
+
+def entity(cik, name="Test Entity", entity_type="company"):
+    return SimpleNamespace(id=uuid.uuid4(), cik=cik, name=name, entity_type=entity_type)
+
+
+def test_entities_are_found_by_padded_cik_and_by_id():
+    cache = IdentityCache()
+    apple = entity("320193", "Apple Inc")
+    cache.put_entity(apple)
+
+    assert cache.get_entity("0000320193").id == apple.id
+    assert cache.get_entity_by_id(str(apple.id)).name == "Apple Inc"
+    assert cache.get_entity("1") is None
+
+
+def test_least_recently_used_identities_are_dropped():
+    cache = IdentityCache(max_entries=2)
+    first, second, third = entity("1"), entity("2"), entity("3")
+    cache.put_entity(first)
+    cache.put_entity(second)
+    cache.get_entity("1")
+    cache.put_entity(third)
+
+    assert cache.get_entity("2") is None
+    assert cache.get_entity_by_id(second.id) is None
+    assert cache.get_entity("1") is not None and cache.get_entity("3") is not None
+
+
+def test_session_writes_are_cached_only_once_committed():
+    cache = IdentityCache()
+    session = Session(create_engine("sqlite:///:memory:"))
+
+    session.execute(text("SELECT 1"))
+    cache.put_entity(entity("1"), session=session)
+    cache.put_security("Common Stock", uuid.uuid4(), uuid.uuid4(), session=session)
+    session.rollback()
+    session.commit()
+    assert cache.stats()["entities"] == 0 and cache.stats()["securities"] == 0
+
+    session.execute(text("SELECT 1"))
+    cache.put_entity(entity("2"), session=session)
+    assert cache.get_entity("2") is None
+    session.commit()
+    assert cache.get_entity("2") is not None
+
+
+def test_entity_writer_caches_database_reads_only_once_its_session_commits():
+    cache = IdentityCache()
+    session = Session(create_engine("sqlite:///:memory:"))
+    session.execute(text("SELECT 1"))
+    session.query = MagicMock()
+    session.query.return_value.filter.return_value.first.return_value = entity("320193")
+    writer = EntityWriter(db_session=session, identity_cache=cache)
+
+    assert writer.get_entity_by_cik("0000320193") is not None
+    assert cache.get_entity("320193") is None  # the row may belong to a transaction that rolls back
+    session.rollback()
+    assert cache.get_entity("320193") is None
+
+    session.execute(text("SELECT 1"))
+    writer.get_entity_by_id(uuid.uuid4())
+    session.commit()
+    assert cache.get_entity("320193") is not None
+
+
+def test_warm_up_loads_the_batch_and_drops_entities_no_longer_in_the_database():
+    cache = IdentityCache()
+    cache.put_entity(entity("2"))  # e.g. restored from a stale snapshot
+    issuer = entity("320193")
+    security = SimpleNamespace(id=uuid.uuid4(), title="Common Stock", issuer_entity_id=issuer.id)
+    session = MagicMock()
+    session.query.return_value.filter.return_value.all.side_effect = [[issuer], [security]]
+
+    assert cache.warm_up(session, ["0000320193", "0000000002"]) == 1
+    assert session.query.call_count == 2  # one IN query for entities, one for their securities
+    assert cache.get_entity("320193").id == issuer.id
+    assert cache.get_entity("2") is None
+    assert cache.get_security("Common Stock", str(issuer.id)) == str(security.id)
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "identities.json")
+    cache = IdentityCache(snapshot_path=path)
+    issuer = entity("320193", "Apple Inc")
+    security_id = uuid.uuid4()
+    cache.put_entity(issuer)
+    cache.put_security("Common Stock", issuer.id, security_id)
+    assert cache.save_snapshot() == path
+
+    restored = IdentityCache(snapshot_path=path)
+    assert restored.load_snapshot() == 2
+    assert restored.get_entity("320193").id == issuer.id
+    assert restored.get_security("Common Stock", issuer.id) == str(security_id)
+
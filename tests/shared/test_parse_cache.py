@@ -0,0 +1,72 @@
+# tests/shared/test_parse_cache.py
+
+import os, sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+from parsers.sgml.indexers.forms.form4_sgml_indexer import Form4SgmlIndexer
+from utils.parse_cache import ParseResultCache, content_sha256
+from utils.sgml_buffer import map_sgml_file
+
+SAMPLE_FILE = "tests/fixtures/0000921895-25-001190.txt"
+CIK = "0001084869"
+ACCESSION = "0000921895-25-001190"
+
+
+def test_content_hash_is_the_same_for_text_bytes_and_mapping():
+    with open(SAMPLE_FILE, "rb") as f:
+        raw = f.read()
+    with map_sgml_file(SAMPLE_FILE) as mapping:
+        assert content_sha256(mapping) == content_sha256(raw) == content_sha256(raw.decode("utf-8"))
+    assert content_sha256(None) is None
+
+
+def test_form4_result_round_trips(tmp_path):
+    cache = ParseResultCache(str(tmp_path / "parse_cache.sqlite3"))
+    with open(SAMPLE_FILE, "r", encoding="utf-8") as f:
+        content = f.read()
+    indexed = Form4SgmlIndexer(CIK, ACCESSION).index_documents(content)
+    content_hash = content_sha256(content)
+
+    assert cache.get("form4", Form4SgmlIndexer.PARSER_VERSION, content_hash, context=CIK) is None
+    assert not os.path.exists(cache.db_path)  # misses never create the database
+
+    assert cache.put("form4", Form4SgmlIndexer.PARSER_VERSION, content_hash, indexed, context=CIK)
+    cached = cache.get("form4", Form4SgmlIndexer.PARSER_VERSION, content_hash, context=CIK)
+
+    assert cached["documents"] == indexed["documents"]
+    assert cached["xml_content"] == indexed["xml_content"]
+    assert cached["issuer_cik"] == indexed["issuer_cik"]
+    assert cached["form4_data"] == indexed["form4_data"]
+    assert cache.get("form4", Form4SgmlIndexer.PARSER_VERSION, content_hash, context="0000000001") is None
+    assert cache.stats()["hits"] == 1
+
+
+def test_new_parser_version_invalidates_results(tmp_path):
+    db_path = str(tmp_path / "parse_cache.sqlite3")
+    ParseResultCache(db_path).put("form4", "1", "abc", {"issuer_cik": "1"})
+
+    cache = ParseResultCache(db_path)
+    assert cache.get("form4", "2", "abc") is None
+    assert cache.stats()["entries"] == 0  # older versions are deleted, not just skipped
+    assert ParseResultCache(db_path).get("form4", "1", "abc") is None
+
+
+def test_least_recently_used_results_are_evicted(tmp_path):
+    cache = ParseResultCache(str(tmp_path / "parse_cache.sqlite3"))
+    for key in ("a", "b"):
+        cache.put("form4", "1", key, os.urandom(2000))
+    cache.get("form4", "1", "a")
+
+    cache.max_bytes = 4500
+    cache.put("form4", "1", "c", os.urandom(2000))
+
+    assert cache.get("form4", "1", "b") is None
+    assert cache.get("form4", "1", "a") is not None
+    assert cache.get("form4", "1", "c") is not None
+
+
+def test_unserializable_results_are_not_stored(tmp_path):
+    cache = ParseResultCache(str(tmp_path / "parse_cache.sqlite3"))
+    assert cache.put("form4", "1", "abc", {"callback": lambda: None}) is False
+    assert cache.get("form4", "1", "abc") is None
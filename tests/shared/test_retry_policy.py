@@ -0,0 +1,129 @@
+# tests/shared/test_retry_policy.py
+
+import unittest
+from unittest.mock import patch, MagicMock
+import sys, os
+import tempfile
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+import requests
+from downloaders.rate_limiter import TokenBucketRateLimiter
+from downloaders.retry_policy import RetryPolicy, CircuitBreaker, get_shared_circuit_breaker, parse_retry_after
+from downloaders.sec_downloader import SECDownloader
+
+
+def make_response(status_code, text="", headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = headers or {}
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_backoff_is_bounded_and_honors_retry_after(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+        for attempt in range(6):
+            self.assertLessEqual(policy.compute_delay(attempt), 4.0)
+        self.assertEqual(policy.compute_delay(0, retry_after=10), 10)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("5"), 5.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold_and_closes_after_cooldown(self):
+        breaker = CircuitBreaker(throttle_threshold=2, cooldown_seconds=0.05)
+        breaker.record_throttle()
+        self.assertFalse(breaker.is_open)
+        breaker.record_throttle()
+        self.assertTrue(breaker.is_open)
+
+        start = time.time()
+        breaker.wait_if_open()
+        self.assertGreaterEqual(time.time() - start, 0.03)
+        self.assertFalse(breaker.is_open)
+
+    def test_success_resets_throttle_count(self):
+        breaker = CircuitBreaker(throttle_threshold=2, cooldown_seconds=60)
+        breaker.record_throttle()
+        breaker.record_success()
+        breaker.record_throttle()
+        self.assertFalse(breaker.is_open)
+
+    def test_open_state_is_shared_through_the_rate_limiter_state_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            state_path = os.path.join(tmp, "sec.state")
+            limiter = TokenBucketRateLimiter(requests_per_second=1000, state_path=state_path)
+            limiter.acquire()
+            # Breakers in different processes only have the state file in common
+            first = CircuitBreaker(throttle_threshold=1, cooldown_seconds=0.1, state_path=state_path)
+            second = CircuitBreaker(throttle_threshold=1, cooldown_seconds=0.1, state_path=state_path)
+
+            first.record_throttle()
+            self.assertTrue(second.is_open)
+            start = time.time()
+            second.wait_if_open()
+            self.assertGreaterEqual(time.time() - start, 0.05)
+            self.assertFalse(second.is_open)
+            limiter.acquire()  # the bucket state before the breaker's is intact
+
+    def test_shared_breaker_stays_in_process_when_requests_do_not_go_to_the_sec(self):
+        with patch("downloaders.retry_policy.get_host_state_path", return_value="/tmp/sec.state"):
+            with patch.dict(os.environ, {"EDGAR_BASE_URL": "http://127.0.0.1:8765"}):
+                redirected = get_shared_circuit_breaker()
+            with patch.dict(os.environ, {"EDGAR_CASSETTE": "replay:cassettes/x"}):
+                self.assertIs(get_shared_circuit_breaker(), redirected)
+        self.assertIsNone(redirected.state_path)
+
+
+class TestSECDownloaderRetries(unittest.TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(throttle_threshold=10, cooldown_seconds=0)
+        self.downloader = SECDownloader(
+            user_agent="test-agent",
+            request_delay_seconds=0,
+            retry_policy=RetryPolicy(max_retries=2, base_delay=0),
+            circuit_breaker=self.breaker
+        )
+
+    def test_transient_failures_are_retried(self):
+        with patch.object(self.downloader, "_make_request", side_effect=[
+            requests.ConnectionError("reset"),
+            make_response(503, headers={"Retry-After": "0"}),
+            make_response(200, text="OK"),
+        ]) as mock_request:
+            self.assertEqual(self.downloader.download_html("https://www.sec.gov/x"), "OK")
+            self.assertEqual(mock_request.call_count, 3)
+
+    def test_non_retryable_status_raises_immediately(self):
+        with patch.object(self.downloader, "_make_request", return_value=make_response(404)) as mock_request:
+            with self.assertRaises(Exception):
+                self.downloader.download_html("https://www.sec.gov/missing")
+            self.assertEqual(mock_request.call_count, 1)
+
+    def test_gives_up_after_max_retries(self):
+        with patch.object(self.downloader, "_make_request", return_value=make_response(500)) as mock_request:
+            with self.assertRaises(Exception):
+                self.downloader.download_html("https://www.sec.gov/broken")
+            self.assertEqual(mock_request.call_count, 3)
+
+    def test_responses_that_are_not_returned_are_closed(self):
+        throttled, missing, ok = make_response(503, headers={"Retry-After": "0"}), make_response(404), make_response(200)
+        with patch.object(self.downloader, "_make_request", side_effect=[throttled, ok, missing]):
+            self.downloader._get_with_retry("https://www.sec.gov/x", stream=True)
+            with self.assertRaises(Exception):
+                self.downloader._get_with_retry("https://www.sec.gov/missing", stream=True)
+        throttled.close.assert_called_once()
+        missing.close.assert_called_once()
+        ok.close.assert_not_called()  # the caller's to read and close
+
+
+if __name__ == "__main__":
+    unittest.main()
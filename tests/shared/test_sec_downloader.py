@@ -8,7 +8,7 @@ class TestSECDownloader(unittest.TestCase):
     def setUp(self):
         self.downloader = SECDownloader(user_agent="test-agent@example.com", request_delay_seconds=0)
 
-    @patch("downloaders.sec_downloader.requests.get")
+    @patch("downloaders.http_transport.requests.Session.get")
     def test_download_html_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -18,7 +18,7 @@ class TestSECDownloader(unittest.TestCase):
         html = self.downloader.download_html("https://www.sec.gov/test")
         self.assertIn("Success", html)
 
-    @patch("downloaders.sec_downloader.requests.get")
+    @patch("downloaders.http_transport.requests.Session.get")
     def test_download_json_success(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 200
@@ -28,7 +28,7 @@ class TestSECDownloader(unittest.TestCase):
         data = self.downloader.download_json("https://www.sec.gov/test.json")
         self.assertEqual(data["test"], "value")
 
-    @patch("downloaders.sec_downloader.requests.get")
+    @patch("downloaders.http_transport.requests.Session.get")
     def test_download_method_aliases_download_html(self, mock_get):
         mock_response = MagicMock()
         mock_response.status_code = 200
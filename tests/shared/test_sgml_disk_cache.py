@@ -0,0 +1,99 @@
+# tests/shared/test_sgml_disk_cache.py
+
+import os, sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+import gzip
+import hashlib
+
+import pytest
+from downloaders.sgml_disk_cache import SgmlDiskCache
+from downloaders.sgml_downloader import SgmlDownloader
+from utils.cache_manager import SgmlCacheCatalog, clear_sgml_cache, get_catalog_path
+from utils.path_manager import build_sgml_ref_path
+
+SGML = (b"<SEC-DOCUMENT>0001234567-25-000001.txt\n<SEC-HEADER>\nCONFORMED SUBMISSION TYPE:\t4\n"
+        b"FILED AS OF DATE:\t\t20250512\n</SEC-HEADER>\n") + b"<TEXT>repetitive filing body\n" * 2000 + b"</SEC-DOCUMENT>\n"
+
+
+@pytest.fixture
+def data_root(tmp_path, monkeypatch):
+    storage = {"base_data_path": str(tmp_path)}
+    monkeypatch.setattr("utils.path_manager.STORAGE_CONFIG", storage)
+    monkeypatch.setattr("utils.cache_manager.STORAGE_CONFIG", storage)
+    return tmp_path
+
+
+def test_round_trip_is_compressed_and_content_addressed(data_root):
+    cache = SgmlDiskCache(compression="gzip")
+    path = cache.put("000123456725000001", SGML)
+
+    assert cache.contains("000123456725000001")
+    assert cache.get("000123456725000001") == SGML
+    assert os.path.basename(path) == f"{hashlib.sha256(SGML).hexdigest()}.txt.gz"
+    assert os.path.getsize(path) < len(SGML) / 5
+    assert gzip.decompress(open(path, "rb").read()) == SGML
+
+    # Identical content under another accession reuses the same object
+    assert cache.put("000123456725000002", SGML) == path
+    assert cache.get("000123456725000002") == SGML
+
+
+def test_corrupt_entry_is_dropped_as_a_miss(data_root):
+    cache = SgmlDiskCache(compression="gzip")
+    path = cache.put("000123456725000001", SGML)
+    with open(path, "wb") as f:
+        f.write(gzip.compress(b"tampered"))
+
+    assert cache.get("000123456725000001") is None
+    assert not cache.contains("000123456725000001")
+    assert not os.path.exists(build_sgml_ref_path("000123456725000001"))
+
+
+def test_old_entries_are_served_without_redownload(data_root):
+    class OfflineDownloader(SgmlDownloader):
+        def download_bytes(self, url):
+            raise AssertionError("archive files never change; the disk entry must be used")
+
+    downloader = OfflineDownloader(user_agent="test", use_cache=True, disk_cache=SgmlDiskCache(compression="gzip"))
+    downloader.write_to_cache("1234567", "0001234567-25-000001", SGML, year="2025")
+    path = downloader.disk_cache._object_path("000123456725000001")
+    os.utime(path, (0, 0))  # far older than the former 24h staleness window
+
+    doc = downloader.download_sgml("1234567", "0001234567-25-000001", year="2025")
+    assert doc.raw == SGML
+    assert downloader.read_from_cache("1234567", "000123456725000001", "2025") == SGML.decode()
+
+
+def test_clear_sgml_cache_removes_compressed_entries(data_root):
+    cache = SgmlDiskCache(compression="gzip")
+    cache.put("000123456725000001", SGML)
+    cache.put("000123456725000002", SGML + b"\n")
+
+    assert clear_sgml_cache() == 2
+    assert not cache.contains("000123456725000001")
+
+
+def test_catalog_records_header_fields_and_purges_by_form(data_root):
+    cache = SgmlDiskCache(compression="gzip")
+    cache.put("000123456725000001", SGML, cik="0001234567")
+    cache.put("000123456725000002", SGML.replace(b"TYPE:\t4", b"TYPE:\t10-K"))
+
+    entry = cache.catalog.lookup("000123456725000001")
+    assert (entry["cik"], entry["year"], entry["form_type"]) == ("1234567", "2025", "4")
+    assert entry["raw_bytes"] == len(SGML) and entry["size_bytes"] < entry["raw_bytes"]
+
+    assert clear_sgml_cache(form_type="4") == 1
+    assert not cache.contains("000123456725000001")
+    assert cache.get("000123456725000002") is not None
+
+
+def test_rebuild_catalog_from_reference_files(data_root):
+    SgmlDiskCache(compression="gzip").put("000123456725000001", SGML)
+    os.remove(get_catalog_path())
+    fresh = SgmlDiskCache(compression="gzip", catalog=SgmlCacheCatalog(get_catalog_path()))
+    assert not fresh.contains("000123456725000001")
+
+    assert fresh.rebuild_catalog() == 1
+    assert fresh.get("000123456725000001") == SGML
@@ -226,4 +226,57 @@ def test_form_named_documents_recognition():
     selected = parser._select_primary_document(random_exhibits, seq_map)
     
     # Verify that some HTML file was selected
-    assert selected in ["random1.htm", "random2.htm"]
\ No newline at end of file
+    assert selected in ["random1.htm", "random2.htm"]
+
+
+def test_index_documents_from_file_matches_in_memory(sample_content):
+    """Streaming from disk yields the same document pointers as indexing the full text."""
+    parser = SgmlDocumentIndexer("0001084869", "0000921895-25-001190", "4")
+    assert parser.index_documents_from_file(SAMPLE_FILE) == parser.index_documents(sample_content)
+
+
+def test_index_documents_accepts_raw_bytes():
+    """The byte path decodes only tag blocks yet yields the same pointers as the text path."""
+    with open(SAMPLE_FILE, "rb") as f:
+        raw = f.read()
+    indexer = SgmlDocumentIndexer("1084869", "0000921895-25-001190", "4")
+
+    from_bytes = indexer.index_documents(raw)
+    from_text = indexer.index_documents(raw.decode("utf-8", errors="replace"))
+
+    assert from_bytes
+    assert [(d.filename, d.type, d.is_primary, d.issuer_cik) for d in from_bytes] == \
+           [(d.filename, d.type, d.is_primary, d.issuer_cik) for d in from_text]
+
+
+def test_index_documents_accepts_mapped_file():
+    """A read-only mapping (or a memoryview of it) is indexed in place, like the raw bytes."""
+    from utils.sgml_buffer import map_sgml_file
+
+    indexer = SgmlDocumentIndexer("1084869", "0000921895-25-001190", "4")
+    with open(SAMPLE_FILE, "rb") as f:
+        expected = indexer.index_documents(f.read())
+
+    with map_sgml_file(SAMPLE_FILE) as mapping:
+        assert indexer.index_documents(mapping) == expected
+        view = memoryview(mapping)
+        try:
+            assert indexer.index_documents(view) == expected
+        finally:
+            view.release()
+
+
+def test_text_and_bytes_ignore_tags_quoted_in_document_bodies():
+    """Only tag lines before <TEXT> and the SEC-HEADER's <ISSUER> count, whatever the input type."""
+    sgml = (
+        "<SEC-DOCUMENT>\n<SEC-HEADER>\n</SEC-HEADER>\n"
+        "<DOCUMENT>\n<TYPE>4\n<SEQUENCE>1\n<FILENAME>form4.xml\n<TEXT>\n"
+        "<XML>quoted: <DESCRIPTION>SIGNATURES\n<ISSUER>\nCENTRAL INDEX KEY: 9999999\n</ISSUER></XML>\n"
+        "</TEXT>\n</DOCUMENT>\n"
+        "</SEC-DOCUMENT>\n"
+    )
+    indexer = SgmlDocumentIndexer("1084869", "0000921895-25-001190", "4")
+
+    from_text = indexer.index_documents(sgml)
+    assert [(d.filename, d.description, d.accessible, d.issuer_cik) for d in from_text] == [("form4.xml", "", True, None)]
+    assert from_text == indexer.index_documents(sgml.encode("utf-8"))
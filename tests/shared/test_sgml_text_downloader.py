@@ -9,11 +9,22 @@ sys.path.insert(
     )
 )
 
+import threading
+import time
 import pytest
 from downloaders.sgml_downloader import SgmlDownloader
 from models.dataclasses.sgml_text_document import SgmlTextDocument
 from utils.path_manager import build_cache_path
 
+
+def wait_until(condition, timeout=5.0):
+    """Polls `condition` until it holds, failing the test after `timeout` seconds."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for callers to join the in-flight fetch"
+        time.sleep(0.01)
+
+
 def test_cache_read_write(tmp_path, monkeypatch):
     # Setup
     cik = "0000000000"
@@ -25,6 +36,7 @@ def test_cache_read_write(tmp_path, monkeypatch):
         os.environ, "APP_CONFIG", "tests/fixtures/app_config_test.yaml"
     )
     monkeypatch.setattr("utils.path_manager.STORAGE_CONFIG", {"base_data_path": str(tmp_path)})
+    monkeypatch.setattr("utils.cache_manager.STORAGE_CONFIG", {"base_data_path": str(tmp_path)})
 
     downloader = SgmlDownloader(user_agent="test-agent", use_cache=True)
 
@@ -46,13 +58,12 @@ def test_download_sgml_uses_cache(monkeypatch):
     class MockDownloader(SgmlDownloader):
         def __init__(self):
             super().__init__(user_agent="test", use_cache=True)
-        def download_html(self, url):
+        def download_bytes(self, url):
             raise Exception("Should not call network")
 
     downloader = MockDownloader()
     monkeypatch.setattr(downloader, "read_from_cache", lambda *args: expected_doc.content)
     monkeypatch.setattr(downloader, "is_cached", lambda *args: True)
-    monkeypatch.setattr(downloader, "is_stale", lambda path, max_age_seconds: False)  # Force cache to be valid
 
     result = downloader.download_sgml(cik, accession, year="2025")
     assert isinstance(result, SgmlTextDocument)
@@ -80,8 +91,8 @@ def test_url_construction_handles_dashes_consistently(monkeypatch):
     class TestDownloader(SgmlDownloader):
         def __init__(self):
             super().__init__(user_agent="test", use_cache=True)
-        def download_html(self, url):
-            return "MOCK CONTENT"
+        def download_bytes(self, url):
+            return b"MOCK CONTENT"
     
     downloader = TestDownloader()
     
@@ -102,4 +113,359 @@ def test_url_construction_handles_dashes_consistently(monkeypatch):
     
     # The function should still receive the exact input (no dashes)
     assert url_inputs[1][0] == cik
-    assert url_inputs[1][1] == accession_no_dashes
\ No newline at end of file
+    assert url_inputs[1][1] == accession_no_dashes
+
+def test_download_many_fills_memory_cache():
+    """download_many fetches each accession once and later download_sgml calls hit memory."""
+    calls = []
+
+    class TestDownloader(SgmlDownloader):
+        def __init__(self):
+            super().__init__(user_agent="test", request_delay_seconds=0, use_cache=False, max_workers=3)
+        def download_bytes(self, url):
+            calls.append(url)
+            return f"CONTENT {url}".encode()
+
+    downloader = TestDownloader()
+    batch = [
+        ("0001234567", "0001234567-25-000001", "2025"),
+        ("0001234567", "0001234567-25-000002", "2025"),
+        ("0001234567", "0001234567-25-000003", "2025"),
+        ("0001234567", "0001234567-25-000003", "2025"),  # duplicate is skipped
+    ]
+
+    results = list(downloader.download_many(batch))
+
+    assert len(results) == 3
+    assert all(error is None for _, _, error in results)
+    assert len(calls) == 3
+
+    doc = downloader.download_sgml("0001234567", "0001234567-25-000002", year="2025")
+    assert "000123456725000002" in doc.content
+    assert len(calls) == 3
+
+
+def test_download_many_reports_failures_without_aborting_batch():
+    class TestDownloader(SgmlDownloader):
+        def __init__(self):
+            super().__init__(user_agent="test", request_delay_seconds=0, use_cache=False)
+        def download_bytes(self, url):
+            if "000123456725000002" in url:
+                raise Exception("Failed to fetch URL")
+            return b"OK"
+
+    downloader = TestDownloader()
+    results = {
+        acc: (doc, error) for acc, doc, error in downloader.download_many([
+            ("0001234567", "0001234567-25-000001", "2025"),
+            ("0001234567", "0001234567-25-000002", "2025"),
+        ])
+    }
+
+    assert results["0001234567-25-000001"][0].content == "OK"
+    assert results["0001234567-25-000002"][0] is None
+    assert isinstance(results["0001234567-25-000002"][1], Exception)
+
+
+class FakeStreamResponse:
+    def __init__(self, body: bytes, status_code: int = 206):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {}
+        self.closed = False
+        self.bytes_read = 0
+    def iter_content(self, chunk_size=8192):
+        for i in range(0, len(self.body), chunk_size):
+            self.bytes_read += len(self.body[i:i + chunk_size])
+            yield self.body[i:i + chunk_size]
+    def close(self):
+        self.closed = True
+
+
+def test_download_sgml_header_stops_at_header_end(monkeypatch):
+    header = b"<SEC-HEADER>\n<ISSUER>\nCENTRAL INDEX KEY: 0000320193\n</ISSUER>\n</SEC-HEADER>"
+    response = FakeStreamResponse(header + b"\n<DOCUMENT>" + b"x" * 100000, status_code=206)
+    sent_headers = {}
+
+    downloader = SgmlDownloader(user_agent="test", request_delay_seconds=0, use_cache=False)
+
+    def fake_make_request(url, headers=None, **kwargs):
+        sent_headers.update(headers or {})
+        return response
+    monkeypatch.setattr(downloader, "_make_request", fake_make_request)
+    monkeypatch.setattr(downloader, "download_bytes", lambda url: pytest.fail("full fetch not expected"))
+
+    result = downloader.download_sgml_header("0000320193", "0000320193-25-000001")
+
+    assert result.endswith("</SEC-HEADER>")
+    assert "0000320193" in result
+    assert sent_headers["Range"].startswith("bytes=0-")
+    assert response.closed
+    assert response.bytes_read < 20000
+
+
+def test_download_sgml_header_falls_back_to_full_fetch(monkeypatch):
+    downloader = SgmlDownloader(user_agent="test", request_delay_seconds=0, use_cache=False)
+    monkeypatch.setattr(downloader, "_make_request",
+                        lambda url, headers=None, **kwargs: FakeStreamResponse(b"no header here" * 10))
+    monkeypatch.setattr(downloader, "download_bytes", lambda url: b"FULL SUBMISSION")
+
+    result = downloader.download_sgml_header("0000320193", "0000320193-25-000001", max_bytes=64)
+    assert result == "FULL SUBMISSION"
+
+
+def test_same_accession_under_different_cik_is_fetched_once():
+    """Memory cache is keyed by accession, so the issuer-CIK re-download is a cache hit."""
+    calls = []
+
+    class TestDownloader(SgmlDownloader):
+        def __init__(self):
+            super().__init__(user_agent="test", request_delay_seconds=0, use_cache=False)
+        def download_bytes(self, url):
+            calls.append(url)
+            return b"<SEC-HEADER>...</SEC-HEADER>"
+
+    downloader = TestDownloader()
+    owner_doc = downloader.download_sgml("0001111111", "0000320193-25-000001", year="2025")
+    issuer_doc = downloader.download_sgml("0000320193", "000032019325000001", year="2025")
+
+    assert len(calls) == 1
+    assert issuer_doc.cik == "0000320193"
+    assert issuer_doc.raw is owner_doc.raw
+
+    from utils.url_builder import construct_sgml_txt_url
+    other_url = construct_sgml_txt_url("0002222222", "0000320193-25-000001")
+    assert downloader.has_in_memory_cache(other_url)
+    assert downloader.get_from_memory_cache(other_url) == owner_doc.content
+
+
+def test_download_sgml_to_file_streams_without_memory_cache(tmp_path, monkeypatch):
+    import hashlib
+    body = b"<SEC-HEADER></SEC-HEADER>\n<DOCUMENT>\n<TYPE>S-1\n" + b"y" * 300000 + b"\n</DOCUMENT>\n"
+    downloader = SgmlDownloader(user_agent="test", request_delay_seconds=0, use_cache=False)
+    monkeypatch.setattr(downloader, "_make_request",
+                        lambda url, headers=None, **kwargs: FakeStreamResponse(body, status_code=200))
+    monkeypatch.setattr(downloader, "download_bytes", lambda url: pytest.fail("in-memory fetch not expected"))
+
+    path = str(tmp_path / "raw" / "0000320193-25-000001.txt")
+    sgml_file = downloader.download_sgml_to_file("0000320193", "0000320193-25-000001", path)
+
+    assert sgml_file.size_bytes == len(body)
+    assert sgml_file.sha256 == hashlib.sha256(body).hexdigest()
+    assert open(path, "rb").read() == body
+    assert not os.path.exists(path + ".part")
+    assert len(downloader.memory_cache) == 0
+
+
+def test_download_sgml_to_file_reuses_only_a_recorded_intact_file(tmp_path, monkeypatch):
+    monkeypatch.setitem(__import__("utils.path_manager").path_manager.STORAGE_CONFIG, "base_data_path", str(tmp_path))
+    body = b"<SEC-DOCUMENT>\n<SEC-HEADER></SEC-HEADER>\n</SEC-DOCUMENT>\n"
+    fetches = []
+    downloader = SgmlDownloader(user_agent="test", request_delay_seconds=0, use_cache=False)
+    monkeypatch.setattr(downloader, "_make_request",
+                        lambda url, headers=None, **kwargs: fetches.append(url) or FakeStreamResponse(body, status_code=200))
+
+    path = str(tmp_path / "raw" / "sgml" / "0000320193" / "2025" / "4" / "000032019325000001" / "0000320193-25-000001.txt")
+    os.makedirs(os.path.dirname(path))
+    with open(path, "wb") as f:
+        f.write(body[:20])  # left behind by an interrupted writer
+
+    downloader.download_sgml_to_file("0000320193", "0000320193-25-000001", path)
+    assert open(path, "rb").read() == body and len(fetches) == 1
+
+    assert downloader.download_sgml_to_file("0000320193", "0000320193-25-000001", path).size_bytes == len(body)
+    assert len(fetches) == 1  # the recorded file is reused
+
+
+def test_prefetch_async_warms_memory_cache_and_evict_releases_it():
+    calls = []
+
+    class TestDownloader(SgmlDownloader):
+        def __init__(self):
+            super().__init__(user_agent="test", request_delay_seconds=0, use_cache=False, max_workers=2)
+        def download_bytes(self, url):
+            calls.append(url)
+            return f"CONTENT {url}".encode()
+
+    downloader = TestDownloader()
+    future = downloader.prefetch_async("0001234567", "0001234567-25-000001", "2025")
+    assert future.result().accession_number == "0001234567-25-000001"
+
+    downloader.download_sgml("0007654321", "0001234567-25-000001", year="2025")
+    assert len(calls) == 1
+    from utils.url_builder import construct_sgml_txt_url
+    issuer_url = construct_sgml_txt_url("0001234567", "0001234567-25-000001")
+    assert downloader.memory_cache.has_url(issuer_url)
+
+    downloader.evict("000123456725000001")
+    assert len(downloader.memory_cache) == 0
+    assert not downloader.memory_cache.has_url(issuer_url)
+    assert downloader.memory_cache.releases == 1
+    downloader.shutdown_prefetch()
+
+
+def test_concurrent_requests_for_same_accession_share_one_fetch():
+    """Callers arriving while a fetch is in flight wait for it instead of issuing their own."""
+    calls = []
+    release = threading.Event()
+
+    class TestDownloader(SgmlDownloader):
+        def __init__(self):
+            super().__init__(user_agent="test", request_delay_seconds=0, use_cache=False)
+        def download_bytes(self, url):
+            calls.append(url)
+            release.wait(timeout=5)
+            return b"<SEC-HEADER>...</SEC-HEADER>"
+
+    downloader = TestDownloader()
+    results = []
+    threads = [
+        threading.Thread(target=lambda cik=cik: results.append(
+            downloader.download_sgml(cik, "0000320193-25-000001", year="2025")))
+        for cik in ("0000320193", "0001111111", "0000320193")
+    ]
+    for t in threads:
+        t.start()
+    wait_until(lambda: downloader.coalesced_requests >= 2)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert sorted(doc.cik for doc in results) == ["0000320193", "0000320193", "0001111111"]
+    assert all(doc.content == "<SEC-HEADER>...</SEC-HEADER>" for doc in results)
+    assert downloader._inflight == {}
+
+
+def test_single_flight_shares_failure_and_next_call_retries():
+    attempts = []
+    release = threading.Event()
+
+    class TestDownloader(SgmlDownloader):
+        def __init__(self):
+            super().__init__(user_agent="test", request_delay_seconds=0, use_cache=False)
+        def download_bytes(self, url):
+            attempts.append(url)
+            if len(attempts) == 1:
+                release.wait(timeout=5)
+                raise Exception("Failed to fetch URL")
+            return b"OK"
+
+    downloader = TestDownloader()
+    errors = []
+
+    def fetch():
+        try:
+            downloader.download_sgml("0000320193", "0000320193-25-000001", year="2025")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=fetch) for _ in range(2)]
+    for t in threads:
+        t.start()
+    wait_until(lambda: downloader.coalesced_requests >= 1)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(errors) == 2 and len(attempts) == 1
+    assert downloader.download_sgml("0000320193", "0000320193-25-000001", year="2025").content == "OK"
+
+
+def test_downloaded_submission_stays_bytes_until_text_is_needed(tmp_path, monkeypatch):
+    body = "<SEC-HEADER>\nCOMPANY CONFORMED NAME: CAFÉ CORP\n</SEC-HEADER>\n<DOCUMENT>\n".encode("utf-8")
+    downloader = SgmlDownloader(user_agent="test", request_delay_seconds=0, use_cache=False)
+    monkeypatch.setattr(downloader, "download_bytes", lambda url: body)
+
+    doc = downloader.download_sgml("0000320193", "0000320193-25-000001", year="2025")
+    assert doc.data is body
+    assert doc._content is None  # not decoded by the download itself
+
+    path = str(tmp_path / "0000320193-25-000001.txt")
+    downloader.download_sgml_to_file("0000320193", "0000320193-25-000001", path)
+    assert open(path, "rb").read() == body
+    assert "CAFÉ CORP" in doc.content
+
+
+def test_memory_cache_evicts_least_recently_used_within_byte_budget():
+    class TestDownloader(SgmlDownloader):
+        def __init__(self):
+            super().__init__(user_agent="test", request_delay_seconds=0, use_cache=False, memory_cache_max_bytes=250)
+        def download_bytes(self, url):
+            return b"x" * 100
+
+    downloader = TestDownloader()
+    for n in (1, 2):
+        downloader.download_sgml("0001234567", f"0001234567-25-00000{n}", year="2025")
+    downloader.download_sgml("0001234567", "0001234567-25-000001", year="2025")  # hit: 1 becomes most recent
+    downloader.download_sgml("0001234567", "0001234567-25-000003", year="2025")  # evicts 2
+
+    cache = downloader.memory_cache
+    assert "000123456725000001" in cache and "000123456725000003" in cache
+    assert "000123456725000002" not in cache
+    assert cache.total_bytes == 200
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 3, 1)
+
+
+def test_memory_cache_recharges_an_entry_once_its_text_is_decoded():
+    class TestDownloader(SgmlDownloader):
+        def __init__(self):
+            super().__init__(user_agent="test", request_delay_seconds=0, use_cache=False, memory_cache_max_bytes=350)
+        def download_bytes(self, url):
+            return b"x" * 100
+
+    downloader = TestDownloader()
+    for n in (1, 2):
+        downloader.download_sgml("0001234567", f"0001234567-25-00000{n}", year="2025")
+    cache = downloader.memory_cache
+    assert cache.total_bytes == 200
+
+    assert downloader.download_sgml("0001234567", "0001234567-25-000002", year="2025").content == "x" * 100
+    assert "000123456725000001" in cache and cache.total_bytes == 300  # bytes + decoded text
+
+    downloader.download_sgml("0001234567", "0001234567-25-000001", year="2025").content
+    assert "000123456725000002" not in cache  # decoding 1 pushed the budget over
+    assert cache.total_bytes == 200 and cache.evictions == 1
+
+
+def test_read_ahead_fetches_each_submission_once_for_a_batch_over_the_memory_budget():
+    calls = []
+
+    class TestDownloader(SgmlDownloader):
+        def __init__(self):
+            super().__init__(user_agent="test", request_delay_seconds=0, use_cache=False, memory_cache_max_bytes=450)
+        def download_bytes(self, url):
+            calls.append(url)
+            return b"x" * 100
+
+    downloader = TestDownloader()
+    # 600 bytes; the budget holds the window, the current item and the one before it
+    batch = [("0001234567", f"0001234567-25-00000{n}", "2025") for n in range(1, 7)]
+    for cik, accession, year in downloader.read_ahead(batch, lambda job: job, window=2):
+        downloader.download_sgml(cik, accession, year=year)
+    downloader.shutdown_prefetch()
+
+    assert len(calls) == 6
+    assert downloader.memory_cache.stats()["hits"] >= 5
+
+
+def test_prefetch_of_a_batch_over_the_memory_budget_causes_no_repeat_fetches():
+    calls = []
+
+    class TestDownloader(SgmlDownloader):
+        def __init__(self):
+            super().__init__(user_agent="test", request_delay_seconds=0, use_cache=False,
+                             max_workers=1, memory_cache_max_bytes=350)
+        def download_bytes(self, url):
+            calls.append(url)
+            return b"x" * 100
+
+    downloader = TestDownloader()
+    batch = [("0001234567", f"0001234567-25-00000{n}", "2025") for n in range(1, 7)]  # 600 bytes
+
+    assert downloader.prefetch(batch) == 3  # a fourth would evict the first
+    for cik, accession, year in batch:
+        downloader.download_sgml(cik, accession, year=year)
+
+    assert len(calls) == 6
+    assert downloader.memory_cache.stats()["hits"] == 3
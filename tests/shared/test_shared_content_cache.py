@@ -0,0 +1,96 @@
+# tests/shared/test_shared_content_cache.py
+
+import os, sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+import hashlib
+import threading
+
+import pytest
+import requests
+from downloaders.shared_content_cache import FilesystemSharedCache, HttpSharedCache, make_shared_cache_server
+from downloaders.sgml_downloader import SgmlDownloader
+
+BODY = b"<SEC-HEADER>\n<ISSUER>\nCENTRAL INDEX KEY: 0000320193\n</ISSUER>\n</SEC-HEADER>\n<DOCUMENT>\n"
+
+
+class CountingDownloader(SgmlDownloader):
+    """One 'host': private memory cache, shared cluster cache."""
+    def __init__(self, shared_cache):
+        super().__init__(user_agent="test", request_delay_seconds=0, use_cache=False, shared_cache=shared_cache)
+        self.sec_calls = 0
+    def download_bytes(self, url):
+        self.sec_calls += 1
+        return BODY
+
+
+@pytest.fixture
+def http_cache(tmp_path):
+    server = make_shared_cache_server(str(tmp_path / "served"), port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield HttpSharedCache(f"http://127.0.0.1:{server.server_address[1]}")
+    server.shutdown()
+    server.server_close()
+
+
+def test_filesystem_cache_round_trip(tmp_path):
+    cache = FilesystemSharedCache(str(tmp_path))
+    assert cache.get("000032019325000001") is None
+    cache.put("000032019325000001", BODY)
+    assert cache.get("000032019325000001") == BODY
+    with pytest.raises(ValueError):
+        cache.path_for("../etc/passwd")
+
+
+@pytest.mark.parametrize("backend", ["filesystem", "http"])
+def test_each_submission_fetched_from_sec_once_per_cluster(tmp_path, http_cache, backend):
+    cache = FilesystemSharedCache(str(tmp_path / "nfs")) if backend == "filesystem" else http_cache
+    host_a, host_b = CountingDownloader(cache), CountingDownloader(cache)
+
+    assert host_a.download_sgml("320193", "0000320193-25-000001", "2025").raw == BODY
+    assert host_b.download_sgml("1111111", "0000320193-25-000001", "2025").raw == BODY
+    assert host_b.download_sgml_header("320193", "0000320193-25-000001")
+    assert (host_a.sec_calls, host_b.sec_calls) == (1, 0)
+
+    path = str(tmp_path / "raw" / "0000320193-25-000001.txt")
+    sgml_file = CountingDownloader(cache).download_sgml_to_file("320193", "0000320193-25-000001", path)
+    assert open(sgml_file.path, "rb").read() == BODY
+
+
+def test_unreachable_http_cache_is_a_miss():
+    cache = HttpSharedCache("http://127.0.0.1:1", timeout=0.5)
+    host = CountingDownloader(cache)
+    assert host.download_sgml("320193", "0000320193-25-000001", "2025").raw == BODY
+    assert host.sec_calls == 1
+
+
+def test_corrupted_or_unrecorded_entries_are_misses(tmp_path):
+    cache = FilesystemSharedCache(str(tmp_path))
+    cache.put("000032019325000001", BODY)
+    with open(cache.path_for("000032019325000001"), "r+b") as f:
+        f.truncate(10)
+    assert cache.get("000032019325000001") is None
+    assert not cache.get_to_file("000032019325000001", str(tmp_path / "out" / "a.txt"))
+
+    os.makedirs(os.path.dirname(cache.path_for("000032019325000002")), exist_ok=True)
+    with open(cache.path_for("000032019325000002"), "wb") as f:
+        f.write(BODY)  # body without its SHA-256 sidecar
+    assert cache.get("000032019325000002") is None
+
+
+def test_server_rejects_short_or_mismatching_bodies_and_streams_files(tmp_path, http_cache):
+    url = f"{http_cache.base_url}/000032019325000001"
+    digest = hashlib.sha256(BODY).hexdigest()
+    assert requests.put(url, data=BODY).status_code == 400  # no digest
+    assert requests.put(url, data=BODY[:-1], headers={"X-Content-SHA256": digest}).status_code == 400
+    assert http_cache.get("000032019325000001") is None
+
+    source = tmp_path / "source.txt"
+    source.write_bytes(BODY)
+    http_cache.put_file("000032019325000001", str(source))
+    target = tmp_path / "out" / "copy.txt"
+    assert http_cache.get_to_file("000032019325000001", str(target))
+    assert target.read_bytes() == BODY
+    assert http_cache.get("000032019325000001") == BODY
@@ -0,0 +1,156 @@
+# tests/shared/test_validator_store.py
+
+import sys, os
+from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
+from downloaders.validator_store import ValidatorStore
+from downloaders.retry_policy import RetryPolicy, CircuitBreaker
+from downloaders.sec_downloader import SECDownloader
+from collectors.crawler_idx.filing_metadata_collector import FilingMetadataCollector
+from collectors.submissions_api.submissions_collector import SubmissionsCollector
+
+CRAWLER_IDX = """Company Name  Form Type  CIK  Date Filed  URL
+-------------------------------------------------------------------------------
+APPLE INC  10-K  320193  20250512  https://www.sec.gov/Archives/edgar/data/320193/0000320193-25-000001-index.htm
+"""
+
+
+def make_response(status_code, text="", json_data=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    response.json.return_value = json_data
+    response.headers = headers or {}
+    return response
+
+
+def make_downloader(store):
+    return SECDownloader(
+        user_agent="test-agent",
+        request_delay_seconds=0,
+        retry_policy=RetryPolicy(max_retries=0),
+        circuit_breaker=CircuitBreaker(),
+        validator_store=store
+    )
+
+
+def test_store_builds_conditional_headers_and_persists(tmp_path):
+    state_path = str(tmp_path / "validators.sqlite3")
+    store = ValidatorStore(state_path=state_path)
+    assert store.conditional_headers("https://www.sec.gov/a") == {}
+    assert not store.record("https://www.sec.gov/b", {})
+
+    store.record("https://www.sec.gov/a", {"ETag": '"abc"', "Last-Modified": "Mon, 12 May 2025 10:00:00 GMT"})
+
+    reloaded = ValidatorStore(state_path=state_path)
+    assert reloaded.conditional_headers("https://www.sec.gov/a") == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Mon, 12 May 2025 10:00:00 GMT",
+    }
+    assert "https://www.sec.gov/b" not in reloaded
+
+
+def test_stores_sharing_a_state_file_see_each_others_records(tmp_path):
+    state_path = str(tmp_path / "validators.sqlite3")
+    first, second = ValidatorStore(state_path=state_path), ValidatorStore(state_path=state_path)
+
+    first.record("https://www.sec.gov/a", {"ETag": '"a1"'})
+    second.record("https://www.sec.gov/b", {"ETag": '"b1"'})
+
+    # Neither write overwrites the other's entry
+    assert first.conditional_headers("https://www.sec.gov/b") == {"If-None-Match": '"b1"'}
+    assert second.conditional_headers("https://www.sec.gov/a") == {"If-None-Match": '"a1"'}
+    assert len(ValidatorStore(state_path=state_path)) == 2
+
+
+def test_download_json_if_modified_returns_none_on_304(monkeypatch):
+    store = ValidatorStore()
+    downloader = make_downloader(store)
+    url = "https://data.sec.gov/submissions/CIK0000320193.json"
+    sent_headers = []
+    responses = [
+        make_response(200, json_data={"cik": "320193"}, headers={"ETag": '"v1"'}),
+        make_response(304),
+    ]
+
+    def fake_request(url, headers=None, **kwargs):
+        sent_headers.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(downloader, "_make_request", fake_request)
+
+    assert downloader.download_json_if_modified(url) == {"cik": "320193"}
+    downloader.commit_validators(url)
+    assert downloader.download_json_if_modified(url) is None
+    assert sent_headers == [None, {"If-None-Match": '"v1"'}]
+
+
+def test_json_validators_wait_for_commit(monkeypatch):
+    store = ValidatorStore()
+    downloader = make_downloader(store)
+    url = "https://data.sec.gov/submissions/CIK0000320193.json"
+    monkeypatch.setattr(downloader, "_make_request", lambda url, headers=None, **kwargs:
+                        make_response(200, json_data={"cik": "320193"}, headers={"ETag": '"v1"'}))
+
+    downloader.download_json_if_modified(url)
+    assert url not in store  # processing may still fail
+    downloader.commit_validators(url)
+    assert store.conditional_headers(url) == {"If-None-Match": '"v1"'}
+
+
+def test_crawler_idx_validators_committed_only_after_write():
+    store = ValidatorStore()
+    transport = MagicMock()
+    transport.get.side_effect = [
+        make_response(200, text=CRAWLER_IDX, headers={"ETag": '"idx1"'}),
+        make_response(200, text=CRAWLER_IDX, headers={"ETag": '"idx1"'}),
+        make_response(304),
+    ]
+    transport.is_live = False  # not throttled
+    collector = FilingMetadataCollector(user_agent="test-agent", transport=transport, validator_store=store)
+
+    # A collect whose records were never written must not make the next one conditional
+    assert len(collector.collect("2025-05-12")) == 1
+    assert len(collector.collect("2025-05-12")) == 1
+    assert "If-None-Match" not in transport.get.call_args.kwargs["headers"]
+
+    collector.commit_validators()
+    assert collector.collect("2025-05-12") is None
+    assert transport.get.call_args.kwargs["headers"]["If-None-Match"] == '"idx1"'
+
+
+def test_crawler_idx_download_is_retried_and_reported_to_the_circuit_breaker():
+    transport = MagicMock()
+    transport.is_live = False
+    transport.get.side_effect = [
+        make_response(503, headers={"Retry-After": "0"}),
+        make_response(200, text=CRAWLER_IDX),
+    ]
+    collector = FilingMetadataCollector(user_agent="test-agent", transport=transport)
+    collector.downloader.retry_policy = RetryPolicy(max_retries=1, base_delay=0)
+    collector.downloader.circuit_breaker = breaker = MagicMock()
+
+    assert len(collector.collect("2025-05-12")) == 1
+    assert transport.get.call_count == 2
+    breaker.record_throttle.assert_called_once_with(0.0)
+    breaker.record_success.assert_called_once()
+    assert breaker.wait_if_open.call_count == 2
+
+
+def test_submissions_validators_are_kept_per_forms_filter():
+    store = ValidatorStore()
+    transport = MagicMock()
+    transport.is_live = False
+    transport.get.return_value = make_response(
+        200, json_data={"filings": {"recent": {}}}, headers={"ETag": '"sub1"'})
+    collector = SubmissionsCollector(user_agent="test-agent", transport=transport, validator_store=store)
+
+    assert collector.collect("320193", forms_filter=["10-K"]) == []
+    collector.commit_validators("320193")
+
+    # Unchanged for the 10-K filter, but an 8-K collect has never been processed
+    assert collector.collect("320193", forms_filter=["8-K"]) == []
+    assert "If-None-Match" not in transport.get.call_args.kwargs["headers"]
@@ -1,7 +1,12 @@
-# tests/test_submissions_ingestion_orchestrator.py
+# tests/submissions_api/test_submissions_ingestion_orchestrator.py
 
+import sys, os
 import unittest
 from unittest.mock import MagicMock
+
+# Add project root to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
 from orchestrators.submissions_api.submissions_ingestion_orchestrator import SubmissionsIngestionOrchestrator
 
 class TestSubmissionsIngestionOrchestrator(unittest.TestCase):
@@ -34,6 +39,26 @@ class TestSubmissionsIngestionOrchestrator(unittest.TestCase):
         self.collector.collect.assert_called_once()
         self.downloader.download_html.assert_called_once()
         self.writer.write_filing.assert_called_once()
+        self.collector.commit_validators.assert_called_once_with("1234567890")
+
+    def test_unchanged_submissions_are_skipped(self):
+        self.collector.collect.return_value = None
+
+        self.orchestrator.orchestrate(cik="1234567890", limit=1)
+
+        self.downloader.download_html.assert_not_called()
+        self.collector.commit_validators.assert_not_called()
+
+    def test_failed_filing_keeps_validators_uncommitted(self):
+        self.collector.collect.return_value = [
+            {"filing_url": "https://sec.gov/fake-filing", "accessionNumber": "0001234567-23-000001",
+             "form": "8-K", "filingDate": "2023-01-01"}
+        ]
+        self.downloader.download_html.side_effect = RuntimeError("boom")
+
+        self.orchestrator.orchestrate(cik="1234567890", limit=1)
+
+        self.collector.commit_validators.assert_not_called()
 
 if __name__ == "__main__":
     unittest.main()
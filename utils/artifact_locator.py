@@ -0,0 +1,353 @@
+# utils/artifact_locator.py
+
+'''
+# Role: Accession-keyed index of every raw file stored under raw/ (SGML, XML, exhibits, HTML index)
+- RawFileWriter and SgmlDownloader.download_sgml_to_file register each file they write.
+- Any stage can then find an accession's stored SGML in one lookup, whichever CIK (issuer or
+  reporting owner) or layout it was written under, instead of rebuilding one candidate path
+  and re-downloading on a miss.
+- Backed by SQLite (raw/artifact_index.sqlite3). Files written before the index existed are
+  registered by an explicit walk of raw/ (`rebuild`, run by scripts/tools/rebuild_artifact_index.py).
+- Files are written atomically (`write_file_atomic`) and indexed with their size and SHA-256;
+  a hit is served only while the file still matches them, so a truncated or replaced file is
+  dropped from the index and re-fetched instead of parsed.
+'''
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from utils.accession_formatter import format_for_url
+from utils.path_manager import STORAGE_CONFIG
+from utils.report_logger import log_info, log_warn
+
+INDEX_FILENAME = "artifact_index.sqlite3"
+RAW_FILE_TYPES = ("sgml", "html_index", "exhibits", "xml")
+SGML_END_MARKER = b"</SEC-DOCUMENT>"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    accession  TEXT NOT NULL,  -- canonical accession (no dashes)
+    file_type  TEXT NOT NULL,  -- sgml / html_index / exhibits / xml
+    path       TEXT NOT NULL,
+    filename   TEXT NOT NULL,
+    cik        TEXT,
+    year       TEXT,
+    form_type  TEXT,
+    size_bytes INTEGER,
+    sha256     TEXT,
+    stored_at  REAL NOT NULL,
+    PRIMARY KEY (accession, path)
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_type ON artifacts(accession, file_type);
+"""
+
+
+def get_raw_root() -> str:
+    return os.path.join(STORAGE_CONFIG.get("base_data_path", "data/"), "raw")
+
+def get_artifact_index_path() -> str:
+    return os.path.join(get_raw_root(), INDEX_FILENAME)
+
+
+def write_file_atomic(path: str, data: bytes) -> Tuple[int, str]:
+    """
+    Writes `data` to `<path>.part`, fsyncs it and renames it into place, so `path` only ever
+    holds a complete file. Returns (size_bytes, sha256_hexdigest).
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    part_path = f"{path}.part"
+    try:
+        with open(part_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(part_path, path)
+    except Exception:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    return len(data), hashlib.sha256(data).hexdigest()
+
+
+def commit_part_file(part_path: str, path: str) -> Tuple[int, str]:
+    """
+    Moves a finished `<path>.part` written by someone else (e.g. a shared cache copy) into place:
+    hashes and fsyncs it, then renames it to `path`. Returns (size_bytes, sha256_hexdigest).
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(part_path, "rb") as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                size += len(chunk)
+            os.fsync(f.fileno())
+        os.replace(part_path, path)
+    except Exception:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    return size, digest.hexdigest()
+
+
+def file_digest(path: str) -> Tuple[int, str]:
+    """(size_bytes, sha256_hexdigest) of a stored file, read in chunks."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def is_complete_artifact(file_type: str, path: str) -> bool:
+    """
+    Whether a file found on disk (not written through this module) looks complete: non-empty,
+    and for SGML ending with </SEC-DOCUMENT>. Used before indexing files of unknown origin.
+    """
+    try:
+        size = os.path.getsize(path)
+        if size == 0:
+            return False
+        if file_type != "sgml":
+            return True
+        with open(path, "rb") as f:
+            f.seek(max(0, size - 256))
+            return SGML_END_MARKER in f.read()
+    except OSError:
+        return False
+
+
+class RawArtifactIndex:
+    """Maps canonical accession → stored raw files. Safe to share between threads and processes (SQLite WAL)."""
+
+    def __init__(self, db_path: str = None, raw_root: str = None):
+        self.db_path = db_path or get_artifact_index_path()
+        self.raw_root = raw_root or os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(artifacts)")}
+        if "sha256" not in columns:
+            # Index from before files were hashed: its rows are not trusted until `rebuild` hashes them
+            self._conn.execute("ALTER TABLE artifacts ADD COLUMN sha256 TEXT")
+
+    def register(self, accession_number: str, file_type: str, path: str, cik: str = None,
+                 year: str = None, form_type: str = None, size_bytes: int = None, sha256: str = None):
+        """
+        Records a stored file (replacing any earlier row for the same path) with its size and
+        SHA-256. Writers pass the values they computed while writing; otherwise the file is hashed.
+        """
+        if size_bytes is None or sha256 is None:
+            size_bytes, sha256 = file_digest(path)
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO artifacts (accession, file_type, path, filename, cik, year, form_type, size_bytes, sha256, stored_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (format_for_url(accession_number), file_type, path, os.path.basename(path),
+                 cik, year, form_type, size_bytes, sha256, time.time()),
+            )
+
+    def find(self, accession_number: str, file_type: str = "sgml", filename: str = None,
+             verify_hash: bool = False) -> Optional[str]:
+        """
+        Returns the path of a stored file of `file_type` for the accession (optionally a specific
+        `filename`), or None. The file must still have its recorded size (and, with `verify_hash`,
+        its recorded SHA-256); rows whose file was deleted or changed are dropped.
+        """
+        for row in self.artifacts(accession_number, file_type):
+            if filename and row["filename"] != filename:
+                continue
+            if self._matches(row, verify_hash):
+                return row["path"]
+            self.forget(accession_number, row["path"])
+        return None
+
+    def read(self, accession_number: str, file_type: str = "sgml") -> Optional[Tuple[str, bytes]]:
+        """
+        Reads the accession's stored file and returns (path, bytes) only if the content still
+        hashes to the recorded SHA-256; mismatching rows are dropped. Returns None otherwise.
+        """
+        for row in self.artifacts(accession_number, file_type):
+            if self._matches(row, verify_hash=False):
+                with open(row["path"], "rb") as f:
+                    data = f.read()
+                if len(data) == row["size_bytes"] and hashlib.sha256(data).hexdigest() == row["sha256"]:
+                    return row["path"], data
+                log_warn(f"[ARTIFACTS] {row['path']} no longer matches its recorded SHA-256; ignoring it")
+            self.forget(accession_number, row["path"])
+        return None
+
+    @staticmethod
+    def _matches(row: sqlite3.Row, verify_hash: bool) -> bool:
+        """Whether a row's file still exists with its recorded size (and SHA-256)."""
+        if row["size_bytes"] is None or row["sha256"] is None:
+            return False
+        try:
+            if os.path.getsize(row["path"]) != row["size_bytes"]:
+                log_warn(f"[ARTIFACTS] {row['path']} changed size since it was stored; ignoring it")
+                return False
+            if verify_hash and file_digest(row["path"])[1] != row["sha256"]:
+                log_warn(f"[ARTIFACTS] {row['path']} no longer matches its recorded SHA-256; ignoring it")
+                return False
+        except OSError:
+            return False
+        return True
+
+    def artifacts(self, accession_number: str, file_type: str = None) -> List[sqlite3.Row]:
+        """Every file registered for the accession, newest first."""
+        query = "SELECT * FROM artifacts WHERE accession = ?"
+        params = [format_for_url(accession_number)]
+        if file_type:
+            query += " AND file_type = ?"
+            params.append(file_type)
+        with self._lock:
+            return self._conn.execute(query + " ORDER BY stored_at DESC", params).fetchall()
+
+    def forget(self, accession_number: str, path: str = None):
+        with self._lock:
+            if path:
+                self._conn.execute("DELETE FROM artifacts WHERE accession = ? AND path = ?",
+                                   (format_for_url(accession_number), path))
+            else:
+                self._conn.execute("DELETE FROM artifacts WHERE accession = ?", (format_for_url(accession_number),))
+
+    def rebuild(self) -> int:
+        """
+        Registers every file under raw/ laid out as {file_type}/{cik}/{year}/{form_type}/{accession}/{filename}
+        (see build_raw_filepath_by_type), plus SGML in the former {base}/sgml/{cik}/ layout.
+        Files that look incomplete (see `is_complete_artifact`) are skipped. Returns the count registered.
+
+        Hashes every file, so it is never run implicitly: run scripts/tools/rebuild_artifact_index.py
+        once after upgrading an existing raw/ tree. Until then, files the index does not know are
+        still found through the caller's `expected_path` (see `find_stored_sgml`).
+        """
+        registered = 0
+        for file_type in RAW_FILE_TYPES:
+            type_root = os.path.join(self.raw_root, file_type)
+            for directory, _, files in os.walk(type_root):
+                parts = os.path.relpath(directory, type_root).split(os.sep)
+                if len(parts) != 4:
+                    continue
+                cik, year, form_type, accession = parts
+                for name in files:
+                    path = os.path.join(directory, name)
+                    if name.endswith((".part", ".tmp")) or not is_complete_artifact(file_type, path):
+                        continue  # interrupted or truncated writes
+                    self.register(accession, file_type, path, cik=cik, year=year, form_type=form_type.replace("_", "/"))
+                    registered += 1
+        # Former standalone Form 4 layout: {base}/sgml/{cik}/{accession}.txt
+        legacy_root = os.path.join(os.path.dirname(self.raw_root), "sgml")
+        for directory, _, files in os.walk(legacy_root):
+            for name in files:
+                path = os.path.join(directory, name)
+                if name.endswith(".txt") and is_complete_artifact("sgml", path):
+                    self.register(name[:-len(".txt")], "sgml", path, cik=os.path.basename(directory))
+                    registered += 1
+        log_info(f"[ARTIFACTS] Indexed {registered} raw files under {self.raw_root}")
+        return registered
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# One index per database file, shared by every stage in the process
+_indexes: Dict[str, RawArtifactIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_shared_artifact_index(create: bool = True) -> Optional[RawArtifactIndex]:
+    """
+    Returns the process-wide index of the current raw/ root. With `create=False`, returns None
+    instead of creating an index that does not exist yet (lookups should not build one).
+    """
+    path = get_artifact_index_path()
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            if not create and not os.path.exists(path):
+                return None
+            index = _indexes[path] = RawArtifactIndex(path)
+        return index
+
+
+def register_raw_artifact(accession_number: str, file_type: str, path: str, cik: str = None,
+                          year: str = None, form_type: str = None, size_bytes: int = None, sha256: str = None):
+    """
+    Registers a file just written under raw/ (files elsewhere are not indexed), with the size
+    and SHA-256 the writer computed (the file is hashed when they are not given).
+    Index errors are logged, never raised to the writer.
+    """
+    raw_root = os.path.abspath(get_raw_root())
+    if os.path.commonpath([raw_root, os.path.abspath(path)]) != raw_root:
+        return
+    try:
+        get_shared_artifact_index().register(accession_number, file_type, path, cik=cik, year=year,
+                                             form_type=form_type, size_bytes=size_bytes, sha256=sha256)
+    except (sqlite3.Error, OSError) as e:
+        log_warn(f"[ARTIFACTS] Failed to index {path}: {e}")
+
+
+def find_stored_sgml(accession_number: str, expected_path: str = None, verify_hash: bool = False) -> Optional[str]:
+    """
+    Path of the accession's SGML already stored on disk under any CIK, or None. Indexed files
+    must still match their recorded size (and SHA-256 with `verify_hash`).
+    `expected_path` (the caller's own layout) is checked when the index has no entry,
+    and registered if it looks complete (see `is_complete_artifact`).
+    """
+    index = get_shared_artifact_index(create=False)
+    if index is not None:
+        try:
+            path = index.find(accession_number, "sgml", verify_hash=verify_hash)
+        except sqlite3.Error as e:
+            log_warn(f"[ARTIFACTS] Lookup failed for {accession_number}: {e}")
+            path = None
+        if path:
+            return path
+    if expected_path and is_complete_artifact("sgml", expected_path):
+        register_raw_artifact(accession_number, "sgml", expected_path)
+        return expected_path
+    return None
+
+
+def is_recorded_artifact(accession_number: str, path: str) -> bool:
+    """
+    Whether `path` is indexed for the accession and still has the size and SHA-256 recorded when
+    it was written. A file nobody recorded (or that changed since) is not trusted.
+    """
+    index = get_shared_artifact_index(create=False)
+    if index is None:
+        return False
+    try:
+        return index.find(accession_number, "sgml", filename=os.path.basename(path), verify_hash=True) == path
+    except (sqlite3.Error, OSError) as e:
+        log_warn(f"[ARTIFACTS] Lookup failed for {accession_number}: {e}")
+        return False
+
+
+def read_stored_sgml(accession_number: str) -> Optional[Tuple[str, bytes]]:
+    """
+    (path, bytes) of the accession's indexed SGML, verified against its recorded size and
+    SHA-256, or None when there is no intact stored copy.
+    """
+    index = get_shared_artifact_index(create=False)
+    if index is None:
+        return None
+    try:
+        return index.read(accession_number, "sgml")
+    except (sqlite3.Error, OSError) as e:
+        log_warn(f"[ARTIFACTS] Failed to read stored SGML for {accession_number}: {e}")
+        return None
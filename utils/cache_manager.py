@@ -1,36 +1,283 @@
 import os
 import shutil
-from utils.path_manager import STORAGE_CONFIG
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config.config_loader import ConfigLoader
+from utils.path_manager import STORAGE_CONFIG, build_sgml_ref_path
+from utils.report_logger import log_info, log_warn
+
+# Load config once at module import
+DISK_CACHE_CONFIG = (ConfigLoader.load_config().get("sec_downloader", {}) or {}).get("disk_cache", {}) or {}
+
+CATALOG_FILENAME = "catalog.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    accession   TEXT PRIMARY KEY,
+    object_path TEXT NOT NULL,
+    sha256      TEXT NOT NULL,
+    size_bytes  INTEGER NOT NULL,  -- compressed size on disk
+    raw_bytes   INTEGER NOT NULL,  -- submission size
+    cik         TEXT,
+    year        TEXT,
+    form_type   TEXT,
+    created_at  REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access);
+CREATE INDEX IF NOT EXISTS idx_entries_sha256 ON entries(sha256);
+CREATE INDEX IF NOT EXISTS idx_entries_cik ON entries(cik);
+CREATE INDEX IF NOT EXISTS idx_entries_year ON entries(year);
+CREATE INDEX IF NOT EXISTS idx_entries_form_type ON entries(form_type);
+
+-- Running totals kept by triggers, so size checks never scan the table
+CREATE TABLE IF NOT EXISTS totals (
+    id         INTEGER PRIMARY KEY CHECK (id = 1),
+    entries    INTEGER NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    raw_bytes  INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES (1, 0, 0, 0);
+
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET entries = entries + 1,
+                      size_bytes = size_bytes + NEW.size_bytes,
+                      raw_bytes = raw_bytes + NEW.raw_bytes;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET entries = entries - 1,
+                      size_bytes = size_bytes - OLD.size_bytes,
+                      raw_bytes = raw_bytes - OLD.raw_bytes;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size_bytes, raw_bytes ON entries BEGIN
+    UPDATE totals SET size_bytes = size_bytes - OLD.size_bytes + NEW.size_bytes,
+                      raw_bytes = raw_bytes - OLD.raw_bytes + NEW.raw_bytes;
+END;
+"""
+
 
 def get_cache_root() -> str:
     return os.path.join(STORAGE_CONFIG.get("base_data_path", "data/"), "cache_sgml")
 
-def clear_sgml_cache(cik: str = None, year: str = None) -> int:
+def get_catalog_path() -> str:
+    return os.path.join(get_cache_root(), CATALOG_FILENAME)
+
+
+class SgmlCacheCatalog:
     """
-    Deletes SGML cache files by optional cik or year.
-    Returns count of deleted files.
+    SQLite index of the compressed SGML disk cache (downloaders/sgml_disk_cache.py).
+
+    One row per cached accession records its object path, sizes, hash, CIK/year/form and
+    last access, so lookups, purges and size checks never walk the cache directory.
+    With `max_bytes` set, least recently used entries are evicted once the total is
+    exceeded; with `max_idle_days` set, entries not read for that long are evicted too.
+    Safe to share between threads and processes (SQLite WAL).
     """
-    cache_root = get_cache_root()
-    deleted = 0
 
-    if not os.path.exists(cache_root):
-        return 0
+    def __init__(self, db_path: str = None, max_bytes: int = None, max_idle_days: float = None):
+        self.db_path = db_path or get_catalog_path()
+        self.max_bytes = max_bytes
+        self.max_idle_days = max_idle_days
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def lookup(self, accession: str) -> Optional[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute("SELECT * FROM entries WHERE accession = ?", (accession,)).fetchone()
+
+    def touch(self, accession: str):
+        with self._lock:
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE accession = ?", (time.time(), accession))
+
+    def record(self, accession: str, object_path: str, sha256: str, size_bytes: int, raw_bytes: int,
+               cik: str = None, year: str = None, form_type: str = None):
+        """Adds or replaces the entry for an accession, then applies the size / idle limits."""
+        now = time.time()
+        cik = _normalize_cik(cik)
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO entries (accession, object_path, sha256, size_bytes, raw_bytes, cik, year, form_type, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(accession) DO UPDATE SET
+                    object_path = excluded.object_path, sha256 = excluded.sha256,
+                    size_bytes = excluded.size_bytes, raw_bytes = excluded.raw_bytes,
+                    cik = COALESCE(excluded.cik, cik), year = COALESCE(excluded.year, year),
+                    form_type = COALESCE(excluded.form_type, form_type), last_access = excluded.last_access
+                """,
+                (accession, object_path, sha256, size_bytes, raw_bytes, cik, year, form_type, now, now),
+            )
+        self.enforce_limits()
 
-    for root, dirs, files in os.walk(cache_root):
-        for file in files:
-            if not file.endswith(".txt"):
-                continue
-            path = os.path.join(root, file)
+    def remove(self, accession: str) -> bool:
+        """Drops an accession and deletes its files (the object only if no other accession shares it)."""
+        row = self.lookup(accession)
+        return row is not None and self._delete([row]) == 1
 
-            if cik and cik not in path:
-                continue
-            if year and f"{os.sep}{year}{os.sep}" not in path:
-                continue
+    def enforce_limits(self) -> int:
+        """Evicts idle entries, then least recently used ones while over `max_bytes`. Returns the count."""
+        evicted = 0
+        if self.max_idle_days:
+            evicted += self.purge(idle_days=self.max_idle_days)
+        if self.max_bytes:
+            while True:
+                with self._lock:
+                    excess = self._conn.execute("SELECT size_bytes FROM totals").fetchone()[0] - self.max_bytes
+                    if excess <= 0:
+                        break
+                    rows = self._conn.execute(
+                        "SELECT * FROM entries ORDER BY last_access LIMIT 100"
+                    ).fetchall()
+                victims, freed = [], 0
+                for row in rows:
+                    victims.append(row)
+                    freed += row["size_bytes"]
+                    if freed >= excess:
+                        break
+                if not victims:
+                    break
+                evicted += self._delete(victims)
+        if evicted:
+            log_info(f"[CACHE-CATALOG] Evicted {evicted} SGML cache entries")
+        return evicted
 
+    def purge(self, cik: str = None, year: str = None, form_type: str = None, idle_days: float = None) -> int:
+        """Deletes every entry matching all given filters (all entries when none is given). Returns the count."""
+        clauses, params = [], []
+        for column, value in (("cik", _normalize_cik(cik)), ("year", year), ("form_type", form_type)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(str(value))
+        if idle_days:
+            clauses.append("last_access < ?")
+            params.append(time.time() - idle_days * 86400)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT * FROM entries{where}", params).fetchall()
+        return self._delete(rows)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            totals = self._conn.execute("SELECT entries, size_bytes, raw_bytes FROM totals").fetchone()
+            oldest = self._conn.execute("SELECT MIN(last_access) FROM entries").fetchone()[0]
+        return {
+            "entries": totals["entries"],
+            "bytes": totals["size_bytes"],
+            "raw_bytes": totals["raw_bytes"],
+            "compression_ratio": round(totals["raw_bytes"] / totals["size_bytes"], 2) if totals["size_bytes"] else None,
+            "max_bytes": self.max_bytes,
+            "oldest_access": oldest,
+        }
+
+    def _delete(self, rows: List[sqlite3.Row]) -> int:
+        if not rows:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("DELETE FROM entries WHERE accession = ?", [(row["accession"],) for row in rows])
+                orphaned = {
+                    row["object_path"] for row in rows
+                    if not self._conn.execute("SELECT 1 FROM entries WHERE sha256 = ? LIMIT 1", (row["sha256"],)).fetchone()
+                }
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        for path in [build_sgml_ref_path(row["accession"]) for row in rows] + sorted(orphaned):
             try:
                 os.remove(path)
-                deleted += 1
-            except Exception as e:
-                print(f"⚠️ Failed to delete {path}: {e}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                log_warn(f"[CACHE-CATALOG] Failed to delete {path}: {e}")
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _normalize_cik(cik: Optional[str]) -> Optional[str]:
+    """CIKs are catalogued without zero padding, so '0000320193' and '320193' match."""
+    return str(cik).lstrip("0") or "0" if cik else None
+
+
+# One catalog per database file, shared by every downloader in the process
+_catalogs: Dict[str, SgmlCacheCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_shared_cache_catalog() -> SgmlCacheCatalog:
+    """
+    Returns the process-wide catalog of the current cache root, with the limits set under
+    `sec_downloader.disk_cache` in app_config.yaml (`max_mb`, `max_idle_days`; null = unlimited).
+    """
+    path = get_catalog_path()
+    with _catalogs_lock:
+        catalog = _catalogs.get(path)
+        if catalog is None:
+            max_mb = DISK_CACHE_CONFIG.get("max_mb")
+            catalog = _catalogs[path] = SgmlCacheCatalog(
+                path,
+                max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+                max_idle_days=DISK_CACHE_CONFIG.get("max_idle_days"),
+            )
+        return catalog
+
+
+def clear_sgml_cache(cik: str = None, year: str = None, form_type: str = None) -> int:
+    """
+    Deletes SGML cache entries by optional cik, year or form type (all entries when none is given).
+    Returns count of deleted entries.
+
+    Compressed entries are purged through the catalog; legacy plain-text files under
+    cache_sgml/YYYY/CIK/ (which carry no form type) are removed by cik / year.
+    """
+    cache_root = get_cache_root()
+    if not os.path.exists(cache_root):
+        return 0
+
+    deleted = get_shared_cache_catalog().purge(cik=cik, year=year, form_type=form_type)
+    if not cik and not year and not form_type:
+        # Anything left uncatalogued (e.g. written before the catalog existed)
+        for subdir in ("accessions", "objects"):
+            shutil.rmtree(os.path.join(cache_root, subdir), ignore_errors=True)
+    if form_type:
+        return deleted
+
+    # Legacy layout: only the YYYY/ directories, never the compressed store
+    for entry in os.scandir(cache_root):
+        if not entry.is_dir() or not entry.name.isdigit():
+            continue
+        if year and entry.name != str(year):
+            continue
+        for root, dirs, files in os.walk(entry.path):
+            for file in files:
+                if not file.endswith(".txt"):
+                    continue
+                path = os.path.join(root, file)
+
+                if cik and cik not in path:
+                    continue
+
+                try:
+                    os.remove(path)
+                    deleted += 1
+                except Exception as e:
+                    print(f"⚠️ Failed to delete {path}: {e}")
 
     return deleted
+
+
+def sgml_cache_stats() -> Dict:
+    """Entry count, on-disk and uncompressed bytes, and compression ratio of the SGML disk cache."""
+    return get_shared_cache_catalog().stats()
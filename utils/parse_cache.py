@@ -0,0 +1,256 @@
+# utils/parse_cache.py
+
+'''
+# Role: Versioned cache of indexer outputs, keyed by (SGML content hash, parser version)
+- Form4Orchestrator stores what Form4SgmlIndexer.index_documents returns, so re-runs
+  (`reprocess=True` from DailyIngestionPipeline, `--retry-failed`) of unchanged filings skip
+  the XML parse, the legacy fallback and transaction building and go straight to the write stage.
+- Results are pickled and zlib-compressed into SQLite (cache_parsed/parse_cache.sqlite3).
+- Each indexer declares a PARSER_VERSION; entries of any other version are never returned and
+  are deleted the first time the new version is used, so bumping it invalidates the cache.
+'''
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Set, Tuple
+
+from config.config_loader import ConfigLoader
+from utils.path_manager import STORAGE_CONFIG
+from utils.report_logger import log_info, log_warn
+from utils.sgml_buffer import as_searchable, is_sgml_buffer
+
+# Load config once at module import
+PARSE_CACHE_CONFIG = ConfigLoader.load_config().get("parse_cache", {}) or {}
+
+CACHE_FILENAME = "parse_cache.sqlite3"
+COMPRESSION_LEVEL = 6
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    parser         TEXT NOT NULL,  -- indexer name, e.g. "form4"
+    version        TEXT NOT NULL,  -- the indexer's PARSER_VERSION when stored
+    content_sha256 TEXT NOT NULL,
+    context        TEXT NOT NULL,  -- other inputs the output depends on (e.g. the indexer's CIK)
+    payload        BLOB NOT NULL,  -- zlib-compressed pickle
+    size_bytes     INTEGER NOT NULL,
+    created_at     REAL NOT NULL,
+    last_access    REAL NOT NULL,
+    PRIMARY KEY (parser, content_sha256, context)
+);
+CREATE INDEX IF NOT EXISTS idx_results_last_access ON results(last_access);
+CREATE INDEX IF NOT EXISTS idx_results_version ON results(parser, version);
+
+-- Running total kept by triggers, so size checks never scan the table
+CREATE TABLE IF NOT EXISTS totals (
+    id         INTEGER PRIMARY KEY CHECK (id = 1),
+    entries    INTEGER NOT NULL,
+    size_bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES (1, 0, 0);
+
+CREATE TRIGGER IF NOT EXISTS results_insert AFTER INSERT ON results BEGIN
+    UPDATE totals SET entries = entries + 1, size_bytes = size_bytes + NEW.size_bytes;
+END;
+CREATE TRIGGER IF NOT EXISTS results_delete AFTER DELETE ON results BEGIN
+    UPDATE totals SET entries = entries - 1, size_bytes = size_bytes - OLD.size_bytes;
+END;
+CREATE TRIGGER IF NOT EXISTS results_update AFTER UPDATE OF size_bytes ON results BEGIN
+    UPDATE totals SET size_bytes = size_bytes - OLD.size_bytes + NEW.size_bytes;
+END;
+"""
+
+
+def get_parse_cache_path() -> str:
+    return os.path.join(STORAGE_CONFIG.get("base_data_path", "data/"), "cache_parsed", CACHE_FILENAME)
+
+
+def content_sha256(content) -> Optional[str]:
+    """
+    SHA-256 of SGML content given as text (hashed as UTF-8) or bytes / mmap / memoryview
+    (hashed in place). Returns None for anything else.
+    """
+    if isinstance(content, str):
+        return hashlib.sha256(content.encode("utf-8", errors="replace")).hexdigest()
+    if is_sgml_buffer(content):
+        return hashlib.sha256(as_searchable(content)).hexdigest()
+    return None
+
+
+class ParseResultCache:
+    """
+    SQLite store of serialized indexer outputs. With `max_bytes` set, least recently used
+    results are evicted once the total is exceeded. Safe to share between threads and
+    processes (SQLite WAL).
+    """
+
+    def __init__(self, db_path: str = None, max_bytes: int = None):
+        self.db_path = db_path or get_parse_cache_path()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._current: Set[Tuple[str, str]] = set()  # (parser, version) pairs already cleaned up
+
+    def get(self, parser: str, version: str, content_hash: str, context: str = "") -> Optional[Any]:
+        """Returns the stored result for this content and parser version, or None. Errors are misses."""
+        # Reads never create the database: a cache that was never written is simply empty
+        if self._conn is None and not os.path.exists(self.db_path):
+            self.misses += 1
+            return None
+        try:
+            self._drop_other_versions(parser, version)
+            with self._lock:
+                row = self._connection().execute(
+                    "SELECT payload FROM results WHERE parser = ? AND version = ? AND content_sha256 = ? AND context = ?",
+                    (parser, str(version), content_hash, context),
+                ).fetchone()
+        except sqlite3.Error as e:
+            log_warn(f"[PARSE-CACHE] Lookup failed for {parser} result {content_hash[:12]}: {e}")
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        try:
+            result = pickle.loads(zlib.decompress(row["payload"]))
+        except Exception as e:  # unpicklable after a class change, or a corrupt blob
+            log_warn(f"[PARSE-CACHE] Dropping unreadable {parser} result {content_hash[:12]}: {e}")
+            self.remove(parser, content_hash, context)
+            self.misses += 1
+            return None
+        with self._lock:
+            self._connection().execute(
+                "UPDATE results SET last_access = ? WHERE parser = ? AND content_sha256 = ? AND context = ?",
+                (time.time(), parser, content_hash, context),
+            )
+        self.hits += 1
+        return result
+
+    def put(self, parser: str, version: str, content_hash: str, result: Any, context: str = "") -> bool:
+        """Stores a result (replacing any earlier version's). Returns False if it could not be stored."""
+        try:
+            payload = zlib.compress(pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL), COMPRESSION_LEVEL)
+        except Exception as e:
+            log_warn(f"[PARSE-CACHE] Cannot serialize {parser} result {content_hash[:12]}: {e}")
+            return False
+        now = time.time()
+        try:
+            self._drop_other_versions(parser, version)
+            with self._lock:
+                self._connection().execute(
+                    """
+                    INSERT OR REPLACE INTO results (parser, version, content_sha256, context, payload, size_bytes, created_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (parser, str(version), content_hash, context, payload, len(payload), now, now),
+                )
+            self.enforce_limits()
+        except sqlite3.Error as e:
+            log_warn(f"[PARSE-CACHE] Failed to store {parser} result {content_hash[:12]}: {e}")
+            return False
+        return True
+
+    def remove(self, parser: str, content_hash: str, context: str = ""):
+        with self._lock:
+            self._connection().execute(
+                "DELETE FROM results WHERE parser = ? AND content_sha256 = ? AND context = ?",
+                (parser, content_hash, context),
+            )
+
+    def enforce_limits(self) -> int:
+        """Evicts least recently used results while over `max_bytes`. Returns the count."""
+        if not self.max_bytes:
+            return 0
+        with self._lock:
+            conn = self._connection()
+            excess = conn.execute("SELECT size_bytes FROM totals").fetchone()[0] - self.max_bytes
+            if excess <= 0:
+                return 0
+            victims, freed = [], 0
+            for row in conn.execute("SELECT rowid, size_bytes FROM results ORDER BY last_access LIMIT 1000").fetchall():
+                victims.append((row["rowid"],))
+                freed += row["size_bytes"]
+                if freed >= excess:
+                    break
+            conn.executemany("DELETE FROM results WHERE rowid = ?", victims)
+        log_info(f"[PARSE-CACHE] Evicted {len(victims)} parse results")
+        return len(victims)
+
+    def clear(self, parser: str = None) -> int:
+        """Deletes every result (of one parser when given). Returns the count."""
+        if self._conn is None and not os.path.exists(self.db_path):
+            return 0
+        with self._lock:
+            if parser:
+                return self._connection().execute("DELETE FROM results WHERE parser = ?", (parser,)).rowcount
+            return self._connection().execute("DELETE FROM results").rowcount
+
+    def stats(self) -> Dict:
+        entries = size_bytes = 0
+        if self._conn is not None or os.path.exists(self.db_path):
+            with self._lock:
+                totals = self._connection().execute("SELECT entries, size_bytes FROM totals").fetchone()
+            entries, size_bytes = totals["entries"], totals["size_bytes"]
+        return {
+            "entries": entries,
+            "bytes": size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _drop_other_versions(self, parser: str, version: str):
+        """Deletes a parser's results from other versions, once per (parser, version) and instance."""
+        if (parser, str(version)) in self._current:
+            return
+        with self._lock:
+            dropped = self._connection().execute(
+                "DELETE FROM results WHERE parser = ? AND version != ?", (parser, str(version))
+            ).rowcount
+            self._current.add((parser, str(version)))
+        if dropped:
+            log_info(f"[PARSE-CACHE] Invalidated {dropped} {parser} results from other parser versions (now {version})")
+
+    def _connection(self) -> sqlite3.Connection:
+        # Called with self._lock held; the database is created on first use
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+
+# One cache per database file, shared by every orchestrator in the process
+_caches: Dict[str, ParseResultCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_shared_parse_cache() -> Optional[ParseResultCache]:
+    """
+    Returns the process-wide parse cache of the current data root, or None when
+    `parse_cache.enabled` is false in app_config.yaml. `max_mb` (null = unlimited) caps its size.
+    """
+    if not PARSE_CACHE_CONFIG.get("enabled", True):
+        return None
+    path = get_parse_cache_path()
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            max_mb = PARSE_CACHE_CONFIG.get("max_mb")
+            cache = _caches[path] = ParseResultCache(path, max_bytes=int(max_mb * 1024 * 1024) if max_mb else None)
+        return cache
@@ -139,3 +139,26 @@ def build_cache_path(cik: str, accession: str, year: str = None) -> str:
     filename = f"{accession}.txt"
     return os.path.join(cache_dir, filename)
 
+def build_sgml_object_path(sha256: str, extension: str) -> str:
+    """
+    Returns path to a compressed SGML submission in the content-addressed disk cache.
+    E.g. /data/cache_sgml/objects/ab/abcdef....txt.gz
+    """
+    base_path = STORAGE_CONFIG.get("base_data_path", "data/")
+    return os.path.join(base_path, "cache_sgml", "objects", sha256[:2], f"{sha256}.txt{extension}")
+
+def build_sgml_ref_path(accession_key: str) -> str:
+    """
+    Returns path to the accession → object reference of the SGML disk cache.
+    E.g. /data/cache_sgml/accessions/01/000143774925013001.ref
+    """
+    base_path = STORAGE_CONFIG.get("base_data_path", "data/")
+    return os.path.join(base_path, "cache_sgml", "accessions", accession_key[-2:], f"{accession_key}.ref")
+
+def build_full_index_path(year: int, quarter: int, filename: str) -> str:
+    """
+    Returns the local path for a quarterly full-index file (crawler.idx, master.gz).
+    E.g. /data/raw/full_index/2024/QTR1/master.gz
+    """
+    base_path = STORAGE_CONFIG.get("base_data_path", "data/")
+    return os.path.join(base_path, "raw", "full_index", str(year), f"QTR{quarter}", filename)
@@ -0,0 +1,62 @@
+# utils/sgml_buffer.py
+
+'''
+# Role: Zero-copy, read-only views of stored SGML submissions for the indexers
+- open_sgml_mapping() / map_sgml_file() memory-map a stored .txt submission. Pages are read
+  lazily as the indexers search it, so no whole-file bytes or str is ever allocated.
+- SgmlDocumentIndexer, Form4SgmlIndexer and extract_issuer_cik_from_sgml accept any
+  SGML_BUFFER_TYPES source, locate tags with `find` and decode only the slices they extract.
+'''
+
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+SGML_BUFFER_TYPES = (bytes, bytearray, mmap.mmap, memoryview)
+
+SgmlBuffer = Union[bytes, bytearray, mmap.mmap, memoryview]
+
+
+def is_sgml_buffer(source) -> bool:
+    return isinstance(source, SGML_BUFFER_TYPES)
+
+
+def as_searchable(source: SgmlBuffer) -> Union[bytes, bytearray, mmap.mmap]:
+    """
+    memoryview has no `find`: a view spanning a whole bytes / bytearray / mmap is unwrapped
+    to that object (no copy); any other view is copied once.
+    """
+    if isinstance(source, memoryview):
+        base = source.obj
+        if isinstance(base, (bytes, bytearray, mmap.mmap)) and source.contiguous and source.nbytes == len(base):
+            return base
+        return source.tobytes()
+    return source
+
+
+def open_sgml_mapping(path: str) -> Union[mmap.mmap, bytes]:
+    """
+    Returns a read-only mapping of a stored submission (b"" for an empty file, which cannot
+    be mapped). The caller closes it with `close_sgml_buffer` once indexing is done.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+@contextmanager
+def map_sgml_file(path: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Context-managed `open_sgml_mapping`."""
+    mapping = open_sgml_mapping(path)
+    try:
+        yield mapping
+    finally:
+        close_sgml_buffer(mapping)
+
+
+def close_sgml_buffer(source):
+    """Unmaps `source` if it is a mapping; any other content is left alone."""
+    if isinstance(source, mmap.mmap):
+        source.close()
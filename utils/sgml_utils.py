@@ -1,18 +1,24 @@
 # utils/sgml_utils.py
+from typing import Union
 from utils.report_logger import log_warn, log_error
 from utils.url_builder import construct_sgml_txt_url
 from downloaders.sgml_downloader import SgmlDownloader
+from downloaders.http_transport import HttpTransport
+from downloaders.rate_limiter import get_host_rate_limiter
+from utils.sgml_buffer import SgmlBuffer, as_searchable, is_sgml_buffer
 
 # Module-level instance
 _shared_downloader = None
 
-def get_shared_downloader(user_agent: str, request_delay_seconds: float = 0.1) -> SgmlDownloader:
+def get_shared_downloader(user_agent: str, request_delay_seconds: float = 0.1,
+                          transport: HttpTransport = None) -> SgmlDownloader:
     """
     Get or create a shared SgmlDownloader instance.
     
     Args:
         user_agent: User agent string for SEC API
         request_delay_seconds: Delay between requests in seconds
+        transport: Optional pooled HttpTransport (only used when the instance is first created)
         
     Returns:
         SgmlDownloader instance
@@ -22,11 +28,14 @@ def get_shared_downloader(user_agent: str, request_delay_seconds: float = 0.1) -
         _shared_downloader = SgmlDownloader(
             user_agent=user_agent, 
             request_delay_seconds=request_delay_seconds,
-            use_cache=False  # Default to no file caching for utils module
+            use_cache=False,  # Default to no file caching for utils module
+            transport=transport,
+            rate_limiter=get_host_rate_limiter()
         )
     return _shared_downloader
 
-def download_sgml_for_accession(cik: str, accession_number: str, user_agent: str) -> str:
+def download_sgml_for_accession(cik: str, accession_number: str, user_agent: str,
+                                transport: HttpTransport = None) -> str:
     """
     Download SGML submission content for a given accession number.
     Uses SgmlDownloader for proper rate limiting and caching.
@@ -35,6 +44,7 @@ def download_sgml_for_accession(cik: str, accession_number: str, user_agent: str
         cik: Central Index Key
         accession_number: Accession number
         user_agent: User agent string for SEC API
+        transport: Optional pooled HttpTransport shared with the caller
         
     Returns:
         str: The raw SGML content
@@ -49,20 +59,51 @@ def download_sgml_for_accession(cik: str, accession_number: str, user_agent: str
     
     # Use the shared downloader
     try:
-        downloader = get_shared_downloader(user_agent)
+        downloader = get_shared_downloader(user_agent, transport=transport)
         url = construct_sgml_txt_url(cik, accession_number.replace('-', ''))
         return downloader.download(url)
     except Exception as e:
         log_error(f"Error downloading SGML for {cik}/{accession_number}: {str(e)}")
         raise
 
-def extract_issuer_cik_from_sgml(sgml_content: str) -> str:
+def download_sgml_header_for_accession(cik: str, accession_number: str, user_agent: str,
+                                       transport: HttpTransport = None) -> str:
+    """
+    Download only the SEC-HEADER of a submission (HTTP Range request),
+    falling back to the full SGML when the header end is not found early.
+    Enough for extract_issuer_cik_from_sgml().
+    
+    Args:
+        cik: Central Index Key
+        accession_number: Accession number
+        user_agent: User agent string for SEC API
+        transport: Optional pooled HttpTransport shared with the caller
+        
+    Returns:
+        str: The SEC-HEADER text
+    """
+    if not cik or not cik.strip():
+        raise ValueError("CIK must be provided")
+    if not accession_number or not accession_number.strip():
+        raise ValueError("Accession number must be provided")
+    if not user_agent or not user_agent.strip():
+        raise ValueError("User agent must be provided")
+
+    try:
+        downloader = get_shared_downloader(user_agent, transport=transport)
+        return downloader.download_sgml_header(cik, accession_number)
+    except Exception as e:
+        log_error(f"Error downloading SGML header for {cik}/{accession_number}: {str(e)}")
+        raise
+
+def extract_issuer_cik_from_sgml(sgml_content: Union[str, SgmlBuffer]) -> str:
     """
     Extract the issuer CIK from SGML content.
     For Form 4/3/5, 13D/G, etc. that have both issuer and reporting owners.
     
     Args:
-        sgml_content: Raw SGML content
+        sgml_content: Raw SGML content (text, or bytes / mmap / memoryview of which only the
+            <ISSUER> section is decoded)
         
     Returns:
         str: The issuer CIK or empty string if not found
@@ -70,6 +111,16 @@ def extract_issuer_cik_from_sgml(sgml_content: str) -> str:
     if not sgml_content:
         log_warn("Empty SGML content provided to extract_issuer_cik_from_sgml")
         return ""
+
+    if is_sgml_buffer(sgml_content):
+        # <ISSUER> lives in the SEC-HEADER, before the first <DOCUMENT>
+        data = as_searchable(sgml_content)
+        header_end = data.find(b"<DOCUMENT>")
+        header_end = header_end if header_end != -1 else len(data)
+        issuer_start = data.find(b"<ISSUER>", 0, header_end)
+        if issuer_start == -1:
+            return ""
+        sgml_content = data[issuer_start:header_end].decode("utf-8", errors="replace")
         
     issuer_section_start = sgml_content.find("<ISSUER>")
     if issuer_section_start == -1:
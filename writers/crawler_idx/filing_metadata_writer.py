@@ -1,5 +1,6 @@
 # writers/filing_metadata_writer.py
 
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 from models.database import SessionLocal
 from models.orm_models.filing_metadata import FilingMetadata as FilingMetadataORM
@@ -11,8 +12,13 @@ class FilingMetadataWriter:
     def __init__(self):
         self.session = SessionLocal()
 
-    def upsert_many(self, records: list[FilingMetadataDC]):
+    def upsert_many(self, records: list[FilingMetadataDC]) -> list[str]:
+        """
+        Merges each record in its own transaction, so one bad row does not lose the rest.
+        Returns the accession numbers that failed to write (empty when all were written).
+        """
         written = 0
+        failed = []
         for record in records:
             try:
                 orm_entry = convert_to_orm(record)
@@ -21,6 +27,39 @@ class FilingMetadataWriter:
                 written += 1
             except SQLAlchemyError as e:
                 self.session.rollback()
+                failed.append(record.accession_number)
                 log_warn(f"[ERROR] Failed to write filing metadata for {record.accession_number}: {e}")
                 
-        log_info(f"✅ Metadata written: {written}")
\ No newline at end of file
+        log_info(f"✅ Metadata written: {written}" + (f", failed: {len(failed)}" if failed else ""))
+        return failed
+
+    def bulk_insert(self, records: list[FilingMetadataDC]) -> int:
+        """
+        Inserts a batch with a single INSERT ... ON CONFLICT DO NOTHING statement.
+
+        Used for full-index backfills: existing rows win, so issuer CIKs already
+        resolved by the daily pipeline are never overwritten. Returns rows inserted.
+        """
+        if not records:
+            return 0
+        rows = [
+            {
+                "accession_number": r.accession_number,
+                "cik": r.cik,
+                "form_type": r.form_type,
+                "filing_date": r.filing_date,
+                "filing_url": r.filing_url,
+            }
+            for r in records
+        ]
+        statement = pg_insert(FilingMetadataORM.__table__).values(rows).on_conflict_do_nothing(
+            index_elements=["accession_number"]
+        )
+        try:
+            result = self.session.execute(statement)
+            self.session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            log_warn(f"[ERROR] Bulk insert of {len(rows)} filing metadata records failed: {e}")
+            raise
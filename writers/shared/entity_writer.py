@@ -3,18 +3,24 @@
 from models.dataclasses.entity import EntityData
 from models.orm_models.entity_orm import Entity
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 from typing import Dict, Optional
 from utils.report_logger import log_info, log_warn, log_error
 from utils.url_builder import normalize_cik
 from utils.cache_manager import get_cache_root  # Just for reference
 from uuid import uuid4, UUID
+from writers.shared.identity_cache import EntityIdentity, IdentityCache, get_shared_identity_cache
 
 class EntityWriter:
-    def __init__(self, db_session: Session = None):
+    def __init__(self, db_session: Session = None, identity_cache: IdentityCache = None):
         self.db_session = db_session
-        # Entity cache to avoid repeated DB queries
+        # Entity cache to avoid repeated DB queries (ORM instances of this session)
         self._entity_cache: Dict[str, Entity] = {}
+        # Process-wide identities shared with every other writer; needs a real Session
+        # (its commit / rollback events drive write-through)
+        if identity_cache is None and isinstance(db_session, Session):
+            identity_cache = get_shared_identity_cache()
+        self.identity_cache = identity_cache
 
     def get_or_create_entity(self, entity_data: EntityData) -> Entity:
         """
@@ -35,10 +41,14 @@ class EntityWriter:
             return self._entity_cache[normalized_cik]
 
         try:
-            # Try to find existing entity by CIK
-            existing = self.db_session.query(Entity).filter(
-                Entity.cik == normalized_cik  # Exact match since we normalize
-            ).first()
+            # Try the shared identity cache, then find existing entity by CIK
+            existing = self._from_identity_cache(self.identity_cache.get_entity(normalized_cik)) if self.identity_cache else None
+            if existing is None:
+                existing = self.db_session.query(Entity).filter(
+                    Entity.cik == normalized_cik  # Exact match since we normalize
+                ).first()
+                if existing and self.identity_cache:
+                    self.identity_cache.put_entity(existing, session=self.db_session)
 
             if existing:
                 # Update details if needed
@@ -54,6 +64,8 @@ class EntityWriter:
 
                 if updated:
                     log_info(f"Updated entity details for CIK {entity_data.cik}")
+                    if self.identity_cache:
+                        self.identity_cache.put_entity(existing, session=self.db_session)
 
                 # Add to cache
                 self._entity_cache[normalized_cik] = existing
@@ -71,6 +83,8 @@ class EntityWriter:
             self.db_session.flush()  # Get ID without committing
 
             log_info(f"Created new entity: {entity_data.name} (CIK: {entity_data.cik})")
+            if self.identity_cache:
+                self.identity_cache.put_entity(new_entity, session=self.db_session)
 
             # Add to cache
             self._entity_cache[normalized_cik] = new_entity
@@ -98,6 +112,12 @@ class EntityWriter:
         if normalized_cik in self._entity_cache:
             return self._entity_cache[normalized_cik]
 
+        if self.identity_cache:
+            entity = self._from_identity_cache(self.identity_cache.get_entity(normalized_cik))
+            if entity is not None:
+                self._entity_cache[normalized_cik] = entity
+                return entity
+
         try:
             entity = self.db_session.query(Entity).filter(
                 Entity.cik == normalized_cik
@@ -106,6 +126,8 @@ class EntityWriter:
             if entity:
                 # Add to cache
                 self._entity_cache[normalized_cik] = entity
+                if self.identity_cache:
+                    self.identity_cache.put_entity(entity, session=self.db_session)
 
             return entity
 
@@ -123,8 +145,14 @@ class EntityWriter:
         Returns:
             Entity ORM instance or None if not found
         """
+        if self.identity_cache:
+            entity = self._from_identity_cache(self.identity_cache.get_entity_by_id(entity_id))
+            if entity is not None:
+                self._entity_cache[entity.cik.lstrip("0")] = entity
+                return entity
+
         try:
-            # We can't use the CIK-based cache here, so query directly
+            # The shared cache had no entry for this id, so query directly
             entity = self.db_session.query(Entity).filter(
                 Entity.id == entity_id
             ).first()
@@ -133,6 +161,8 @@ class EntityWriter:
                 # Add to CIK cache in case we need it later
                 normalized_cik = entity.cik.lstrip("0")
                 self._entity_cache[normalized_cik] = entity
+                if self.identity_cache:
+                    self.identity_cache.put_entity(entity, session=self.db_session)
                 
             return entity
             
@@ -140,6 +170,17 @@ class EntityWriter:
             log_error(f"Error in get_entity_by_id: {e}")
             return None
 
+    def _from_identity_cache(self, identity: Optional[EntityIdentity]) -> Optional[Entity]:
+        """
+        Attaches a cached identity to this session as a persistent Entity without a SELECT
+        (merge with load=False), or returns the instance the session already holds.
+        """
+        if identity is None:
+            return None
+        entity = Entity(id=identity.id, cik=identity.cik, name=identity.name, entity_type=identity.entity_type)
+        make_transient_to_detached(entity)
+        return self.db_session.merge(entity, load=False)
+
     def clear_cache(self) -> None:
-        """Clear the entity cache"""
+        """Clear this writer's entity cache (the shared identity cache is kept)"""
         self._entity_cache = {}
\ No newline at end of file
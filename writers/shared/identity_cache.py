@@ -0,0 +1,287 @@
+# writers/shared/identity_cache.py
+
+'''
+# Role: Process-wide identity map of entities and securities shared by every writer and service
+- Entities are keyed by normalized CIK (and indexed by id); securities by (title, issuer_entity_id).
+- Holds plain identity values, never ORM instances, so it outlives the session that loaded them.
+  EntityWriter re-attaches a cached entity to its own session without a SELECT.
+- Write-through: rows read from the database are cached at once; rows a session creates or
+  updates are cached when that session commits and dropped if it rolls back.
+- Bounded (LRU per map). `warm_up` loads every entity of a batch, and their securities, with one
+  `IN` query each. An optional JSON snapshot keeps the cache across restarts.
+'''
+
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config.config_loader import ConfigLoader
+from utils.report_logger import log_info, log_warn
+
+# Load config once at module import
+IDENTITY_CACHE_CONFIG = ConfigLoader.load_config().get("identity_cache", {}) or {}
+
+DEFAULT_MAX_ENTRIES = 200_000
+SNAPSHOT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class EntityIdentity:
+    id: uuid.UUID
+    cik: str  # normalized (no zero padding)
+    name: str
+    entity_type: str
+
+
+def normalize_entity_cik(cik: str) -> str:
+    """CIKs are stored without zero padding (see EntityWriter)."""
+    return str(cik).lstrip("0")
+
+
+class IdentityCache:
+    """
+    Thread-safe, bounded identity map: normalized CIK → EntityIdentity and
+    (title, issuer_entity_id) → security id.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, snapshot_path: str = None):
+        self.max_entries = max_entries
+        self.snapshot_path = snapshot_path
+        self._entities: "OrderedDict[str, EntityIdentity]" = OrderedDict()
+        self._ciks_by_id: Dict[uuid.UUID, str] = {}
+        self._securities: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._pending_key = f"identity_cache_pending_{id(self)}"
+        self.hits = 0
+        self.misses = 0
+
+    # Entities
+
+    def get_entity(self, cik: str) -> Optional[EntityIdentity]:
+        with self._lock:
+            identity = self._entities.get(normalize_entity_cik(cik))
+            self._count(identity)
+            if identity is not None:
+                self._entities.move_to_end(identity.cik)
+            return identity
+
+    def get_entity_by_id(self, entity_id) -> Optional[EntityIdentity]:
+        with self._lock:
+            cik = self._ciks_by_id.get(_as_uuid(entity_id))
+            return self.get_entity(cik) if cik is not None else self._count(None)
+
+    def put_entity(self, entity, session: Session = None):
+        """
+        Caches an Entity (ORM instance or anything with id / cik / name / entity_type).
+        Pass the `session` that created or changed it to cache it only once that session commits.
+        """
+        identity = EntityIdentity(_as_uuid(entity.id), normalize_entity_cik(entity.cik), entity.name, entity.entity_type)
+        if session is not None:
+            self._stage(session, lambda: self._store_entity(identity))
+        else:
+            self._store_entity(identity)
+
+    def discard_entity(self, cik: str):
+        with self._lock:
+            identity = self._entities.pop(normalize_entity_cik(cik), None)
+            if identity is not None:
+                self._ciks_by_id.pop(identity.id, None)
+
+    # Securities
+
+    def get_security(self, title: str, issuer_entity_id) -> Optional[str]:
+        key = (title, _issuer_key(issuer_entity_id))
+        with self._lock:
+            security_id = self._securities.get(key)
+            self._count(security_id)
+            if security_id is not None:
+                self._securities.move_to_end(key)
+            return security_id
+
+    def put_security(self, title: str, issuer_entity_id, security_id, session: Session = None):
+        """Caches a security id; with `session`, only once that session commits (see `put_entity`)."""
+        key, value = (title, _issuer_key(issuer_entity_id)), str(security_id)
+        if session is not None:
+            self._stage(session, lambda: self._store_security(key, value))
+        else:
+            self._store_security(key, value)
+
+    # Bulk loading and persistence
+
+    def warm_up(self, session: Session, ciks: Iterable[str]) -> int:
+        """
+        Loads every given CIK's entity, and all securities of those entities, with one `IN`
+        query each. Cached CIKs the database no longer has are dropped, so entries restored
+        from a snapshot are revalidated. Returns the number of entities loaded.
+        """
+        # Imported here so that importing this module does not register ORM mappers
+        from models.orm_models.entity_orm import Entity
+        from models.orm_models.forms.security_orm import Security
+
+        wanted = sorted({normalize_entity_cik(cik) for cik in ciks if cik})
+        if not wanted:
+            return 0
+        entities = session.query(Entity).filter(Entity.cik.in_(wanted)).all()
+        found = set()
+        for entity in entities:
+            self.put_entity(entity)
+            found.add(normalize_entity_cik(entity.cik))
+        for cik in set(wanted) - found:
+            self.discard_entity(cik)
+
+        issuer_ids = [entity.id for entity in entities]
+        if issuer_ids:
+            securities = session.query(Security).filter(Security.issuer_entity_id.in_(issuer_ids)).all()
+            with self._lock:
+                issuers = {_issuer_key(issuer_id) for issuer_id in issuer_ids}
+                for key in [key for key in self._securities if key[1] in issuers]:
+                    del self._securities[key]
+                for security in securities:
+                    self._store_security((security.title, _issuer_key(security.issuer_entity_id)), str(security.id))
+        log_info(f"[IDENTITY-CACHE] Warmed {len(entities)} of {len(wanted)} entities")
+        return len(entities)
+
+    def save_snapshot(self, path: str = None) -> Optional[str]:
+        """Writes the cache to `path` (default `snapshot_path`) as JSON. Returns the path, or None when unset or failed."""
+        path = path or self.snapshot_path
+        if not path:
+            return None
+        with self._lock:
+            snapshot = {
+                "version": SNAPSHOT_VERSION,
+                "entities": [[str(i.id), i.cik, i.name, i.entity_type] for i in self._entities.values()],
+                "securities": [[title, issuer, security_id] for (title, issuer), security_id in self._securities.items()],
+            }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log_warn(f"[IDENTITY-CACHE] Failed to save snapshot {path}: {e}")
+            return None
+        log_info(f"[IDENTITY-CACHE] Saved {len(snapshot['entities'])} entities and {len(snapshot['securities'])} securities to {path}")
+        return path
+
+    def load_snapshot(self, path: str = None) -> int:
+        """Restores entries saved by `save_snapshot` (oldest first, so LRU order is kept). Returns the count."""
+        path = path or self.snapshot_path
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") != SNAPSHOT_VERSION:
+                log_warn(f"[IDENTITY-CACHE] Ignoring snapshot {path} of another version")
+                return 0
+            entities = [EntityIdentity(uuid.UUID(i), cik, name, kind) for i, cik, name, kind in snapshot["entities"]]
+            securities = [((title, issuer), security_id) for title, issuer, security_id in snapshot["securities"]]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log_warn(f"[IDENTITY-CACHE] Ignoring unreadable snapshot {path}: {e}")
+            return 0
+        for identity in entities:
+            self._store_entity(identity)
+        for key, security_id in securities:
+            self._store_security(key, security_id)
+        log_info(f"[IDENTITY-CACHE] Restored {len(entities)} entities and {len(securities)} securities from {path}")
+        return len(entities) + len(securities)
+
+    def clear(self):
+        with self._lock:
+            self._entities.clear()
+            self._ciks_by_id.clear()
+            self._securities.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entities": len(self._entities),
+                "securities": len(self._securities),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    # Internals
+
+    def _store_entity(self, identity: EntityIdentity):
+        with self._lock:
+            previous = self._entities.pop(identity.cik, None)
+            if previous is not None:
+                self._ciks_by_id.pop(previous.id, None)
+            self._entities[identity.cik] = identity
+            self._ciks_by_id[identity.id] = identity.cik
+            while len(self._entities) > self.max_entries:
+                _, evicted = self._entities.popitem(last=False)
+                self._ciks_by_id.pop(evicted.id, None)
+
+    def _store_security(self, key: Tuple[str, str], security_id: str):
+        with self._lock:
+            self._securities.pop(key, None)
+            self._securities[key] = security_id
+            while len(self._securities) > self.max_entries:
+                self._securities.popitem(last=False)
+
+    def _stage(self, session: Session, apply: Callable[[], None]):
+        """Defers `apply` until `session` commits; a rollback discards it."""
+        pending: Optional[List[Callable[[], None]]] = session.info.get(self._pending_key)
+        if pending is None:
+            pending = session.info[self._pending_key] = []
+            event.listen(session, "after_commit", self._publish)
+            event.listen(session, "after_rollback", self._discard_pending)
+        pending.append(apply)
+
+    def _publish(self, session: Session):
+        for apply in session.info.pop(self._pending_key, None) or ():
+            apply()
+        session.info[self._pending_key] = []
+
+    def _discard_pending(self, session: Session):
+        session.info[self._pending_key] = []
+
+    def _count(self, found):
+        if found is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return found
+
+
+def _as_uuid(value) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def _issuer_key(issuer_entity_id) -> str:
+    """Canonical text of an issuer id, whether given as UUID or in any UUID string form."""
+    try:
+        return str(_as_uuid(issuer_entity_id))
+    except ValueError:
+        return str(issuer_entity_id)
+
+
+_shared_cache: Optional[IdentityCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_identity_cache() -> IdentityCache:
+    """
+    Returns the process-wide cache, sized by `identity_cache.max_entries` in app_config.yaml and
+    restored from `identity_cache.snapshot_path` (when set) on first use.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = IdentityCache(
+                max_entries=IDENTITY_CACHE_CONFIG.get("max_entries") or DEFAULT_MAX_ENTRIES,
+                snapshot_path=IDENTITY_CACHE_CONFIG.get("snapshot_path"),
+            )
+            _shared_cache.load_snapshot()
+        return _shared_cache
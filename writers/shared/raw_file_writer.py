@@ -1,12 +1,12 @@
-import os
 from models.dataclasses.raw_document import RawDocument
 from utils.path_manager import build_raw_filepath_by_type
+from utils.artifact_locator import register_raw_artifact, write_file_atomic
 from utils.report_logger import log_info, log_error
 
 class RawFileWriter:
     """
     Generic writer for raw files (SGML, HTML index, XML, etc).
-    Accepts a RawDocument and writes its `.content` to disk.
+    Accepts a RawDocument and writes its `.content` (text or bytes) to disk.
     """
 
     def __init__(self, file_type: str = "sgml"):
@@ -29,9 +29,14 @@ class RawFileWriter:
                 filename=raw_doc.filename,
             )
 
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(raw_doc.content)
+            # Bytes (e.g. SgmlTextDocument.raw) are written as received, without a decode/encode round trip
+            data = raw_doc.content if isinstance(raw_doc.content, bytes) else raw_doc.content.encode("utf-8")
+            # Written to a .part file and renamed, so a crash never leaves a truncated file at `path`
+            size_bytes, sha256 = write_file_atomic(path, data)
+
+            # Indexed by accession (with size and hash) so later stages find and verify it under any CIK
+            register_raw_artifact(raw_doc.accession_number, self.file_type, path, cik=raw_doc.cik,
+                                  year=year, form_type=raw_doc.form_type, size_bytes=size_bytes, sha256=sha256)
 
             log_info(f"📄 Saved {self.file_type.upper()} file: {path}")
             return path